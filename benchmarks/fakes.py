@@ -0,0 +1,469 @@
+"""Local stand-in HTTP servers for Oura, OpenAI and Telegram."""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from email.parser import BytesParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "openapi-1.27.json")
+
+
+class FakeServer:
+    """
+    Base fake: a threaded HTTP server with configurable latency, errors and rate limit.
+
+    Args:
+        latency: Seconds added to every response
+        error_rate: Fraction of requests answered with a 500
+        rate_limit: Max requests per second before answering 429 (None = unlimited)
+        seed: Seed for deterministic data and error injection
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, rate_limit: Optional[float] = None, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors_injected = 0
+        self.rate_limited = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._dispatch(self, "GET")
+
+            def do_POST(self):
+                server._dispatch(self, "POST")
+
+            def do_PUT(self):
+                server._dispatch(self, "PUT")
+
+            def do_DELETE(self):
+                server._dispatch(self, "DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "FakeServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _admit(self) -> Optional[int]:
+        """Return an error status to inject, or None to serve normally."""
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    self.rate_limited += 1
+                    return 429
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.errors_injected += 1
+                return 500
+        return None
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str):
+        length = int(handler.headers.get("Content-Length", 0))
+        body = handler.rfile.read(length) if length else b""
+        with self._lock:
+            self.bytes_received += len(body)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        status = self._admit()
+        if status == 429:
+            self.send_json(handler, 429, self.rate_limit_body(), headers={"Retry-After": "1"})
+            return
+        if status == 500:
+            self.send_json(handler, 500, {"detail": "injected error"})
+            return
+
+        parsed = urlparse(handler.path)
+        self.handle(handler, method, parsed.path, parse_qs(parsed.query), body)
+
+    def rate_limit_body(self) -> Dict[str, Any]:
+        return {"detail": "Rate limit exceeded"}
+
+    def handle(self, handler, method: str, path: str, query: Dict[str, list], body: bytes):
+        raise NotImplementedError
+
+    @staticmethod
+    def send_json(handler, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class SchemaSynthesizer:
+    """Generates deterministic synthetic documents from the bundled OpenAPI schemas."""
+
+    def __init__(self, spec_path: str = SPEC_PATH, seed: int = 0):
+        with open(spec_path, "r") as f:
+            self.spec = json.load(f)
+        self.schemas = self.spec["components"]["schemas"]
+        self.seed = seed
+        self.collections = self._collection_schemas()
+
+    def _collection_schemas(self) -> Dict[str, Dict[str, Any]]:
+        """Map collection name -> document schema for every multi-document endpoint."""
+        collections = {}
+        for path, item in self.spec["paths"].items():
+            if not path.startswith("/v2/usercollection/") or "{" in path or "get" not in item:
+                continue
+            response = item["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+            wrapper = self._resolve(response)
+            data = wrapper.get("properties", {}).get("data")
+            if data and "items" in data:
+                collections[path.rsplit("/", 1)[1]] = self._resolve(data["items"])
+        return collections
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        while "$ref" in schema:
+            schema = self.schemas[schema["$ref"].rsplit("/", 1)[1]]
+        return schema
+
+    def _value(self, schema: Dict[str, Any], name: str, day: date, rng: random.Random) -> Any:
+        schema = self._resolve(schema)
+        if "anyOf" in schema:
+            options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+            return self._value(options[0], name, day, rng) if options else None
+        if "allOf" in schema:
+            return self._value(schema["allOf"][0], name, day, rng)
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+
+        kind = schema.get("type")
+        if kind == "object" or "properties" in schema:
+            return {key: self._value(sub, key, day, rng) for key, sub in schema.get("properties", {}).items()}
+        if kind == "array":
+            # Sample arrays (HR, HRV, MET) are long in real data
+            count = 288 if name == "items" else rng.randint(0, 3)
+            return [self._value(schema.get("items", {}), name, day, rng) for _ in range(count)]
+        if kind == "integer":
+            return rng.randint(40, 100)
+        if kind == "number":
+            return round(rng.uniform(40, 100), 2)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if kind == "string":
+            return self._string(name, schema, day, rng)
+        return None
+
+    @staticmethod
+    def _string(name: str, schema: Dict[str, Any], day: date, rng: random.Random) -> str:
+        if name == "day" or schema.get("format") == "date":
+            return day.isoformat()
+        if name in ("id",):
+            return str(uuid.UUID(int=rng.getrandbits(128)))
+        if name.endswith("_5_min"):
+            return "".join(rng.choice("01234") for _ in range(288))
+        if name.endswith("_30_sec"):
+            return "".join(rng.choice("1234") for _ in range(960))
+        if "time" in name or "stamp" in name or "bedtime" in name or schema.get("format") == "date-time":
+            hour = rng.randint(0, 23)
+            return f"{day.isoformat()}T{hour:02d}:{rng.randint(0, 59):02d}:00+00:00"
+        return "synthetic"
+
+    def document(self, collection: str, day: date, index: int = 0) -> Dict[str, Any]:
+        """One synthetic document, identical for the same (collection, day, index)."""
+        rng = random.Random(f"{self.seed}:{collection}:{day}:{index}")
+        doc = self._value(self.collections[collection], "", day, rng)
+        doc["id"] = f"{collection}-{day}-{index}"
+        if "day" in doc:
+            doc["day"] = day.isoformat()
+        if collection == "sleep":
+            doc["type"] = "long_sleep"
+        if collection == "workout":
+            doc["start_datetime"] = f"{day}T07:00:00+00:00"
+            doc["end_datetime"] = f"{day}T07:{rng.randint(20, 59):02d}:00+00:00"
+        return doc
+
+
+class FakeOuraServer(FakeServer):
+    """Oura v2 API: every collection, heart rate, token refresh, with next_token paging."""
+
+    def __init__(self, page_size: int = 25, docs_per_day: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.page_size = page_size
+        self.docs_per_day = docs_per_day
+        self.synth = SchemaSynthesizer(seed=kwargs.get("seed", 0))
+
+    def handle(self, handler, method, path, query, body):
+        if path == "/oauth/token":
+            self.send_json(handler, 200, {
+                "access_token": uuid.uuid4().hex, "refresh_token": uuid.uuid4().hex, "expires_in": 86400
+            })
+            return
+
+        parts = path.split("/usercollection/", 1)[-1].split("/")
+        collection = parts[0]
+        offset = int(query.get("next_token", ["0"])[0])
+
+        if collection == "personal_info":
+            self.send_json(handler, 200, {"id": "fake-user", "age": 35, "weight": 70.0, "height": 1.75,
+                                          "biological_sex": "female", "email": "fake@example.com"})
+            return
+        if len(parts) == 2 and collection in self.synth.collections:
+            # Single document by ID
+            document = self.synth.document(collection, date.today())
+            self.send_json(handler, 200, {**document, "id": parts[1]})
+            return
+
+        if collection == "heartrate":
+            start = datetime.fromisoformat(query["start_datetime"][0])
+            end = datetime.fromisoformat(query["end_datetime"][0])
+            total = int((end - start).total_seconds() // 300)
+            page = [
+                {
+                    "bpm": 50 + (offset + i) % 40,
+                    "source": "awake",
+                    "timestamp": (start + timedelta(seconds=300 * (offset + i))).astimezone(timezone.utc).isoformat(),
+                }
+                for i in range(min(self.page_size * 40, total - offset))
+            ]
+        elif collection in self.synth.collections and "start_date" not in query:
+            # Collections without a date range (ring_configuration)
+            total = 1
+            page = [self.synth.document(collection, date.today())][offset:]
+        elif collection in self.synth.collections:
+            start = date.fromisoformat(query["start_date"][0][:10])
+            end = date.fromisoformat(query["end_date"][0][:10])
+            total = (end - start).days * self.docs_per_day
+            page = [
+                self.synth.document(collection, start + timedelta(days=n // self.docs_per_day), n % self.docs_per_day)
+                for n in range(offset, min(offset + self.page_size, total))
+            ]
+        else:
+            self.send_json(handler, 404, {"detail": "Not Found"})
+            return
+
+        next_offset = offset + len(page)
+        self.send_json(handler, 200, {
+            "data": page,
+            "next_token": str(next_offset) if next_offset < total else None
+        })
+
+
+class FakeOpenAIServer(FakeServer):
+    """
+    OpenAI chat completions (streaming and non-streaming), plus the files and
+    batches endpoints. A batch completes `batch_delay` seconds after it is
+    created; `batch_failure_rate` of its requests come back as errors.
+    """
+
+    def __init__(
+        self,
+        reply: str = "<b>Stats</b>\n• Sleep 80 • Readiness 85\n<b>Insights</b>\n• Fine.\n<b>Action</b>\n• Rest.",
+        batch_delay: float = 0.0,
+        batch_failure_rate: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.reply = reply
+        self.batch_delay = batch_delay
+        self.batch_failure_rate = batch_failure_rate
+        self.prompt_chars = []
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def rate_limit_body(self):
+        return {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}}
+
+    def handle(self, handler, method, path, query, body):
+        if path.endswith("/chat/completions"):
+            self.handle_completion(handler, json.loads(body))
+        elif path.endswith("/files") and method == "POST":
+            self.handle_upload(handler, body)
+        elif "/files/" in path and path.endswith("/content"):
+            content = self.files.get(path.split("/")[-2])
+            if content is None:
+                self.send_json(handler, 404, {"error": {"message": "No such file"}})
+                return
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/octet-stream")
+            handler.send_header("Content-Length", str(len(content)))
+            handler.end_headers()
+            handler.wfile.write(content)
+        elif path.endswith("/batches") and method == "POST":
+            self.handle_create_batch(handler, json.loads(body))
+        elif "/batches/" in path:
+            parts = path.rstrip("/").split("/")
+            cancel = parts[-1] == "cancel"
+            batch_id = parts[-2] if cancel else parts[-1]
+            if batch_id not in self.batches:
+                self.send_json(handler, 404, {"error": {"message": "No such batch"}})
+                return
+            self.send_json(handler, 200, self.batch_status(batch_id, cancel=cancel))
+        else:
+            self.send_json(handler, 404, {"error": {"message": "Not Found"}})
+
+    def handle_upload(self, handler, body: bytes):
+        message = BytesParser().parsebytes(
+            f"Content-Type: {handler.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        fields = {part.get_param("name", header="content-disposition"): part for part in message.get_payload()}
+        content = fields["file"].get_payload(decode=True)
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self.files[file_id] = content
+        self.send_json(handler, 200, {
+            "id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+            "filename": fields["file"].get_filename(), "purpose": fields["purpose"].get_payload(),
+        })
+
+    def handle_create_batch(self, handler, request: Dict[str, Any]):
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"], "completion_window": request["completion_window"],
+                "status": "in_progress", "output_file_id": None, "error_file_id": None,
+                "created_at": int(time.time()), "metadata": request.get("metadata"),
+                "_ready_at": time.monotonic() + self.batch_delay,
+            }
+        self.send_json(handler, 200, self.batch_status(batch_id))
+
+    def batch_status(self, batch_id: str, cancel: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            batch = self.batches[batch_id]
+            if batch["status"] == "in_progress" and (cancel or time.monotonic() >= batch["_ready_at"]):
+                # A cancelled batch finishes with nothing processed
+                lines = [] if cancel else self.files[batch["input_file_id"]].splitlines()
+                output, errors = [], []
+                for line in lines:
+                    request = json.loads(line)
+                    result = {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": request["custom_id"]}
+                    if self.rng.random() < self.batch_failure_rate:
+                        result.update(response={"status_code": 500, "body": {"error": {"message": "Server error"}}}, error=None)
+                        errors.append(result)
+                    else:
+                        body = self.completion(request["body"])
+                        result.update(response={"status_code": 200, "body": body}, error=None)
+                        output.append(result)
+                for key, results in (("output_file_id", output), ("error_file_id", errors)):
+                    if results:
+                        file_id = f"file-{uuid.uuid4().hex[:12]}"
+                        self.files[file_id] = "\n".join(json.dumps(r) for r in results).encode()
+                        batch[key] = file_id
+                batch["status"] = "cancelled" if cancel else "completed"
+                batch["request_counts"] = {"total": len(lines), "completed": len(output), "failed": len(errors)}
+            return {k: v for k, v in batch.items() if not k.startswith("_")}
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = "".join(m.get("content", "") for m in request.get("messages", []))
+        self.prompt_chars.append(len(prompt))
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(self.reply) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return {
+            "id": "chatcmpl-fake", "created": int(time.time()), "model": request.get("model", "fake"),
+            "object": "chat.completion",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": self.reply}}],
+            "usage": usage,
+        }
+
+    def handle_completion(self, handler, request: Dict[str, Any]):
+        if not request.get("stream"):
+            with self._lock:
+                response = self.completion(request)
+            self.send_json(handler, 200, response)
+            return
+
+        prompt = "".join(m.get("content", "") for m in request.get("messages", []))
+        with self._lock:
+            self.prompt_chars.append(len(prompt))
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(self.reply) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": request.get("model", "fake")}
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        words = self.reply.split(" ")
+        for i, word in enumerate(words):
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": word + (" " if i < len(words) - 1 else "")}, "finish_reason": None}],
+            }
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        if request.get("stream_options", {}).get("include_usage"):
+            chunk = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+        handler.close_connection = True
+
+
+class FakeTelegramServer(FakeServer):
+    """Telegram Bot API: sendMessage, editMessageText, getUpdates."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.edits = 0
+        self._next_id = 1
+
+    def rate_limit_body(self):
+        return {"ok": False, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": 1}}
+
+    def handle(self, handler, method, path, query, body):
+        api_method = path.rsplit("/", 1)[-1]
+        payload = json.loads(body) if body else {}
+
+        if api_method == "sendMessage":
+            with self._lock:
+                message_id = self._next_id
+                self._next_id += 1
+                self.messages[message_id] = payload
+            self.send_json(handler, 200, {"ok": True, "result": {"message_id": message_id}})
+        elif api_method == "editMessageText":
+            with self._lock:
+                self.edits += 1
+                self.messages[payload.get("message_id")] = payload
+            self.send_json(handler, 200, {"ok": True, "result": {"message_id": payload.get("message_id")}})
+        elif api_method == "getUpdates":
+            self.send_json(handler, 200, {"ok": True, "result": []})
+        else:
+            self.send_json(handler, 404, {"ok": False, "description": "Not Found"})
@@ -0,0 +1,265 @@
+"""
+Offline benchmarks for the bot pipeline.
+
+Runs the real code against the local fakes in benchmarks/fakes.py, so no
+credentials or network access are needed. Results are written as JSON to
+benchmarks/results/ and compared with the previous run.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--latency 0.05] [--error-rate 0.02] [--rate-limit 50]
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeOuraServer, FakeOpenAIServer, FakeTelegramServer  # noqa: E402
+from utils import metrics  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# Flag a metric when it gets this much worse than the previous run
+REGRESSION_THRESHOLD = 0.2
+
+
+def metric(value: float, unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def timed(fn: Callable, iterations: int) -> Dict[str, float]:
+    """Run `fn` `iterations` times; return median seconds and peak traced memory."""
+    durations = []
+    peak = 0
+    for _ in range(iterations):
+        tracemalloc.start()
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"seconds": statistics.median(durations), "peak_mb": peak / 1e6}
+
+
+def configure_environment(workdir: str, oura: FakeOuraServer, openai: FakeOpenAIServer, telegram: FakeTelegramServer):
+    """Point every client at the fakes and keep all state inside `workdir`."""
+    token_file = os.path.join(workdir, "oura_tokens.json")
+    with open(token_file, "w") as f:
+        json.dump({"access_token": "bench", "refresh_token": "bench", "expires_in": 86400}, f)
+
+    os.environ.update({
+        "OURA_API_URL": oura.url,
+        "OURA_CLIENT_ID": "bench",
+        "OURA_CLIENT_SECRET": "bench",
+        "OPENAI_BASE_URL": f"{openai.url}/v1",
+        "OPENAI_API_KEY": "bench",
+        "TELEGRAM_API_URL": telegram.url,
+        "TELEGRAM_BOT_TOKEN": "bench",
+        "TELEGRAM_CHAT_ID": "1",
+        "SUMMARY_CACHE_PATH": os.path.join(workdir, "summary_cache.json"),
+        "DELIVERY_QUEUE_PATH": os.path.join(workdir, "outbox.db"),
+    })
+    return token_file
+
+
+def bench_job(workdir: str, token_file: str, openai: FakeOpenAIServer, iterations: int) -> Dict[str, Any]:
+    """End-to-end daily job: cold (empty store and cache) and warm (everything stored)."""
+    import bot
+    from users import UserConfig
+
+    results = {}
+    for label in ("cold", "warm"):
+        run = {"n": 0}
+
+        def run_job():
+            run["n"] += 1
+            if label == "cold":
+                # Fresh store, trend history and cache every iteration
+                suffix = f"cold{run['n']}"
+                os.environ["SUMMARY_CACHE_PATH"] = os.path.join(workdir, f"cache_{suffix}.json")
+            else:
+                suffix = "warm"
+                os.environ["SUMMARY_CACHE_PATH"] = os.path.join(workdir, "cache_warm.json")
+            user = UserConfig(
+                name=f"bench-{suffix}",
+                chat_id="1",
+                token_file=token_file,
+                db_path=os.path.join(workdir, f"oura_data_{suffix}.db")
+            )
+            bot.job(user)
+
+        if label == "warm":
+            # Populate the store and cache before timing
+            run_job()
+        prompts_before = len(openai.prompt_chars)
+        stats = timed(run_job, iterations)
+        results[f"job_{label}_seconds"] = metric(stats["seconds"], "s")
+        results[f"job_{label}_peak_mb"] = metric(stats["peak_mb"], "MB")
+        results[f"job_{label}_openai_calls"] = metric((len(openai.prompt_chars) - prompts_before) / iterations, "calls")
+    return results
+
+
+def bench_fetch(token_file: str, iterations: int, days: int = 30) -> Dict[str, Any]:
+    """Concurrent fetch of every daily collection over `days` days."""
+    from oura_client import OuraClient
+
+    oura = OuraClient("bench", "bench", token_file=token_file)
+    end = date.today()
+    start = end - timedelta(days=days)
+    counted = {}
+
+    def fetch():
+        data = oura.get_collections(start.isoformat(), end.isoformat())
+        counted["docs"] = sum(len(result["data"]) for result in data.values())
+
+    stats = timed(fetch, iterations)
+    return {
+        "fetch_seconds": metric(stats["seconds"], "s"),
+        "fetch_docs_per_second": metric(counted["docs"] / stats["seconds"], "docs/s", better="higher"),
+    }
+
+
+def bench_prompt(token_file: str, openai: FakeOpenAIServer) -> Dict[str, Any]:
+    """Prompt size for one day of data, as estimated locally and as received by the fake."""
+    from ai_summarizer import AISummarizer
+    from oura_client import OuraClient
+
+    oura = OuraClient("bench", "bench", token_file=token_file)
+    end = date.today()
+    data = oura.get_collections((end - timedelta(days=1)).isoformat(), end.isoformat())
+    ai = AISummarizer("bench")
+    before = len(openai.prompt_chars)
+    ai.generate_health_summary(
+        data["daily_sleep"],
+        data["daily_activity"],
+        data["daily_readiness"],
+        stress_data=data["daily_stress"],
+        spo2_data=data["daily_spo2"],
+        workout_data=data["workout"],
+        sleep_periods_data=data["sleep"]
+    )
+    sent = openai.prompt_chars[before:]
+    return {
+        "prompt_raw_tokens": metric(ai.last_prompt_stats.get("raw_tokens", 0), "tokens"),
+        "prompt_compact_tokens": metric(ai.last_prompt_stats.get("compact_tokens", 0), "tokens"),
+        "prompt_sent_chars": metric(sent[-1] if sent else 0, "chars"),
+    }
+
+
+def bench_backfill(workdir: str, token_file: str, days: int = 180) -> Dict[str, Any]:
+    """Backfill `days` days of every collection into an empty store."""
+    from backfill import backfill
+    from oura_client import OuraClient
+    from oura_store import OuraStore
+
+    oura = OuraClient("bench", "bench", token_file=token_file, max_workers=8)
+    store = OuraStore(os.path.join(workdir, "backfill.db"))
+    until = date.today()
+    started = time.perf_counter()
+    stats = backfill(oura, store, until - timedelta(days=days), until, workers=8)
+    elapsed = time.perf_counter() - started
+    store.close()
+    return {
+        "backfill_seconds": metric(elapsed, "s"),
+        "backfill_docs_per_second": metric(stats["documents"] / elapsed, "docs/s", better="higher"),
+    }
+
+
+def latest_result() -> Optional[Dict[str, Any]]:
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    if not paths:
+        return None
+    with open(paths[-1], "r") as f:
+        return json.load(f)
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any], threshold: float = REGRESSION_THRESHOLD) -> list:
+    """Print a comparison table and return the names of metrics that regressed."""
+    regressions = []
+    print(f"\n{'metric':32} {'previous':>12} {'current':>12} {'change':>8}")
+    for name, entry in current["metrics"].items():
+        old = previous.get("metrics", {}).get(name)
+        if not old or not old["value"]:
+            print(f"{name:32} {'-':>12} {entry['value']:>12} {'':>8}")
+            continue
+        change = (entry["value"] - old["value"]) / old["value"]
+        worse = change > threshold if entry["better"] == "lower" else change < -threshold
+        flag = " ⚠️" if worse else ""
+        print(f"{name:32} {old['value']:>12} {entry['value']:>12} {change:>+8.0%}{flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline benchmarks against local fakes")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed runs per benchmark (median is reported)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of latency added by every fake")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/second before fakes answer 429")
+    parser.add_argument("--no-save", action="store_true", help="Don't write results to benchmarks/results/")
+    args = parser.parse_args()
+
+    # Configured before the bot modules are imported, so their basicConfig() is a no-op
+    logging.basicConfig(level=logging.WARNING)
+    fake_options = {"latency": args.latency, "error_rate": args.error_rate, "rate_limit": args.rate_limit}
+    previous = latest_result()
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            FakeOuraServer(**fake_options) as oura, \
+            FakeOpenAIServer(**fake_options) as openai, \
+            FakeTelegramServer(**fake_options) as telegram:
+        token_file = configure_environment(workdir, oura, openai, telegram)
+        metrics.configure(jsonl_path=os.path.join(workdir, "metrics.jsonl"))
+
+        measured = {}
+        for name, run in (
+            ("job", lambda: bench_job(workdir, token_file, openai, args.iterations)),
+            ("fetch", lambda: bench_fetch(token_file, args.iterations)),
+            ("prompt", lambda: bench_prompt(token_file, openai)),
+            ("backfill", lambda: bench_backfill(workdir, token_file)),
+        ):
+            print(f"⏱️  Running {name} benchmark...")
+            measured.update(run())
+
+        result = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "options": fake_options,
+            "iterations": args.iterations,
+            "metrics": measured,
+            "requests": {"oura": oura.requests, "openai": openai.requests, "telegram": telegram.requests},
+            "counters": metrics.snapshot(),
+        }
+
+    print(json.dumps(result, indent=2))
+
+    regressions = compare(result, previous) if previous else []
+    if previous and previous.get("options") != result["options"]:
+        print("Note: previous run used different fake options; comparison is approximate.")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Saved results to {path}")
+
+    if regressions:
+        print(f"❌ Regressions over {REGRESSION_THRESHOLD:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Generate src/oura_models.py from the bundled Oura OpenAPI spec.
+
+Usage: python generate_oura_models.py [--spec openapi-1.27.json] [--output src/oura_models.py]
+
+Writes one __slots__ record class per document schema, the COLLECTIONS
+table and the OuraEndpoints mixin with a method per collection endpoint.
+Re-run it after updating the spec.
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_PATH = re.compile(r"^/v2/usercollection/(\w+)$")
+SINGLE_PATH = re.compile(r"^/v2/usercollection/(\w+)/\{document_id\}$")
+SCALARS = {"integer": "int", "number": "float", "string": "str", "boolean": "bool"}
+
+
+def ref_name(ref: str) -> str:
+    return ref.rsplit("/", 1)[-1]
+
+
+class Generator:
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.schemas = spec["components"]["schemas"]
+        self.ordered: List[str] = []
+
+    def is_record(self, name: str) -> bool:
+        return "properties" in self.schemas[name]
+
+    def field_type(self, schema: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """(annotation, expression decoding the raw value or None to store it as-is)."""
+        if "$ref" in schema:
+            name = ref_name(schema["$ref"])
+            if self.is_record(name):
+                self.visit(name)
+                return name, f"nested({name}.from_dict, {{}})"
+            return SCALARS.get(self.schemas[name].get("type"), "Any"), None
+        if "anyOf" in schema:
+            options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+            if len(options) == 1:
+                return self.field_type(options[0])
+            return "Any", None
+        if schema.get("type") == "array":
+            item, decode = self.field_type(schema.get("items", {}))
+            if item == "float":
+                # Sample series: 8 bytes per value instead of a boxed float each
+                return "array", "float_array({})"
+            if decode is not None:
+                return f"List[{item}]", decode.replace("nested(", "nested_list(", 1)
+            return f"List[{item}]", None
+        return SCALARS.get(schema.get("type"), "Any"), None
+
+    def visit(self, name: str):
+        """Add a record schema (after the records it references) to the output order."""
+        if name in self.ordered:
+            return
+        for prop in self.schemas[name]["properties"].values():
+            self.field_type(prop)
+        if name not in self.ordered:
+            self.ordered.append(name)
+
+    def record_class(self, name: str) -> str:
+        schema = self.schemas[name]
+        fields = list(schema["properties"].items())
+        description = (schema.get("description") or schema.get("title") or name).strip().splitlines()[0]
+        slots = ", ".join(json.dumps(field) for field, _ in fields) + ("," if len(fields) == 1 else "")
+        lines = [
+            f"class {name}(Record):",
+            f'    """{description}"""',
+            "",
+            f"    __slots__ = ({slots})",
+            "",
+        ]
+        body = []
+        for field, prop in fields:
+            annotation, decode = self.field_type(prop)
+            lines.append(f"    {field}: Optional[{annotation}]")
+            value = f'get("{field}")'
+            body.append(f"        self.{field} = {decode.format(value) if decode else value}")
+        lines += [
+            "",
+            "    @classmethod",
+            f'    def from_dict(cls, data: Dict[str, Any]) -> "{name}":',
+            "        self = cls.__new__(cls)",
+            "        get = data.get",
+            *body,
+            "        return self",
+        ]
+        return "\n".join(lines)
+
+    def collections(self) -> List[Tuple[str, str, str, bool]]:
+        """(collection, record class, query kind, has single-document route) per list endpoint."""
+        paths = self.spec["paths"]
+        singles = {SINGLE_PATH.match(path).group(1) for path in paths if SINGLE_PATH.match(path)}
+        result = []
+        for path, operations in paths.items():
+            match = COLLECTION_PATH.match(path)
+            if not match or match.group(1) == "personal_info":
+                continue
+            operation = operations["get"]
+            params = {param["name"] for param in operation.get("parameters", [])}
+            query = "date" if "start_date" in params else "datetime" if "start_datetime" in params else "none"
+            response = operation["responses"]["200"]["content"]["application/json"]["schema"]
+            data = self.schemas[ref_name(response["$ref"])]["properties"]["data"]
+            record = ref_name(data["items"]["$ref"])
+            self.visit(record)
+            result.append((match.group(1), record, query, match.group(1) in singles))
+        return result
+
+    def endpoint_methods(self, collection: str, record: str, query: str, single: bool) -> str:
+        method = collection.lower()
+        if query == "date":
+            args, call, span = "self, start_date: str, end_date: str", "start_date, end_date", " between start_date and end_date"
+        elif query == "datetime":
+            args, call, span = "self, start_datetime: str, end_datetime: str", "start_datetime, end_datetime", " between two ISO datetimes"
+        else:
+            args, call, span = "self", "", ""
+        call = f'"{collection}"' + (f", {call}" if call else "")
+        lines = [
+            f"    def get_{method}({args}) -> Dict[str, Any]:",
+            f'        """Every {collection} document{span}, as a single response dict."""',
+            f"        return self.get_collection({call})",
+            "",
+            f"    def {method}_records({args}) -> Iterator[{record}]:",
+            f'        """Yield {collection} documents{span} as {record} records."""',
+            f"        return self.iter_records({call})",
+        ]
+        if single:
+            lines += [
+                "",
+                f"    def get_{method}_document(self, document_id: str) -> {record}:",
+                f'        """Fetch one {collection} document by ID."""',
+                f'        return self.get_document("{collection}", document_id)',
+            ]
+        return "\n".join(lines)
+
+    def render(self, spec_name: str) -> str:
+        collections = self.collections()
+        self.visit("PersonalInfoResponse")
+        table = "\n".join(
+            f'    "{name}": Collection("{name}", {record}, "{query}", {single}),'
+            for name, record, query, single in collections
+        )
+        methods = "\n\n".join(self.endpoint_methods(*collection) for collection in collections)
+        return "\n".join([
+            '"""',
+            "Typed records and endpoint methods for every Oura v2 collection.",
+            "",
+            f"Generated by generate_oura_models.py from {spec_name}; do not edit by hand.",
+            '"""',
+            "",
+            "from array import array",
+            "from typing import Any, Dict, Iterator, List, Optional",
+            "",
+            "from oura_records import Collection, Record, float_array, nested, nested_list",
+            "",
+            "",
+            "\n\n\n".join(self.record_class(name) for name in self.ordered),
+            "",
+            "",
+            "COLLECTIONS: Dict[str, Collection] = {",
+            table,
+            "}",
+            "",
+            "",
+            "class OuraEndpoints:",
+            '    """',
+            "    One method per collection endpoint, built on get_collection(),",
+            "    iter_records() and get_document(). On AsyncOuraClient they return",
+            "    coroutines and async iterators instead.",
+            '    """',
+            "",
+            methods,
+            "",
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate src/oura_models.py from the Oura OpenAPI spec")
+    parser.add_argument("--spec", default=os.path.join(ROOT, "openapi-1.27.json"))
+    parser.add_argument("--output", default=os.path.join(ROOT, "src", "oura_models.py"))
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    source = Generator(spec).render(os.path.basename(args.spec))
+    with open(args.output, "w") as f:
+        f.write(source)
+    print(f"✅ Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import os
+import sys
 import webbrowser
-import json
 import requests
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from utils.token_store import TokenFile, stamp_expiry
+
 # Load environment variables
 load_dotenv()
 
@@ -51,7 +54,7 @@ def exchange_code_for_token(code):
         "client_secret": CLIENT_SECRET
     }
     
-    response = requests.post(url, data=data)
+    response = requests.post(url, data=data, timeout=30)
     
     if response.status_code == 200:
         tokens = response.json()
@@ -66,8 +69,10 @@ def exchange_code_for_token(code):
         os._exit(1)
 
 def save_tokens(tokens):
-    with open(TOKEN_FILE, "w") as f:
-        json.dump(tokens, f, indent=4)
+    # Same atomic write and lock as the bot, so a running bot never reads a half-written file
+    token_file = TokenFile(TOKEN_FILE)
+    with token_file.lock():
+        token_file.write(stamp_expiry(tokens))
 
 def main():
     print("--- Oura OAuth2 Setup ---")
@@ -1,46 +1,108 @@
-from openai import OpenAI
+import asyncio
 import json
-from typing import Dict, Any
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+from typing import Dict, Any, AsyncIterator, Iterator, List, NamedTuple, Optional, Tuple
+
+from features import extract_features, estimate_tokens
+from stats_report import PENDING_NOTE, UNAVAILABLE_NOTE, render_stats
+from summary_cache import SummaryCache
+from utils import metrics
+from utils.startup import lazy_import
+from utils.upstream_limits import async_upstream, upstream
+
+logger = logging.getLogger("OuraBot.AISummarizer")
 
 class AISummarizer:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    MODEL = "gpt-5-mini"
+    # Bump whenever the prompt changes so cached summaries are not reused
+    PROMPT_VERSION = "3"
+    SYSTEM_PROMPT = "You are a helpful health assistant. Output ONLY HTML supported by Telegram (b, i). NO ul/li tags."
 
-    def generate_health_summary(
-        self, 
-        sleep_data: Dict[str, Any], 
-        activity_data: Dict[str, Any], 
+    def __init__(self, api_key: str, cache: Optional[SummaryCache] = None, timeout: float = 60.0):
+        self.api_key = api_key
+        self.cache = cache
+        # Per OpenAI request (the client retries twice on top), so a hung upstream can't block a job
+        self.timeout = timeout
+        self.last_prompt_stats: Dict[str, int] = {}
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        """The OpenAI client, created (and the openai package imported) on first use."""
+        if self._client is None:
+            self._client = lazy_import("openai").OpenAI(api_key=self.api_key, timeout=self.timeout)
+        return self._client
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI client for the *_async methods, created on first use."""
+        if self._async_client is None:
+            self._async_client = lazy_import("openai").AsyncOpenAI(api_key=self.api_key, timeout=self.timeout)
+        return self._async_client
+
+    def _compact_data(
+        self,
+        sleep_data: Dict[str, Any],
+        activity_data: Dict[str, Any],
         readiness_data: Dict[str, Any],
         stress_data: Dict[str, Any] = {},
         spo2_data: Dict[str, Any] = {},
-        workout_data: Dict[str, Any] = {}
-    ) -> str:
-        """
-        Generates a health summary using OpenAI based on Oura data.
-        """
-        
-        # Prepare context for the LLM
-        context = {
+        workout_data: Dict[str, Any] = {},
+        sleep_periods_data: Dict[str, Any] = {}
+    ) -> List[Dict[str, Any]]:
+        """Reduce the raw documents to the compact per-day metrics the prompt uses."""
+        features = extract_features(
+            sleep_data,
+            activity_data,
+            readiness_data,
+            stress_data=stress_data,
+            spo2_data=spo2_data,
+            workout_data=workout_data,
+            sleep_periods_data=sleep_periods_data
+        )
+        compact = [f.compact() for f in features]
+
+        raw_context = {
             "sleep": sleep_data.get("data", []),
             "activity": activity_data.get("data", []),
             "readiness": readiness_data.get("data", []),
             "stress": stress_data.get("data", []),
             "spo2": spo2_data.get("data", []),
-            "workouts": workout_data.get("data", [])
+            "workouts": workout_data.get("data", []),
+            "sleep_periods": sleep_periods_data.get("data", [])
         }
-        
-        # Limit data size if necessary by taking only the last item if list is long
-        # But usually we call this with yesterday/today range so it should be small.
-        
+        self.last_prompt_stats = {
+            "raw_tokens": estimate_tokens(json.dumps(raw_context, indent=2)),
+            "compact_tokens": estimate_tokens(json.dumps(compact, separators=(",", ":")))
+        }
+        logger.info(
+            f"Prompt data: ~{self.last_prompt_stats['raw_tokens']} tokens raw -> "
+            f"~{self.last_prompt_stats['compact_tokens']} tokens compact"
+        )
+        return compact
+
+    def _build_messages(
+        self, compact: List[Dict[str, Any]], trends: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, str]]:
+        trends_section = ""
+        if trends:
+            trends_section = f"""
+        Trends vs. personal baselines (avg_Nd = N-day mean, z_30d = std devs from 30-day baseline, wow_delta = this week minus last week):
+        {json.dumps(trends, separators=(",", ":"))}
+        """
         prompt = f"""
         Analyze this Oura data. Output strictly HTML-formatted for Telegram (<b>, <i> only).
+        Units: durations in the field suffix (_h hours, _min minutes), hrv in ms, rhr in bpm.
         
         Data:
-        {json.dumps(context, indent=2)}
-        
+        {json.dumps(compact, separators=(",", ":"))}
+        {trends_section}
         Requirements:
         - <b>Stats</b>: Key metrics (Sleep, Readiness, Activity, HRV, RHR, Stress, SpO2) with values.
-        - <b>Insights</b>: High-value correlations.
+        - <b>Insights</b>: High-value correlations. Call out anomalies and deviations from baseline if trends are given.
         - <b>Action</b>: 1 brief tip.
         
         Rules:
@@ -49,17 +111,311 @@ class AISummarizer:
         - No HTML lists (<ul>, <li>) or <br>.
         - Use "• " for bullets.
         """
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
 
-        try:
+    def complete(self, messages: List[Dict[str, str]]) -> str:
+        """Run one chat completion and return the cleaned text."""
+        with upstream("openai"), metrics.span("openai_request", model=self.MODEL, stream=False):
             response = self.client.chat.completions.create(
-                model="gpt-5-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful health assistant. Output ONLY HTML supported by Telegram (b, i). NO ul/li tags."},
-                    {"role": "user", "content": prompt}
-                ],
+                model=self.MODEL,
+                messages=messages,
             )
-            content = response.choices[0].message.content.strip()
-            # Failsafe: Remove any Markdown bold syntax if the LLM ignores instructions
-            return content.replace("**", "").replace("__", "")
+        return self._completion_text(response)
+
+    async def complete_async(self, messages: List[Dict[str, str]]) -> str:
+        """Async counterpart of complete()."""
+        async with async_upstream("openai"):
+            with metrics.span("openai_request", model=self.MODEL, stream=False):
+                response = await self.async_client.chat.completions.create(
+                    model=self.MODEL,
+                    messages=messages,
+                )
+        return self._completion_text(response)
+
+    def _completion_text(self, response: Any) -> str:
+        self._record_usage(response.usage)
+        return self._clean(response.choices[0].message.content)
+
+    def _record_usage(self, usage: Any):
+        """Count prompt and completion tokens reported by OpenAI."""
+        if usage is None:
+            return
+        metrics.inc("openai_prompt_tokens_total", usage.prompt_tokens or 0, model=self.MODEL)
+        metrics.inc("openai_completion_tokens_total", usage.completion_tokens or 0, model=self.MODEL)
+        logger.info(f"OpenAI usage: {usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens")
+
+    def _fallback(self, compact: List[Dict[str, Any]], error: Exception) -> str:
+        """Stats rendered locally, sent instead of the summary when OpenAI fails."""
+        logger.error(f"Summary generation failed, sending stats only: {error}")
+        metrics.inc("summary_fallbacks_total", reason="error")
+        return render_stats(compact, UNAVAILABLE_NOTE)
+
+    @staticmethod
+    def _clean(content: str) -> str:
+        # Failsafe: Remove any Markdown bold syntax if the LLM ignores instructions
+        return content.strip().replace("**", "").replace("__", "")
+
+    def _cache_lookup(self, compact: List[Dict[str, Any]], trends: Optional[Dict[str, Any]]):
+        """Return (cache key, cached summary or None); the key also fingerprints the summary's inputs."""
+        cache_key = SummaryCache.make_key([compact, trends], self.MODEL, self.PROMPT_VERSION)
+        if self.cache is None:
+            return cache_key, None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Summary cache hit, skipping OpenAI call.")
+        return cache_key, cached
+
+    def _prepare(
+        self, data: Tuple[Dict[str, Any], ...], trends: Optional[Dict[str, Any]], collections: Dict[str, Any]
+    ) -> "_Prepared":
+        """The shared first step of every summary: compact the data and look it up in the cache."""
+        compact = self._compact_data(*data, **collections)
+        cache_key, cached = self._cache_lookup(compact, trends)
+        return _Prepared(compact, trends, cache_key, cached)
+
+    def _store(self, prepared: "_Prepared", summary: str) -> str:
+        if self.cache is not None:
+            self.cache.set(prepared.cache_key, summary)
+        return summary
+
+    def _pending(self, prepared: "_Prepared", budget: float) -> str:
+        """The Stats report sent when the summary misses its latency budget."""
+        logger.warning(f"No summary after {budget:.1f}s, sending stats first.")
+        metrics.inc("summary_fallbacks_total", reason="deadline")
+        return render_stats(prepared.compact, PENDING_NOTE)
+
+    def _stream_failed(self, prepared: "_Prepared", cleaner: "_StreamCleaner", error: Exception) -> str:
+        # Keep whatever already streamed and put the stats after it
+        return ("\n\n" if cleaner.raw else "") + self._fallback(prepared.compact, error)
+
+    def _stream_done(self, prepared: "_Prepared", cleaner: "_StreamCleaner") -> str:
+        """Cache the streamed summary and return the held-back tail, if any."""
+        self._store(prepared, self._clean(cleaner.raw))
+        return cleaner.flush()
+
+    def data_fingerprint(self, *data: Dict[str, Any], **collections: Dict[str, Any]) -> str:
+        """
+        Fingerprint of a summary's data, model and prompt, without trends:
+        cheap enough to check before deriving anything from the data.
+        """
+        return SummaryCache.make_key(self._compact_data(*data, **collections), self.MODEL, self.PROMPT_VERSION)
+
+    def summary_request(
+        self, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None, **collections: Dict[str, Any]
+    ) -> Tuple[str, Optional[str], List[Dict[str, str]]]:
+        """
+        (cache key, cached summary or None, chat messages) for a daily summary.
+
+        Every summary method takes the same data: the sleep, activity and
+        readiness responses, optionally stress_data, spo2_data, workout_data
+        and sleep_periods_data, and `trends` from TrendEngine.
+
+        For callers that send the request themselves, such as the Batch API;
+        pass the completion to accept_completion() and cache the result
+        under the key. The key changes exactly when the summary would, so it
+        also serves as a fingerprint of the inputs.
+        """
+        prepared = self._prepare(data, trends, collections)
+        return prepared.cache_key, prepared.cached, self._build_messages(prepared.compact, trends)
+
+    def accept_completion(self, body: Dict[str, Any]) -> str:
+        """Record usage and return the cleaned text of a raw chat completion response body."""
+        usage = body.get("usage")
+        if usage:
+            self._record_usage(SimpleNamespace(**usage))
+        return self._clean(body["choices"][0]["message"]["content"])
+
+    def generate_health_summary(
+        self, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None, **collections: Dict[str, Any]
+    ) -> str:
+        """
+        Generates a health summary using OpenAI based on Oura data (see summary_request()).
+
+        `trends` is the derived baseline/anomaly summary from TrendEngine.
+        Identical input (same metrics, model and prompt version) is served
+        from the cache without calling OpenAI.
+        """
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            return prepared.cached
+        try:
+            summary = self.complete(self._build_messages(prepared.compact, trends))
+        except Exception as e:
+            return self._fallback(prepared.compact, e)
+        return self._store(prepared, summary)
+
+    async def generate_health_summary_async(
+        self, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None, **collections: Dict[str, Any]
+    ) -> str:
+        """Async counterpart of generate_health_summary(), using AsyncOpenAI."""
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            return prepared.cached
+        try:
+            summary = await self.complete_async(self._build_messages(prepared.compact, trends))
+        except Exception as e:
+            return self._fallback(prepared.compact, e)
+        return self._store(prepared, summary)
+
+    def hedged_health_summary(
+        self, budget: float, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None,
+        **collections: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Yield versions of the summary, the first within `budget` seconds.
+
+        If OpenAI hasn't answered by the deadline, a Stats-only report rendered
+        locally from the metrics is yielded first, then the full summary once
+        it arrives. The last version is the final text; it is never an error
+        message (on failure it is the Stats report with a note).
+        """
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            yield prepared.cached
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+        future = executor.submit(self.complete, self._build_messages(prepared.compact, trends))
+        executor.shutdown(wait=False)
+        try:
+            try:
+                summary = future.result(timeout=budget)
+            except FutureTimeoutError:
+                yield self._pending(prepared, budget)
+                summary = future.result()
+        except Exception as e:
+            yield self._fallback(prepared.compact, e)
+            return
+        yield self._store(prepared, summary)
+
+    async def hedged_health_summary_async(
+        self, budget: float, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None,
+        **collections: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Async counterpart of hedged_health_summary(), using AsyncOpenAI."""
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            yield prepared.cached
+            return
+
+        task = asyncio.ensure_future(self.complete_async(self._build_messages(prepared.compact, trends)))
+        try:
+            try:
+                # shield: the deadline only stops the wait, not the request
+                summary = await asyncio.wait_for(asyncio.shield(task), budget)
+            except asyncio.TimeoutError:
+                yield self._pending(prepared, budget)
+                summary = await task
+        except Exception as e:
+            yield self._fallback(prepared.compact, e)
+            return
+        yield self._store(prepared, summary)
+
+    def stream_health_summary(
+        self, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None, **collections: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Like generate_health_summary(), but yields text chunks as OpenAI streams them.
+
+        A cache hit is yielded as a single chunk.
+        """
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            yield prepared.cached
+            return
+
+        cleaner = _StreamCleaner()
+        try:
+            # Hold the OpenAI slot for the whole stream
+            with upstream("openai"), metrics.span("openai_request", model=self.MODEL, stream=True):
+                stream = self.client.chat.completions.create(**self._stream_request(prepared))
+                for event in stream:
+                    text = self._stream_event(event, cleaner)
+                    if text:
+                        yield text
         except Exception as e:
-            return f"Error generating summary: {e}"
+            yield self._stream_failed(prepared, cleaner, e)
+            return
+
+        tail = self._stream_done(prepared, cleaner)
+        if tail:
+            yield tail
+
+    async def stream_health_summary_async(
+        self, *data: Dict[str, Any], trends: Optional[Dict[str, Any]] = None, **collections: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Async counterpart of stream_health_summary(), using AsyncOpenAI."""
+        prepared = self._prepare(data, trends, collections)
+        if prepared.cached is not None:
+            yield prepared.cached
+            return
+
+        cleaner = _StreamCleaner()
+        try:
+            async with async_upstream("openai"):
+                with metrics.span("openai_request", model=self.MODEL, stream=True):
+                    stream = await self.async_client.chat.completions.create(**self._stream_request(prepared))
+                    async for event in stream:
+                        text = self._stream_event(event, cleaner)
+                        if text:
+                            yield text
+        except Exception as e:
+            yield self._stream_failed(prepared, cleaner, e)
+            return
+
+        tail = self._stream_done(prepared, cleaner)
+        if tail:
+            yield tail
+
+    def _stream_request(self, prepared: "_Prepared") -> Dict[str, Any]:
+        return {
+            "model": self.MODEL,
+            "messages": self._build_messages(prepared.compact, prepared.trends),
+            "stream": True,
+            # The final chunk then carries token usage
+            "stream_options": {"include_usage": True},
+        }
+
+    def _stream_event(self, event: Any, cleaner: "_StreamCleaner") -> str:
+        """Record usage from a stream event and return its cleaned text, if any."""
+        if getattr(event, "usage", None):
+            self._record_usage(event.usage)
+        if not event.choices or not event.choices[0].delta.content:
+            return ""
+        return cleaner.feed(event.choices[0].delta.content)
+
+
+class _Prepared(NamedTuple):
+    """A summary's compact inputs, cache key and cached text, if any."""
+
+    compact: List[Dict[str, Any]]
+    trends: Optional[Dict[str, Any]]
+    cache_key: str
+    cached: Optional[str]
+
+
+class _StreamCleaner:
+    """Strips Markdown bold markers from streamed text, even when split across chunks."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._held = ""
+
+    @property
+    def raw(self) -> str:
+        """Everything fed so far, uncleaned."""
+        return "".join(self._parts)
+
+    def feed(self, delta: str) -> str:
+        self._parts.append(delta)
+        # Hold back trailing * / _ so Markdown markers split across chunks are still removed
+        text = (self._held + delta).rstrip("*_")
+        self._held = (self._held + delta)[len(text):]
+        return text.replace("**", "").replace("__", "")
+
+    def flush(self) -> str:
+        held, self._held = self._held, ""
+        return held.replace("**", "").replace("__", "")
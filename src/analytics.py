@@ -0,0 +1,161 @@
+"""Vectorized trend analytics over daily Oura metrics."""
+
+import os
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+from features import DailyFeatures
+
+# Metrics tracked over time, in column order
+METRICS = ("readiness_score", "sleep_score", "hrv_ms", "rhr_bpm", "stress_high_min", "spo2_avg")
+
+WINDOWS = (7, 30, 90)
+
+# Only report correlations at least this strong
+MIN_CORRELATION = 0.5
+
+
+class TrendEngine:
+    """
+    Daily metric history as a dense (days x metrics) array with NaN for gaps.
+
+    Running sums are kept alongside the values so rolling means and
+    standard deviations for any window are O(1) per day, and appending a
+    day only extends them instead of recomputing the whole history.
+    """
+
+    def __init__(self, start_day: Optional[date] = None, values: Optional[np.ndarray] = None):
+        self.start_day = start_day
+        self.values = values if values is not None else np.empty((0, len(METRICS)))
+        self._rebuild_sums(0)
+
+    @property
+    def last_day(self) -> Optional[date]:
+        if self.start_day is None or not len(self.values):
+            return None
+        return self.start_day + timedelta(days=len(self.values) - 1)
+
+    def _rebuild_sums(self, from_index: int):
+        """Recompute running sums from `from_index` onwards (cumulative, with a leading zero row)."""
+        if from_index == 0:
+            self._sum = np.zeros((1, len(METRICS)))
+            self._sq = np.zeros((1, len(METRICS)))
+            self._count = np.zeros((1, len(METRICS)))
+
+        rows = self.values[from_index:]
+        present = ~np.isnan(rows)
+        filled = np.where(present, rows, 0.0)
+        base = slice(0, from_index + 1)
+        self._sum = np.vstack([self._sum[base], self._sum[from_index] + np.cumsum(filled, axis=0)])
+        self._sq = np.vstack([self._sq[base], self._sq[from_index] + np.cumsum(filled ** 2, axis=0)])
+        self._count = np.vstack([self._count[base], self._count[from_index] + np.cumsum(present, axis=0)])
+
+    def update(self, features: Iterable[DailyFeatures]):
+        """Insert or overwrite days, then extend the running sums from the earliest change."""
+        features = list(features)
+        if not features:
+            return
+
+        days = [date.fromisoformat(f.day) for f in features]
+        if self.start_day is None:
+            self.start_day = min(days)
+        if min(days) < self.start_day:
+            pad = (self.start_day - min(days)).days
+            self.values = np.vstack([np.full((pad, len(METRICS)), np.nan), self.values])
+            self.start_day = min(days)
+            earliest_change = 0
+        else:
+            earliest_change = (min(days) - self.start_day).days
+
+        needed = (max(days) - self.start_day).days + 1
+        if needed > len(self.values):
+            self.values = np.vstack([self.values, np.full((needed - len(self.values), len(METRICS)), np.nan)])
+
+        for day, feature in zip(days, features):
+            row = [getattr(feature, metric) for metric in METRICS]
+            self.values[(day - self.start_day).days] = [np.nan if v is None else v for v in row]
+
+        self._rebuild_sums(earliest_change)
+
+    def _window_stats(self, end: int, window: int):
+        """Mean, std and count over rows [end - window, end) for every metric."""
+        start = max(0, end - window)
+        count = self._count[end] - self._count[start]
+        total = self._sum[end] - self._sum[start]
+        sq = self._sq[end] - self._sq[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            std = np.sqrt(np.maximum(sq / count - mean ** 2, 0.0))
+        return mean, std, count
+
+    def summary(self) -> Dict[str, Any]:
+        """Derived numbers for the latest day: baselines, z-scores, deltas, correlations."""
+        if self.last_day is None:
+            return {}
+
+        n = len(self.values)
+        latest = self.values[-1]
+        means = {w: self._window_stats(n, w)[0] for w in WINDOWS}
+        # Baseline for anomalies excludes the day being scored
+        base_mean, base_std, base_count = self._window_stats(n - 1, 30)
+        this_week = self._window_stats(n, 7)[0]
+        last_week = self._window_stats(n - 7, 7)[0] if n > 7 else np.full(len(METRICS), np.nan)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where((base_count >= 7) & (base_std > 0), (latest - base_mean) / base_std, np.nan)
+        wow = this_week - last_week
+
+        metrics = {}
+        for i, metric in enumerate(METRICS):
+            entry = {
+                "latest": latest[i],
+                "avg_7d": means[7][i],
+                "avg_30d": means[30][i],
+                "avg_90d": means[90][i],
+                "z_30d": z[i],
+                "wow_delta": wow[i],
+            }
+            entry = {k: round(float(v), 1) for k, v in entry.items() if not np.isnan(v)}
+            if entry:
+                metrics[metric] = entry
+
+        return {
+            "as_of": self.last_day.isoformat(),
+            "metrics": metrics,
+            "anomalies": [METRICS[i] for i in np.flatnonzero(np.abs(np.nan_to_num(z)) >= 2)],
+            "correlations_30d": self.correlations(30),
+        }
+
+    def correlations(self, window: int = 30) -> List[Dict[str, Any]]:
+        """Pearson correlations between metric pairs over the last `window` days."""
+        recent = self.values[-window:]
+        complete = recent[~np.isnan(recent).any(axis=1)]
+        if len(complete) < 7:
+            return []
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.corrcoef(complete, rowvar=False)
+        rows, cols = np.triu_indices(len(METRICS), k=1)
+        strong = np.abs(np.nan_to_num(matrix[rows, cols])) >= MIN_CORRELATION
+        return [
+            {"pair": f"{METRICS[r]}~{METRICS[c]}", "r": round(float(matrix[r, c]), 2)}
+            for r, c in zip(rows[strong], cols[strong])
+        ]
+
+    def save(self, path: str):
+        if self.start_day is None:
+            return
+        # Pass a file object so numpy doesn't append ".npz" to the path
+        with open(path, "wb") as f:
+            np.savez(f, start_day=np.datetime64(self.start_day, "D"), values=self.values)
+
+    @classmethod
+    def load(cls, path: str) -> "TrendEngine":
+        """Load a saved engine, or return an empty one if the file doesn't exist."""
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as saved:
+            start_day = saved["start_day"].astype("datetime64[D]").item()
+            return cls(start_day=start_day, values=saved["values"])
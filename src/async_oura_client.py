@@ -0,0 +1,158 @@
+"""Asyncio variant of OuraClient built on httpx."""
+
+import asyncio
+import os
+from typing import Dict, Any, AsyncIterator, Iterable, Optional
+
+from oura_client import OuraAuth, OuraClient
+from oura_models import COLLECTIONS, OuraEndpoints
+from oura_records import Record
+from utils import fast_json, metrics
+from utils.async_http import AsyncTokenBucket, build_async_client, request_with_retry_async
+from utils.http_transport import build_session, request_with_retry
+
+
+class AsyncOuraClient(OuraAuth, OuraEndpoints):
+    """
+    Async client for the Oura V2 API.
+
+    Mirrors OuraClient's read API (same token file, refresh rules and rate
+    limit), but every request is a coroutine on one shared httpx
+    AsyncClient, so many users and collections can be fetched from a
+    single thread. Use `async with` or call aclose() when done.
+    """
+
+    DAILY_COLLECTIONS = OuraClient.DAILY_COLLECTIONS
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        token_file: str = "oura_tokens.json",
+        api_url: Optional[str] = None,
+        max_connections: int = 20,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_url = api_url or os.getenv("OURA_API_URL", OuraClient.API_URL)
+        self.base_url = f"{self.api_url}/v2"
+        self.http = build_async_client(max_connections=max_connections)
+        self.limiter = AsyncTokenBucket(
+            rate=OuraClient.RATE_LIMIT_REQUESTS / OuraClient.RATE_LIMIT_PERIOD, capacity=50
+        )
+        # Refreshes are rare and run on a worker thread, so they get a small blocking session
+        self._refresh_session = None
+        # Lets one task at a time wait for a refresh thread, instead of tying up the pool
+        self._refresh_gate = asyncio.Lock()
+        self._init_auth(token_file)
+
+    async def __aenter__(self) -> "AsyncOuraClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.http.aclose()
+        if self._refresh_session is not None:
+            self._refresh_session.close()
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens.get('access_token')}"}
+
+    def _send_refresh(self, data: Dict[str, Any]):
+        if self._refresh_session is None:
+            self._refresh_session = build_session(pool_maxsize=1)
+        return request_with_retry(
+            self._refresh_session, "POST", f"{self.api_url}/oauth/token",
+            data=data, upstream_name="oura", max_retries=0,
+        )
+
+    async def _refresh_async(self, token_used: Optional[str]):
+        """
+        OuraAuth._refresh_if_stale() on a worker thread: the file lock, the
+        token file reads and writes and the refresh request all block, and
+        running them as one call means a cancelled task can't leave the
+        lock held (the thread finishes and releases it).
+        """
+        async with self._refresh_gate:
+            await asyncio.to_thread(self._refresh_if_stale, token_used)
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, retry: bool = True) -> Dict[str, Any]:
+        if self._token_expiring():
+            try:
+                await self._refresh_async(self.tokens.get("access_token"))
+            except Exception as e:
+                print(f"❌ Failed to refresh token: {e}")
+        token_used = self.tokens.get("access_token")
+        with metrics.span("oura_request", endpoint=endpoint) as span:
+            response = await request_with_retry_async(
+                self.http, "GET", f"{self.base_url}{endpoint}",
+                params=params, headers=self._headers(), limiter=self.limiter, upstream_name="oura"
+            )
+            span.labels["status"] = response.status_code
+
+        if response.status_code == 401 and retry:
+            try:
+                await self._refresh_async(token_used)
+                return await self._get(endpoint, params, retry=False)
+            except Exception as e:
+                print(f"❌ Failed to refresh token: {e}")
+                response.raise_for_status()
+
+        response.raise_for_status()
+        return fast_json.loads(response.content)
+
+    async def get_personal_info(self) -> Dict[str, Any]:
+        return await self._get("/usercollection/personal_info")
+
+    async def _iter_pages(self, endpoint: str, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            page = await self._get(endpoint, params=params)
+            for document in page.get("data", []):
+                yield document
+
+            next_token = page.get("next_token")
+            if not next_token:
+                return
+            params = {**params, "next_token": next_token}
+
+    def iter_collection(self, endpoint: str, start_date: str, end_date: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield documents one at a time, following `next_token` lazily."""
+        return self._iter_pages(endpoint, {"start_date": start_date, "end_date": end_date})
+
+    def iter_heartrate(self, start_datetime: str, end_datetime: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield heart rate samples ({bpm, source, timestamp}) between two ISO datetimes."""
+        return self._iter_pages("/usercollection/heartrate", {
+            "start_datetime": start_datetime,
+            "end_datetime": end_datetime
+        })
+
+    async def get_collection(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """Fetch every page of a collection (e.g. "daily_sleep") into a single response dict."""
+        params = COLLECTIONS[collection].params(start, end)
+        documents = [doc async for doc in self._iter_pages(f"/usercollection/{collection}", params)]
+        return {"data": documents, "next_token": None}
+
+    async def iter_records(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> AsyncIterator[Record]:
+        """Yield a collection's documents as typed records."""
+        spec = COLLECTIONS[collection]
+        async for document in self._iter_pages(f"/usercollection/{collection}", spec.params(start, end)):
+            yield spec.record.from_dict(document)
+
+    async def get_document(self, collection: str, document_id: str) -> Record:
+        """Fetch a single document of a collection by ID."""
+        return COLLECTIONS[collection].record.from_dict(await self._get(f"/usercollection/{collection}/{document_id}"))
+
+    async def get_collections(
+        self,
+        start_date: str,
+        end_date: str,
+        collections: Iterable[str] = DAILY_COLLECTIONS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch several collections concurrently; returns a dict keyed by collection name."""
+        collections = list(collections)
+        results = await asyncio.gather(
+            *(self.get_collection(name, start_date, end_date) for name in collections)
+        )
+        return dict(zip(collections, results))
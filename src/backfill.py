@@ -0,0 +1,211 @@
+"""Backfill a user's full Oura history into the local store."""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from oura_client import OuraClient
+from oura_store import OuraStore, OuraSync
+from timeseries import TimeSeriesStore
+from users import UserConfig, default_user, load_users
+from utils import metrics
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger("OuraBot.Backfill")
+
+# Every date-ranged /usercollection endpoint in openapi-1.27.json
+# (ring_configuration has no date filter; heartrate is handled separately)
+BACKFILL_COLLECTIONS = (
+    "daily_activity",
+    "daily_cardiovascular_age",
+    "daily_readiness",
+    "daily_resilience",
+    "daily_sleep",
+    "daily_spo2",
+    "daily_stress",
+    "enhanced_tag",
+    "rest_mode_period",
+    "session",
+    "sleep",
+    "sleep_time",
+    "tag",
+    "vO2_max",
+    "workout",
+)
+
+
+def plan_chunks(
+    since: date, until: date, collections: Iterable[str], chunk_days: int
+) -> List[Tuple[str, str, str]]:
+    """Split [since, until) into (collection, start, end) chunks of at most `chunk_days`."""
+    chunks = []
+    for collection in collections:
+        start = since
+        while start < until:
+            end = min(start + timedelta(days=chunk_days), until)
+            chunks.append((collection, start.isoformat(), end.isoformat()))
+            start = end
+    return chunks
+
+
+def backfill_heartrate(
+    oura: OuraClient,
+    store: OuraStore,
+    timeseries: TimeSeriesStore,
+    start: str,
+    end: str,
+    recent: str,
+) -> int:
+    """
+    Fetch one heart rate chunk unless every day of it is already synced.
+
+    Days are checkpointed under the "heartrate" collection of synced_days,
+    except those from `recent` on, whose samples may still be uploading.
+    Returns samples written.
+    """
+    days = [
+        (date.fromisoformat(start) + timedelta(days=i)).isoformat()
+        for i in range((date.fromisoformat(end) - date.fromisoformat(start)).days)
+    ]
+    if len(store.synced_days("heartrate", start, end)) == len(days):
+        return 0
+    # Samples are merged by timestamp, so re-fetching a partly synced chunk is harmless
+    samples = timeseries.ingest_heartrate(oura, start, end)
+    store.mark_synced("heartrate", [day for day in days if day < recent])
+    return samples
+
+
+def backfill(
+    oura: OuraClient,
+    store: OuraStore,
+    since: date,
+    until: date,
+    collections: Iterable[str] = BACKFILL_COLLECTIONS,
+    chunk_days: int = 30,
+    workers: int = 8,
+    timeseries: Optional[TimeSeriesStore] = None,
+) -> Dict[str, float]:
+    """
+    Fetch every chunk in parallel, skipping days already synced.
+
+    Progress is checkpointed per chunk in the store's synced_days table,
+    so an interrupted backfill resumes where it stopped. Requests go
+    through the client's rate limiter, so `workers` only bounds how many
+    are in flight. Heart rate, when `timeseries` is given, is chunked and
+    checkpointed the same way. Returns throughput stats.
+    """
+    collections = list(collections)
+    # Historical days never change, so don't re-fetch days already synced
+    sync = OuraSync(oura, store, refresh_after=float("inf"))
+    chunks = plan_chunks(since, until, collections, chunk_days)
+    if timeseries is not None:
+        chunks += plan_chunks(since, until, ["heartrate"], chunk_days)
+    recent = (date.today() - timedelta(days=sync.trailing_days)).isoformat()
+    documents = 0
+    samples = 0
+    done = 0
+    started = time.monotonic()
+
+    logger.info(f"Backfilling {since} to {until}: {len(chunks)} chunks across {len(collections)} collections.")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+        futures = {}
+        for chunk in chunks:
+            collection, start, end = chunk
+            if collection == "heartrate":
+                future = executor.submit(backfill_heartrate, oura, store, timeseries, start, end, recent)
+            else:
+                future = executor.submit(sync.sync_collection, *chunk)
+            futures[future] = chunk
+        for future in as_completed(futures):
+            collection, start, end = futures[future]
+            try:
+                written = future.result()
+            except Exception as e:
+                # Leave the chunk unsynced; the next run retries it
+                logger.error(f"Chunk {collection} {start}..{end} failed: {e}")
+                continue
+            done += 1
+            if collection == "heartrate":
+                samples += written
+                logger.info(f"[{done}/{len(chunks)}] heartrate {start}..{end}: {written} samples")
+                continue
+            documents += written
+            rate = documents / max(time.monotonic() - started, 1e-9)
+            logger.info(f"[{done}/{len(chunks)}] {collection} {start}..{end}: {written} docs ({rate:.1f} docs/s)")
+
+    elapsed = time.monotonic() - started
+    stats = {
+        "chunks": len(chunks),
+        "chunks_done": done,
+        "documents": documents,
+        "heartrate_samples": samples,
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(documents / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info(
+        f"Backfill finished: {documents} documents in {elapsed:.1f}s "
+        f"({stats['docs_per_second']} docs/s), {done}/{len(chunks)} chunks."
+    )
+    return stats
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Backfill Oura history into the local store")
+    parser.add_argument("--since", required=True, help="First day to fetch (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Day to stop before (YYYY-MM-DD, default today)")
+    parser.add_argument("--users", type=str, help="JSON file of users (multi-user mode)")
+    parser.add_argument("--user", type=str, help="Only backfill this user from --users")
+    parser.add_argument("--chunk-days", type=int, default=30, help="Days per request chunk")
+    parser.add_argument("--workers", type=int, default=8, help="Chunks fetched in parallel")
+    parser.add_argument("--heartrate", action="store_true", help="Also backfill heart rate time series")
+    parser.add_argument("--metrics-file", type=str, help="Append request timings as JSON lines to this file")
+    args = parser.parse_args()
+
+    metrics.configure(jsonl_path=args.metrics_file)
+
+    since = date.fromisoformat(args.since)
+    until = date.fromisoformat(args.until) if args.until else date.today()
+
+    users: List[UserConfig] = load_users(args.users) if args.users else [default_user()]
+    if args.user:
+        users = [user for user in users if user.name == args.user]
+
+    for user in users:
+        logger.info(f"Backfilling {user.name}...")
+        oura = OuraClient(
+            client_id=os.getenv("OURA_CLIENT_ID"),
+            client_secret=os.getenv("OURA_CLIENT_SECRET"),
+            token_file=user.token_file,
+            max_workers=args.workers
+        )
+        timeseries = None
+        if args.heartrate:
+            timeseries = TimeSeriesStore(os.path.splitext(user.db_path)[0] + "_timeseries")
+        with OuraStore(user.db_path) as store:
+            backfill(
+                oura,
+                store,
+                since,
+                until,
+                chunk_days=args.chunk_days,
+                workers=args.workers,
+                timeseries=timeseries
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Fleet-wide daily summaries through the OpenAI Batch API."""
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from ai_summarizer import AISummarizer
+from utils import fast_json, metrics
+
+logger = logging.getLogger("OuraBot.Batch")
+
+# Batch states after which no more results will appear
+_FINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchSummarizer:
+    """
+    Generate many users' daily summaries with one Batch API job.
+
+    add() prepares each user's prompt (users whose summary is already
+    cached are skipped). run() uploads the requests as JSONL, creates the
+    batch, polls it, downloads the output and maps each result back by
+    its custom_id. Requests that fail in the batch, or haven't finished
+    by `timeout`, are sent as regular chat completions instead. Results
+    go into the summarizer's cache, where the daily jobs find them at
+    delivery time.
+    """
+
+    ENDPOINT = "/v1/chat/completions"
+
+    def __init__(
+        self,
+        summarizer: AISummarizer,
+        poll_interval: float = 30.0,
+        timeout: float = 3600.0,
+        max_workers: int = 8,
+    ):
+        self.summarizer = summarizer
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_workers = max_workers
+        # custom_id -> (cache key, chat messages)
+        self._requests: Dict[str, Tuple[str, List[Dict[str, str]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def add(self, custom_id: str, *args, **kwargs) -> bool:
+        """
+        Queue a daily summary under `custom_id` (e.g. the user's name).
+
+        Takes the same arguments as AISummarizer.generate_health_summary().
+        Returns False if the summary is already cached.
+        """
+        cache_key, cached, messages = self.summarizer.summary_request(*args, **kwargs)
+        if cached is not None:
+            return False
+        self._requests[custom_id] = (cache_key, messages)
+        return True
+
+    def run(self) -> Dict[str, str]:
+        """Generate every queued summary; returns summaries by custom_id."""
+        if not self._requests:
+            return {}
+
+        started = time.perf_counter()
+        results: Dict[str, str] = {}
+        try:
+            results = self._run_batch()
+        except Exception as e:
+            logger.error(f"Batch job failed: {e}")
+
+        from_batch = len(results)
+        stragglers = [custom_id for custom_id in self._requests if custom_id not in results]
+        if stragglers:
+            logger.info(f"Sending {len(stragglers)} request(s) missing from the batch individually.")
+            results.update(self._run_individually(stragglers))
+
+        cache = self.summarizer.cache
+        if cache is not None:
+            cache.set_many({self._requests[custom_id][0]: text for custom_id, text in results.items()})
+        logger.info(
+            f"Generated {len(results)}/{len(self._requests)} summaries ({from_batch} via batch) "
+            f"in {time.perf_counter() - started:.0f}s."
+        )
+        self._requests.clear()
+        return results
+
+    def _run_batch(self) -> Dict[str, str]:
+        client = self.summarizer.client
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": self.ENDPOINT,
+                "body": {"model": self.summarizer.MODEL, "messages": messages},
+            }, separators=(",", ":"))
+            for custom_id, (_, messages) in self._requests.items()
+        ]
+        with metrics.span("openai_batch", stage="submit"):
+            upload = client.files.create(file=("summaries.jsonl", "\n".join(lines).encode()), purpose="batch")
+            batch = client.batches.create(
+                input_file_id=upload.id,
+                endpoint=self.ENDPOINT,
+                completion_window="24h",
+                metadata={"kind": "daily_summary"},
+            )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} request(s).")
+
+        with metrics.span("openai_batch", stage="wait"):
+            batch = self._wait(batch)
+        logger.info(f"Batch {batch.id} finished as '{batch.status}'.")
+
+        if not batch.output_file_id:
+            return {}
+        with metrics.span("openai_batch", stage="download"):
+            output = client.files.content(batch.output_file_id).content
+        return self._parse_output(output)
+
+    def _wait(self, batch: Any) -> Any:
+        """Poll until the batch finishes; past the timeout, cancel it to collect partial results."""
+        client = self.summarizer.client
+        deadline = time.monotonic() + self.timeout
+        while batch.status not in _FINAL_STATES:
+            if time.monotonic() >= deadline:
+                logger.warning(f"Batch {batch.id} not finished after {self.timeout:.0f}s; cancelling.")
+                batch = client.batches.cancel(batch.id)
+                # Completed requests are written to the output once cancellation finishes
+                deadline = time.monotonic() + max(self.poll_interval * 4, 60)
+                while batch.status not in _FINAL_STATES and time.monotonic() < deadline:
+                    time.sleep(self.poll_interval)
+                    batch = client.batches.retrieve(batch.id)
+                return batch
+            time.sleep(self.poll_interval)
+            batch = client.batches.retrieve(batch.id)
+        return batch
+
+    def _parse_output(self, output: bytes) -> Dict[str, str]:
+        results = {}
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = fast_json.loads(line)
+            custom_id = record.get("custom_id")
+            response = record.get("response") or {}
+            if custom_id not in self._requests or record.get("error") or response.get("status_code") != 200:
+                metrics.inc("openai_batch_requests_total", status="failed")
+                continue
+            try:
+                results[custom_id] = self.summarizer.accept_completion(response["body"])
+            except (KeyError, IndexError, TypeError):
+                metrics.inc("openai_batch_requests_total", status="failed")
+                continue
+            metrics.inc("openai_batch_requests_total", status="completed")
+        return results
+
+    def _run_individually(self, custom_ids: List[str]) -> Dict[str, str]:
+        def complete(custom_id: str) -> Optional[str]:
+            try:
+                return self.summarizer.complete(self._requests[custom_id][1])
+            except Exception as e:
+                logger.error(f"Summary for {custom_id} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            texts = executor.map(complete, custom_ids)
+            results = {custom_id: text for custom_id, text in zip(custom_ids, texts) if text is not None}
+        metrics.inc("openai_batch_fallbacks_total", len(custom_ids))
+        return results
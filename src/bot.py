@@ -1,14 +1,43 @@
-import os
 import time
-import schedule
+# Measured before anything else is imported, for --profile-startup
+_IMPORTS_STARTED = time.perf_counter()
+
+import os
+import asyncio
+import atexit
 import argparse
 import logging
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, tzinfo
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Optional
+from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
 from oura_client import OuraClient
+from oura_store import AsyncOuraSync, OuraStore, OuraSync
+from scheduler import Scheduler
 from ai_summarizer import AISummarizer
+from batch_summarizer import BatchSummarizer
+from delivery_queue import DeliveryQueue
+from digest import DigestSummarizer
+from features import extract_features
+from summary_cache import SummaryCache
+from users import UserConfig, default_user, load_users
+from utils import metrics, startup, upstream_limits
+from utils.startup import lazy_import
+from utils.html_utils import split_html
 from utils.telegram_notifier import TelegramNotifier
+from webhook_server import WebhookReceiver
+
+if TYPE_CHECKING:
+    from async_oura_client import AsyncOuraClient
+
+# numpy (analytics, timeseries), openai and httpx (--async) are imported
+# on first use, so a --run-now with no new data never loads them
+startup.record("bot", time.perf_counter() - _IMPORTS_STARTED)
 
 # Configure logging
 logging.basicConfig(
@@ -19,17 +48,271 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger("OuraBot")
+# httpx (--async) logs every request URL at INFO, and Telegram's include the bot token
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Webhook events for these collections mean yesterday's summary can be built
+SUMMARY_TRIGGERS = {"daily_sleep", "daily_readiness", "daily_activity"}
+
+# Date each user's last summary was sent, so webhook and scheduled runs don't double-send
+last_summary_dates: Dict[str, date] = {}
+
+# --latency-budget: seconds before the locally rendered stats are sent in place of a late AI summary
+latency_budget: Optional[float] = None
+
+# One OuraClient per user, kept so each user's session and connection pool is reused across runs
+_oura_clients: Dict[str, OuraClient] = {}
+_oura_clients_lock = threading.Lock()
+
+def get_oura_client(user: UserConfig) -> OuraClient:
+    """Return the cached OuraClient for a user, creating it on first use."""
+    with _oura_clients_lock:
+        client = _oura_clients.get(user.name)
+        if client is None:
+            client = OuraClient(
+                client_id=os.getenv("OURA_CLIENT_ID"),
+                client_secret=os.getenv("OURA_CLIENT_SECRET"),
+                token_file=user.token_file
+            )
+            _oura_clients[user.name] = client
+        return client
+
+# One OuraStore per database, so jobs share its connection instead of leaking one per run
+_oura_stores: Dict[str, OuraStore] = {}
+_oura_stores_lock = threading.Lock()
+
+def get_oura_store(user: UserConfig) -> OuraStore:
+    """Return the cached OuraStore for a user's database, opening it on first use."""
+    with _oura_stores_lock:
+        store = _oura_stores.get(user.db_path)
+        if store is None:
+            store = OuraStore(user.db_path)
+            _oura_stores[user.db_path] = store
+        return store
+
+def close_oura_stores():
+    with _oura_stores_lock:
+        for store in _oura_stores.values():
+            store.close()
+        _oura_stores.clear()
+
+# Each user's configured timezone (inferred offsets are looked up every time)
+_user_timezones: Dict[str, tzinfo] = {}
+
+def user_timezone(user: UserConfig) -> Optional[tzinfo]:
+    """
+    The user's timezone: `timezone` from their config (an IANA name, which
+    follows DST), else the UTC offset of their latest synced sleep or
+    activity, else None (server local time).
+    """
+    if user.timezone:
+        if user.name not in _user_timezones:
+            _user_timezones[user.name] = ZoneInfo(user.timezone)
+        return _user_timezones[user.name]
+    if not os.path.exists(user.db_path):
+        return None
+    # Not cached: a fixed offset goes stale at DST, new data carries the new one
+    store = get_oura_store(user)
+    for collection, field in (("sleep", "bedtime_start"), ("daily_activity", "timestamp")):
+        document = store.latest_document(collection)
+        if document and document.get(field):
+            return datetime.fromisoformat(document[field]).tzinfo
+    return None
+
+def user_today(user: UserConfig) -> date:
+    """Today's date where the user is."""
+    return datetime.now(user_timezone(user)).date()
+
+# Async mode: one AsyncOuraClient per user plus one HTTP client for Telegram, all on the event loop
+_async_oura_clients: Dict[str, "AsyncOuraClient"] = {}
+_async_telegram_http = None
+
+def get_async_oura_client(user: UserConfig) -> "AsyncOuraClient":
+    """Return the cached AsyncOuraClient for a user, creating it on first use."""
+    client = _async_oura_clients.get(user.name)
+    if client is None:
+        client = lazy_import("async_oura_client").AsyncOuraClient(
+            client_id=os.getenv("OURA_CLIENT_ID"),
+            client_secret=os.getenv("OURA_CLIENT_SECRET"),
+            token_file=user.token_file
+        )
+        _async_oura_clients[user.name] = client
+    return client
+
+def get_async_telegram(chat_id: str, **kwargs):
+    """Return an AsyncTelegramNotifier for `chat_id` on the shared HTTP client."""
+    global _async_telegram_http
+    if _async_telegram_http is None:
+        _async_telegram_http = lazy_import("utils.async_http").build_async_client()
+    return lazy_import("utils.async_telegram_notifier").AsyncTelegramNotifier(
+        os.getenv("TELEGRAM_BOT_TOKEN"), chat_id, client=_async_telegram_http, logger=logger.info, **kwargs
+    )
+
+async def close_async_clients():
+    global _async_telegram_http
+    for client in _async_oura_clients.values():
+        await client.aclose()
+    _async_oura_clients.clear()
+    if _async_telegram_http is not None:
+        await _async_telegram_http.aclose()
+        _async_telegram_http = None
+
+# Outbox shared by all jobs, so reports that fail to send are retried rather than lost
+_delivery_queue: Optional[DeliveryQueue] = None
+_delivery_queue_lock = threading.Lock()
+
+def get_delivery_queue() -> DeliveryQueue:
+    """Return the process-wide delivery queue, creating it on first use."""
+    global _delivery_queue
+    with _delivery_queue_lock:
+        if _delivery_queue is None:
+            notifier = TelegramNotifier(os.getenv("TELEGRAM_BOT_TOKEN"), None, logger=logger.info)
+            _delivery_queue = DeliveryQueue(notifier, os.getenv("DELIVERY_QUEUE_PATH", "outbox.db"))
+        return _delivery_queue
+
+# One SummaryCache per cache file, shared by all jobs so none overwrites another's entries
+_summary_caches: Dict[str, SummaryCache] = {}
+_summary_caches_lock = threading.Lock()
+
+def get_summary_cache() -> SummaryCache:
+    """Return the process-wide summary cache for SUMMARY_CACHE_PATH, loading it on first use."""
+    path = os.getenv("SUMMARY_CACHE_PATH", "summary_cache.json")
+    with _summary_caches_lock:
+        cache = _summary_caches.get(path)
+        if cache is None:
+            cache = SummaryCache(path, max_entries=int(os.getenv("SUMMARY_CACHE_SIZE", "256")))
+            _summary_caches[path] = cache
+        return cache
+
+# Collections that feed the trend history
+TREND_COLLECTIONS = ("daily_sleep", "daily_readiness", "daily_stress", "daily_spo2", "sleep")
+
+def _trend_since(engine, sync: OuraSync, end_date: str) -> str:
+    """First day to sync for the trend history: 90 days back on first run, else the trailing window."""
+    end = date.fromisoformat(end_date)
+    if engine.last_day is None:
+        return (end - timedelta(days=90)).isoformat()
+    # Re-read the trailing window too, so late ring syncs are reflected
+    return (min(engine.last_day, end) - timedelta(days=sync.trailing_days)).isoformat()
+
+def _extend_trends(engine, data: Dict, path: str) -> Dict:
+    engine.update(extract_features(
+        data["daily_sleep"],
+        {},
+        data["daily_readiness"],
+        stress_data=data["daily_stress"],
+        spo2_data=data["daily_spo2"],
+        sleep_periods_data=data["sleep"]
+    ))
+    engine.save(path)
+    return engine.summary()
+
+def _trends_path(user: UserConfig) -> str:
+    return os.path.splitext(user.db_path)[0] + "_trends.npz"
+
+def update_trends(user: UserConfig, sync: OuraSync, end_date: str) -> Dict:
+    """Extend the user's saved trend history with newly synced days and summarise it."""
+    path = _trends_path(user)
+    engine = lazy_import("analytics").TrendEngine.load(path)
+    data = sync.sync(_trend_since(engine, sync, end_date), end_date, TREND_COLLECTIONS)
+    return _extend_trends(engine, data, path)
+
+async def update_trends_async(user: UserConfig, sync: AsyncOuraSync, end_date: str) -> Dict:
+    """Async counterpart of update_trends(); NumPy work runs on a worker thread."""
+    path = _trends_path(user)
+    engine = await asyncio.to_thread(lazy_import("analytics").TrendEngine.load, path)
+    data = await sync.sync(_trend_since(engine, sync, end_date), end_date, TREND_COLLECTIONS)
+    return await asyncio.to_thread(_extend_trends, engine, data, path)
+
+def _timeseries_store(user: UserConfig):
+    return lazy_import("timeseries").TimeSeriesStore(os.path.splitext(user.db_path)[0] + "_timeseries")
+
+def ingest_timeseries(user: UserConfig, oura: OuraClient, sleep_periods: Dict, start_date: str, end_date: str):
+    """Store heart rate and sleep HR/HRV samples in the user's columnar time series store."""
+    store = _timeseries_store(user)
+    try:
+        samples = store.ingest_sleep_samples(sleep_periods.get("data", []))
+        samples += store.ingest_heartrate(oura, start_date, end_date)
+        logger.info(f"Stored {samples} time series samples.")
+    except Exception as e:
+        # High-resolution data is not needed for the summary, so don't fail the job
+        logger.error(f"Time series ingestion failed: {e}")
+
+async def ingest_timeseries_async(user: UserConfig, oura: "AsyncOuraClient", sleep_periods: Dict, start_date: str, end_date: str):
+    """Async counterpart of ingest_timeseries()."""
+    store = _timeseries_store(user)
+    try:
+        samples = await asyncio.to_thread(store.ingest_sleep_samples, sleep_periods.get("data", []))
+        heartrate = [s async for s in oura.iter_heartrate(f"{start_date}T00:00:00+00:00", f"{end_date}T00:00:00+00:00")]
+        samples += await asyncio.to_thread(store.ingest_heartrate_samples, heartrate)
+        logger.info(f"Stored {samples} time series samples.")
+    except Exception as e:
+        logger.error(f"Time series ingestion failed: {e}")
+
+def _revision_parts(text: str):
+    return split_html(text.replace("<br>", "\n")) or [text]
+
+def send_revisions(telegram: TelegramNotifier, texts, on_failure) -> Optional[str]:
+    """
+    Send the first text, then edit each later version into the same message. Returns the last text.
 
-def job():
+    Only a version's first part (of at most 4096 characters) is edited in; the
+    rest of the last version follows as new messages, and whatever of it
+    can't be sent is passed to `on_failure`.
+    """
+    message_id = None
+    text = None
+    for text in texts:
+        first = _revision_parts(text)[0]
+        if message_id is not None and telegram.update_message(message_id, first):
+            continue
+        message_id = telegram.send_message(first)
+    if text is None:
+        return None
+    parts = _revision_parts(text)
+    if message_id is None:
+        on_failure(text)
+    elif len(parts) > 1:
+        telegram.send_message("\n".join(parts[1:]), on_failure=on_failure)
+    return text
+
+async def send_revisions_async(telegram, texts, on_failure) -> Optional[str]:
+    """Async counterpart of send_revisions()."""
+    message_id = None
+    text = None
+    async for text in texts:
+        first = _revision_parts(text)[0]
+        if message_id is not None and await telegram.update_message(message_id, first):
+            continue
+        message_id = await telegram.send_message(first)
+    if text is None:
+        return None
+    parts = _revision_parts(text)
+    if message_id is None:
+        on_failure(text)
+    elif len(parts) > 1:
+        await telegram.send_message("\n".join(parts[1:]), on_failure=on_failure)
+    return text
+
+@contextmanager
+def stage(name: str):
+    """Time one stage of a job in the job_stage_seconds metric and log its duration."""
+    with metrics.span("job_stage", stage=name) as span:
+        yield span
+    logger.info(f"Stage '{name}' took {span.seconds:.2f}s")
+
+def job(user: Optional[UserConfig] = None):
     """Daily job to fetch data and send summary."""
-    logger.info("Starting daily summary job...")
+    user = user or default_user()
+    logger.info(f"Starting daily summary job for {user.name}...")
+    started = time.perf_counter()
     
     # Load credentials
     oura_client_id = os.getenv("OURA_CLIENT_ID")
     oura_client_secret = os.getenv("OURA_CLIENT_SECRET")
     openai_key = os.getenv("OPENAI_API_KEY")
     telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    chat_id = user.chat_id
 
     if not all([oura_client_id, oura_client_secret, openai_key, telegram_token, chat_id]):
         logger.error("Missing configuration. Please check .env file.")
@@ -37,12 +320,12 @@ def job():
 
     try:
         # Initialize clients
-        oura = OuraClient(client_id=oura_client_id, client_secret=oura_client_secret)
-        ai = AISummarizer(openai_key)
+        oura = get_oura_client(user)
+        store = get_oura_store(user)
         telegram = TelegramNotifier(telegram_token, chat_id, verbose=True, logger=logger.info)
 
         # Get dates (Yesterday's data is usually the most complete for morning summary)
-        today = datetime.now().date()
+        today = user_today(user)
         yesterday = today - timedelta(days=1)
         
         start_date = yesterday.isoformat()
@@ -50,77 +333,632 @@ def job():
         
         logger.info(f"Fetching data from {start_date} to {end_date}...")
 
-        # Fetch data
-        sleep = oura.get_daily_sleep(start_date, end_date)
-        activity = oura.get_daily_activity(start_date, end_date)
-        readiness = oura.get_daily_readiness(start_date, end_date)
-        stress = oura.get_daily_stress(start_date, end_date)
-        spo2 = oura.get_daily_spo2(start_date, end_date)
-        workouts = oura.get_workouts(start_date, end_date)
+        # Sync days not yet stored locally, then read from the store
+        sync = OuraSync(oura, store, today=today)
+        with stage("sync"):
+            data = sync.sync(start_date, end_date)
+        sleep = data["daily_sleep"]
+        activity = data["daily_activity"]
+        readiness = data["daily_readiness"]
+        stress = data["daily_stress"]
+        spo2 = data["daily_spo2"]
+        workouts = data["workout"]
+        sleep_periods = data["sleep"]
         
         # validate we have data
         if not sleep.get('data') and not activity.get('data') and not readiness.get('data'):
              msg = f"No Oura data found for {yesterday}. Sync your ring!"
              logger.warning(msg)
              telegram.send_message(msg)
+             metrics.inc("jobs_total", kind="daily", status="no_data")
              return
 
-        # Generate Summary
+        with stage("trends"):
+            trends = update_trends(user, sync, end_date)
+
+        # Generate the summary and stream it into a Telegram message as it arrives
         logger.info("Generating AI summary...")
-        summary = ai.generate_health_summary(
-            sleep, 
-            activity, 
-            readiness,
+        ai = AISummarizer(openai_key, cache=get_summary_cache())
+        summary_data = dict(
             stress_data=stress,
             spo2_data=spo2,
-            workout_data=workouts
+            workout_data=workouts,
+            sleep_periods_data=sleep_periods,
+            trends=trends
         )
-        
-        # Send to Telegram
-        logger.info("Sending to Telegram...")
-        telegram.send_message(summary)
-        logger.info("Daily summary sent successfully.")
+        with stage("summary"):
+            on_failure = partial(get_delivery_queue().enqueue, chat_id)
+            if latency_budget:
+                # Stats within the budget, AI insights edited in when they arrive
+                versions = ai.hedged_health_summary(latency_budget, sleep, activity, readiness, **summary_data)
+                send_revisions(telegram, versions, on_failure)
+            else:
+                chunks = ai.stream_health_summary(sleep, activity, readiness, **summary_data)
+                telegram.stream_message(chunks, on_failure=on_failure)
+        last_summary_dates[user.name] = today
+        metrics.inc("jobs_total", kind="daily", status="sent")
+        logger.info(f"Daily summary sent successfully to {user.name} in {time.perf_counter() - started:.2f}s.")
+
+        # The summary doesn't use the high-resolution samples, so store them once it is out
+        with stage("timeseries"):
+            ingest_timeseries(user, oura, sleep_periods, start_date, end_date)
 
     except Exception as e:
+        metrics.inc("jobs_total", kind="daily", status="failed")
         logger.error(f"Job failed: {e}", exc_info=True)
 
+async def job_async(user: Optional[UserConfig] = None):
+    """Async counterpart of job(): every request is a coroutine on the shared event loop."""
+    user = user or default_user()
+    logger.info(f"Starting daily summary job for {user.name}...")
+    started = time.perf_counter()
+
+    openai_key = os.getenv("OPENAI_API_KEY")
+    chat_id = user.chat_id
+    if not all([os.getenv("OURA_CLIENT_ID"), os.getenv("OURA_CLIENT_SECRET"), openai_key,
+                os.getenv("TELEGRAM_BOT_TOKEN"), chat_id]):
+        logger.error("Missing configuration. Please check .env file.")
+        return
+
+    try:
+        oura = get_async_oura_client(user)
+        store = await asyncio.to_thread(get_oura_store, user)
+        telegram = get_async_telegram(chat_id, verbose=True)
+
+        today = user_today(user)
+        yesterday = today - timedelta(days=1)
+        start_date = yesterday.isoformat()
+        end_date = today.isoformat()
+
+        logger.info(f"Fetching data from {start_date} to {end_date}...")
+
+        sync = AsyncOuraSync(oura, store, today=today)
+        with stage("sync"):
+            data = await sync.sync(start_date, end_date)
+
+        if not data["daily_sleep"].get('data') and not data["daily_activity"].get('data') and not data["daily_readiness"].get('data'):
+            msg = f"No Oura data found for {yesterday}. Sync your ring!"
+            logger.warning(msg)
+            await telegram.send_message(msg)
+            metrics.inc("jobs_total", kind="daily", status="no_data")
+            return
+
+        with stage("trends"):
+            trends = await update_trends_async(user, sync, end_date)
+
+        logger.info("Generating AI summary...")
+        ai = AISummarizer(openai_key, cache=get_summary_cache())
+        daily = (data["daily_sleep"], data["daily_activity"], data["daily_readiness"])
+        summary_data = dict(
+            stress_data=data["daily_stress"],
+            spo2_data=data["daily_spo2"],
+            workout_data=data["workout"],
+            sleep_periods_data=data["sleep"],
+            trends=trends
+        )
+        with stage("summary"):
+            on_failure = partial(get_delivery_queue().enqueue, chat_id)
+            if latency_budget:
+                versions = ai.hedged_health_summary_async(latency_budget, *daily, **summary_data)
+                await send_revisions_async(telegram, versions, on_failure)
+            else:
+                chunks = ai.stream_health_summary_async(*daily, **summary_data)
+                await telegram.stream_message(chunks, on_failure=on_failure)
+        last_summary_dates[user.name] = today
+        metrics.inc("jobs_total", kind="daily", status="sent")
+        logger.info(f"Daily summary sent successfully to {user.name} in {time.perf_counter() - started:.2f}s.")
+
+        with stage("timeseries"):
+            await ingest_timeseries_async(user, oura, data["sleep"], start_date, end_date)
+
+    except Exception as e:
+        metrics.inc("jobs_total", kind="daily", status="failed")
+        logger.error(f"Job failed: {e}", exc_info=True)
+
+def batch_summaries_job(users, timeout: float = 3600.0):
+    """
+    Generate every user's daily summary ahead of delivery with one OpenAI batch.
+
+    The summaries land in the summary cache, so the daily jobs that run later
+    find them there and only have to send them. Users whose data changes in
+    between simply get a fresh summary at delivery time.
+    """
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
+        logger.error("Missing configuration. Please check .env file.")
+        return
+    logger.info(f"Preparing batch summaries for {len(users)} user(s)...")
+
+    cache = get_summary_cache()
+    # Room for every user's summary, or the batch would evict its own results before delivery
+    cache.reserve(2 * len(users))
+    batch = BatchSummarizer(
+        AISummarizer(openai_key, cache=cache), poll_interval=min(30.0, timeout / 20), timeout=timeout
+    )
+
+    def prepare(user: UserConfig):
+        today = user_today(user)
+        start_date = (today - timedelta(days=1)).isoformat()
+        end_date = today.isoformat()
+        try:
+            sync = OuraSync(get_oura_client(user), get_oura_store(user), today=today)
+            data = sync.sync(start_date, end_date)
+            if not data["daily_sleep"].get('data') and not data["daily_activity"].get('data') and not data["daily_readiness"].get('data'):
+                return None
+            return data, update_trends(user, sync, end_date)
+        except Exception as e:
+            logger.error(f"Preparing {user.name}'s summary failed: {e}")
+            return None
+
+    with stage("batch_prepare"):
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="batch") as executor:
+            for user, prepared in zip(users, executor.map(prepare, users)):
+                if prepared is None:
+                    continue
+                data, trends = prepared
+                batch.add(
+                    user.name,
+                    data["daily_sleep"],
+                    data["daily_activity"],
+                    data["daily_readiness"],
+                    stress_data=data["daily_stress"],
+                    spo2_data=data["daily_spo2"],
+                    workout_data=data["workout"],
+                    sleep_periods_data=data["sleep"],
+                    trends=trends
+                )
+    if not len(batch):
+        logger.info("No summaries to generate in batch.")
+        return
+    with stage("batch_summaries"):
+        batch.run()
+
+def digest_job(user: Optional[UserConfig] = None, label: str = "weekly", days: int = 7):
+    """Send a digest covering the last `days` days."""
+    user = user or default_user()
+    logger.info(f"Starting {label} digest for {user.name}...")
+
+    openai_key = os.getenv("OPENAI_API_KEY")
+    telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
+    if not all([openai_key, telegram_token, user.chat_id]):
+        logger.error("Missing configuration. Please check .env file.")
+        return
+
+    try:
+        oura = get_oura_client(user)
+        today = user_today(user)
+        sync = OuraSync(oura, get_oura_store(user), today=today)
+        ai = AISummarizer(openai_key, cache=get_summary_cache())
+
+        start_date = (today - timedelta(days=days)).isoformat()
+        data = sync.sync(start_date, today.isoformat())
+        features = extract_features(
+            data["daily_sleep"],
+            data["daily_activity"],
+            data["daily_readiness"],
+            stress_data=data["daily_stress"],
+            spo2_data=data["daily_spo2"],
+            workout_data=data["workout"],
+            sleep_periods_data=data["sleep"]
+        )
+
+        with stage("digest"):
+            queue = get_delivery_queue()
+            queue.enqueue(user.chat_id, DigestSummarizer(ai).generate_digest(features, label))
+            queue.flush()
+        metrics.inc("jobs_total", kind=label, status="sent")
+        logger.info(f"{label.capitalize()} digest sent to {user.name}.")
+    except Exception as e:
+        metrics.inc("jobs_total", kind=label, status="failed")
+        logger.error(f"Digest failed: {e}", exc_info=True)
+
+def monthly_digest_job(user: Optional[UserConfig] = None):
+    """Runs daily; sends last month's digest on the 1st."""
+    user = user or default_user()
+    today = user_today(user)
+    if today.day != 1:
+        return
+    days_in_last_month = (today - (today - timedelta(days=1)).replace(day=1)).days
+    digest_job(user, "monthly", days_in_last_month)
+
+def scheduled_job(user: Optional[UserConfig] = None):
+    """Scheduled fallback in webhook mode: only runs if no summary went out today."""
+    user = user or default_user()
+    if last_summary_dates.get(user.name) == user_today(user):
+        logger.info("Summary already sent today via webhook, skipping scheduled run.")
+        return
+    job(user)
+
+def prepare_report(user: Optional[UserConfig] = None):
+    """
+    Generate and store yesterday's report ahead of delivery, once its data is complete.
+
+    Runs repeatedly until the report is sent. The synced data is fingerprinted
+    first, and while it matches the stored report nothing else (trends, time
+    series, summary) is recomputed.
+    """
+    user = user or default_user()
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not all([os.getenv("OURA_CLIENT_ID"), os.getenv("OURA_CLIENT_SECRET"), openai_key]):
+        logger.error("Missing configuration. Please check .env file.")
+        return
+
+    today = user_today(user)
+    if last_summary_dates.get(user.name) == today:
+        return
+    yesterday = today - timedelta(days=1)
+    start_date = yesterday.isoformat()
+    end_date = today.isoformat()
+
+    try:
+        oura = get_oura_client(user)
+        store = get_oura_store(user)
+        report = store.get_report(start_date)
+        if report is not None and report["sent_at"]:
+            return
+
+        sync = OuraSync(oura, store, today=today)
+        with stage("sync"):
+            data = sync.sync(start_date, end_date)
+        if not all(data[collection].get('data') for collection in SUMMARY_TRIGGERS):
+            logger.info(f"Data for {start_date} not complete yet for {user.name}; will retry.")
+            return
+
+        ai = AISummarizer(openai_key, cache=get_summary_cache())
+        daily = (data["daily_sleep"], data["daily_activity"], data["daily_readiness"])
+        summary_data = {
+            "stress_data": data["daily_stress"],
+            "spo2_data": data["daily_spo2"],
+            "workout_data": data["workout"],
+            "sleep_periods_data": data["sleep"],
+        }
+        fingerprint = ai.data_fingerprint(*daily, **summary_data)
+        if report is not None and report["fingerprint"] == fingerprint:
+            metrics.inc("reports_total", status="unchanged")
+            return
+
+        with stage("trends"):
+            trends = update_trends(user, sync, end_date)
+
+        cache_key, text, messages = ai.summary_request(*daily, trends=trends, **summary_data)
+        if text is None:
+            with stage("summary"):
+                text = ai.complete(messages)
+            ai.cache.set(cache_key, text)
+        store.save_report(start_date, fingerprint, text)
+        metrics.inc("reports_total", status="updated" if report is not None else "created")
+        logger.info(f"Report for {start_date} {'updated' if report is not None else 'ready'} for {user.name}.")
+
+        # Only needed for later analysis, so it never delays the report
+        with stage("timeseries"):
+            ingest_timeseries(user, oura, data["sleep"], start_date, end_date)
+
+    except Exception as e:
+        metrics.inc("reports_total", status="failed")
+        logger.error(f"Preparing report failed: {e}", exc_info=True)
+
+def deliver_report(user: Optional[UserConfig] = None):
+    """Send the report prepare_report() stored, or run the full job if there is none."""
+    user = user or default_user()
+    today = user_today(user)
+    if last_summary_dates.get(user.name) == today:
+        logger.info(f"Summary already sent to {user.name} today, skipping scheduled run.")
+        return
+    day = (today - timedelta(days=1)).isoformat()
+
+    store = get_oura_store(user)
+    report = store.get_report(day)
+    if report is None:
+        logger.info(f"No pre-computed report for {user.name}; generating it now.")
+        job(user)
+        return
+    if report["sent_at"]:
+        return
+
+    telegram = TelegramNotifier(os.getenv("TELEGRAM_BOT_TOKEN"), user.chat_id, logger=logger.info)
+    with stage("deliver"):
+        telegram.send_message(report["text"], on_failure=partial(get_delivery_queue().enqueue, user.chat_id))
+    store.mark_report_sent(day)
+    last_summary_dates[user.name] = today
+    metrics.inc("jobs_total", kind="daily", status="sent")
+    logger.info(f"Pre-computed report delivered to {user.name} ({time.time() - report['created_at']:.0f}s old).")
+
+def ingest_events(events):
+    """Re-sync the collections named in webhook events into the local store."""
+    collections = {e.get("data_type") for e in events} & set(OuraClient.DAILY_COLLECTIONS)
+    if not collections:
+        return
+
+    user = default_user()
+    oura = get_oura_client(user)
+    store = get_oura_store(user)
+    today = user_today(user)
+    sync = OuraSync(oura, store, today=today)
+
+    start_date = (today - timedelta(days=sync.trailing_days)).isoformat()
+    end_date = (today + timedelta(days=1)).isoformat()
+    for collection in collections:
+        store.forget_synced(collection, start_date, end_date)
+    sync.sync(start_date, end_date, collections)
+
+def handle_webhook_events(events, precompute: bool = False):
+    """
+    Ingest new data and send the summary as soon as core data has arrived
+    (or, with `precompute`, only prepare the report for its delivery time).
+    """
+    logger.info(f"Received {len(events)} webhook event(s).")
+    ingest_events(events)
+
+    data_types = {e.get("data_type") for e in events}
+    if data_types & SUMMARY_TRIGGERS and last_summary_dates.get("default") != user_today(default_user()):
+        if precompute:
+            prepare_report()
+        else:
+            job()
+
+def start_webhook_receiver(port: int, precompute: bool = False):
+    """Subscribe to Oura webhooks and start the HTTP receiver."""
+    callback_url = os.getenv("OURA_WEBHOOK_URL")
+    verification_token = os.getenv("OURA_WEBHOOK_TOKEN")
+    if not callback_url or not verification_token or not os.getenv("OURA_CLIENT_SECRET"):
+        logger.error("OURA_WEBHOOK_URL, OURA_WEBHOOK_TOKEN and OURA_CLIENT_SECRET are required for webhook mode.")
+        return None
+
+    receiver = WebhookReceiver(
+        verification_token,
+        os.getenv("OURA_CLIENT_SECRET"),
+        partial(handle_webhook_events, precompute=precompute),
+        port=port,
+        logger=logger.error
+    )
+    receiver.start()
+    logger.info(f"Webhook receiver listening on port {receiver.port}.")
+
+    # Subscriptions are verified against the receiver, so it must be up first
+    oura = OuraClient(client_id=os.getenv("OURA_CLIENT_ID"), client_secret=os.getenv("OURA_CLIENT_SECRET"))
+    oura.ensure_webhook_subscriptions(callback_url, verification_token)
+    return receiver
+
+def submit_job(executor: ThreadPoolExecutor, fn):
+    """Hand a job (a zero-argument callable) to the worker pool, logging any exception it raises."""
+    def log_failure(future):
+        if future.exception():
+            logger.error(f"Background job failed: {future.exception()}")
+
+    future = executor.submit(fn)
+    future.add_done_callback(log_failure)
+    return future
+
+def schedule_jobs(users, args, submit, daily) -> Scheduler:
+    """
+    Schedule each user's daily job (and digests) in their own timezone, handing runs to `submit`.
+
+    Users who share a delivery time are spread evenly across the next
+    `--spread` minutes, and every run is delayed by up to `--jitter` seconds,
+    so a large fleet doesn't hit Oura, OpenAI and Telegram all at once.
+    """
+    scheduler = Scheduler(submit, jitter=args.jitter)
+    if args.precompute:
+        # Reports are generated ahead of time; at the daily time they are only sent
+        daily = deliver_report
+        for user in users:
+            submit(partial(prepare_report, user))
+            scheduler.every(args.precompute_interval * 60, partial(prepare_report, user), name=f"prepare:{user.name}")
+        logger.info(f"Preparing reports every {args.precompute_interval} minutes until delivery.")
+
+    slots: Dict[tuple, list] = {}
+    for user in users:
+        slots.setdefault((user.time, str(user_timezone(user))), []).append(user)
+
+    for (at, zone), slot_users in slots.items():
+        if args.batch:
+            # Each delivery slot gets its batch `--batch-lead` minutes ahead, in the slot's own timezone
+            lead = args.batch_lead * 60
+            scheduler.daily(
+                at, partial(batch_summaries_job, slot_users, min(args.batch_timeout, lead)),
+                tz=partial(user_timezone, slot_users[0]), offset=-lead, name=f"batch:{at}:{zone}",
+            )
+            logger.info(f"Scheduled batch summaries for {len(slot_users)} user(s) {args.batch_lead} minutes before {at} ({zone}).")
+        for i, user in enumerate(slot_users):
+            # Looked up at every run, so DST changes and newly synced data are picked up
+            tz = partial(user_timezone, user)
+            offset = args.spread * 60 * i / len(slot_users)
+            first = scheduler.daily(at, partial(daily, user), tz=tz, offset=offset, name=f"daily:{user.name}")
+            logger.info(
+                f"Scheduled {user.name} at {at} daily ({user_timezone(user) or 'local time'}), "
+                f"next run {datetime.fromtimestamp(first).astimezone():%Y-%m-%d %H:%M:%S %Z}."
+            )
+            if args.weekly_digest:
+                scheduler.daily(args.digest_time, partial(digest_job, user, "weekly", 7), tz=tz, offset=offset,
+                                weekday=args.weekly_digest, name=f"weekly:{user.name}")
+            if args.monthly_digest:
+                scheduler.daily(args.digest_time, partial(monthly_digest_job, user), tz=tz, offset=offset,
+                                name=f"monthly:{user.name}")
+    return scheduler
+
+def log_startup_profile():
+    """Log how long each (eager or deferred) import took and the total since the bot module loaded."""
+    timings = startup.report()
+    for name, seconds in timings.items():
+        logger.info(f"Startup: import {name} took {seconds * 1000:.0f}ms")
+    logger.info(
+        f"Startup: {sum(timings.values()) * 1000:.0f}ms in imports, "
+        f"{(time.perf_counter() - _IMPORTS_STARTED) * 1000:.0f}ms total since start"
+    )
+
+async def main_async(args, users):
+    """
+    Event-loop version of main(): jobs run as tasks rather than on a thread pool.
+
+    Concurrency is bounded only by the upstream limits, so thousands of users'
+    fetch/summarise/send pipelines can overlap on a single thread.
+    """
+    tasks = set()
+
+    def spawn(fn):
+        """Run a job as a task; synchronous jobs (digests) go to a worker thread."""
+        coro = fn() if asyncio.iscoroutinefunction(fn) else asyncio.to_thread(fn)
+        task = asyncio.get_running_loop().create_task(coro)
+        tasks.add(task)
+
+        def log_failure(task):
+            tasks.discard(task)
+            if not task.cancelled() and task.exception():
+                logger.error(f"Background job failed: {task.exception()}")
+
+        task.add_done_callback(log_failure)
+        return task
+
+    stop = threading.Event()
+    try:
+        if args.run_now:
+            if args.batch:
+                await asyncio.to_thread(batch_summaries_job, users, args.batch_timeout)
+            await asyncio.gather(*(job_async(user) for user in users))
+            # Retry anything left over from this or an earlier run
+            if os.path.exists(os.getenv("DELIVERY_QUEUE_PATH", "outbox.db")):
+                await asyncio.to_thread(get_delivery_queue().flush)
+            close_oura_stores()
+            return
+
+        logger.info(f"Oura Bot started for {len(users)} user(s) (async).")
+        scheduler = schedule_jobs(users, args, spawn, job_async)
+        spawn(scheduler.run_async)
+        threading.Thread(target=get_delivery_queue().run, args=(stop,), daemon=True, name="delivery").start()
+
+        users_by_chat = {user.chat_id: user for user in users}
+        notifier = get_async_telegram(users[0].chat_id)
+
+        logger.info("Listening for 'run' command...")
+        while True:
+            try:
+                updates = await notifier.get_chat_updates(timeout=args.poll_timeout, chat_ids=users_by_chat)
+                for chat_id, text in updates:
+                    if text.strip().lower() == "run":
+                        user = users_by_chat[chat_id]
+                        logger.info(f"Received 'run' command from {user.name}! Generating summary...")
+                        await notifier.send_message("Processing manual run request...", chat_id=chat_id)
+                        spawn(partial(job_async, user))
+            except Exception as e:
+                logger.error(f"Error checking updates: {e}")
+                await asyncio.sleep(2)
+    finally:
+        stop.set()
+        for task in list(tasks):
+            task.cancel()
+        await close_async_clients()
+
 def main():
     load_dotenv()
     
     parser = argparse.ArgumentParser(description="Oura Health Telegram Bot")
     parser.add_argument("--run-now", action="store_true", help="Run the summary job immediately")
-    parser.add_argument("--time", type=str, default="08:00", help="Time to run daily job (HH:MM)")
+    parser.add_argument("--time", type=str, default="08:00", help="Time to run daily job (HH:MM, in TIMEZONE if set)")
+    parser.add_argument("--jitter", type=float, default=0, help="Delay each scheduled run by a random 0..N seconds")
+    parser.add_argument("--spread", type=float, default=0, help="Spread users who share a delivery time over N minutes")
+    parser.add_argument("--webhook", action="store_true", help="Send the summary as soon as Oura pushes new data")
+    parser.add_argument("--webhook-port", type=int, default=8080, help="Port for the webhook receiver")
+    parser.add_argument("--poll-timeout", type=int, default=30, help="Telegram long-polling timeout in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="Max summary jobs running at once")
+    parser.add_argument("--users", type=str, help="JSON file of users to serve (multi-user mode)")
+    parser.add_argument("--weekly-digest", type=str, metavar="WEEKDAY", help="Send a weekly digest on this day (e.g. monday)")
+    parser.add_argument("--monthly-digest", action="store_true", help="Send a monthly digest on the 1st of each month")
+    parser.add_argument("--digest-time", type=str, default="09:00", help="Time to send digests (HH:MM)")
+    parser.add_argument("--batch", action="store_true", help="Generate all summaries ahead of delivery with the OpenAI Batch API")
+    parser.add_argument("--batch-lead", type=float, default=120, help="Minutes before each delivery time to submit its batch")
+    parser.add_argument("--batch-timeout", type=float, default=3600, help="Seconds to wait for the batch before sending the rest individually (at most --batch-lead)")
+    parser.add_argument("--precompute", action="store_true", help="Prepare reports as soon as the data is complete and only send them at the daily time")
+    parser.add_argument("--precompute-interval", type=int, default=15, help="Minutes between checks for new data with --precompute")
+    parser.add_argument("--latency-budget", type=float, metavar="SECONDS", help="Send locally rendered stats if the AI summary takes longer than this, then edit the summary in")
+    parser.add_argument("--oura-concurrency", type=int, default=16, help="Max concurrent Oura requests")
+    parser.add_argument("--openai-concurrency", type=int, default=8, help="Max concurrent OpenAI requests")
+    parser.add_argument("--telegram-concurrency", type=int, default=16, help="Max concurrent Telegram requests")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port (/metrics)")
+    parser.add_argument("--metrics-file", type=str, help="Append timing spans as JSON lines to this file")
+    parser.add_argument("--profile-startup", action="store_true", help="Log import times on exit")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run jobs as asyncio tasks on one event loop")
     args = parser.parse_args()
 
+    global latency_budget
+    latency_budget = args.latency_budget
+    if args.profile_startup:
+        atexit.register(log_startup_profile)
+
+    metrics.configure(jsonl_path=args.metrics_file)
+    if args.metrics_port:
+        metrics.start_server(args.metrics_port)
+        logger.info(f"Serving metrics on port {args.metrics_port} at /metrics")
+
+    upstream_limits.configure(
+        oura=args.oura_concurrency,
+        openai=args.openai_concurrency,
+        telegram=args.telegram_concurrency
+    )
+
+    if args.users:
+        users = load_users(args.users)
+    else:
+        user = default_user()
+        user.time = args.time
+        users = [user]
+
+    if args.use_async:
+        if args.webhook:
+            logger.error("--webhook is not supported with --async.")
+            return
+        asyncio.run(main_async(args, users))
+        return
+
     if args.run_now:
-        job()
+        if args.batch:
+            batch_summaries_job(users, args.batch_timeout)
+        if len(users) == 1:
+            job(users[0])
+        else:
+            with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="job") as executor:
+                for user in users:
+                    submit_job(executor, partial(job, user))
+        # Retry anything left over from this or an earlier run
+        if os.path.exists(os.getenv("DELIVERY_QUEUE_PATH", "outbox.db")):
+            get_delivery_queue().flush()
+        close_oura_stores()
         return
 
-    logger.info(f"Oura Bot started. Scheduled to run at {args.time} daily.")
-    schedule.every().day.at(args.time).do(job)
+    logger.info(f"Oura Bot started for {len(users)} user(s).")
+    executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="job")
+    # Webhook mode serves the .env user only
+    webhook = not args.users and args.webhook and start_webhook_receiver(args.webhook_port, args.precompute)
+    # With webhooks the fixed-time run becomes a fallback for days without events
+    scheduler = schedule_jobs(users, args, partial(submit_job, executor), scheduled_job if webhook else job)
 
-    # Initialize notifier for polling commands
+    stop = threading.Event()
+    threading.Thread(target=scheduler.run, args=(stop,), daemon=True, name="scheduler").start()
+    threading.Thread(target=get_delivery_queue().run, args=(stop,), daemon=True, name="delivery").start()
+
+    # Initialize notifier for polling commands from any registered chat
     telegram_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
-    notifier = TelegramNotifier(telegram_token, chat_id, verbose=False, logger=logger.info)
+    users_by_chat = {user.chat_id: user for user in users}
+    notifier = TelegramNotifier(telegram_token, users[0].chat_id, verbose=False, logger=logger.info)
 
     logger.info("Listening for 'run' command...")
 
-    while True:
-        schedule.run_pending()
-        
-        # Check for commands
-        try:
-            updates = notifier.get_updates()
-            for text in updates:
-                if text.strip().lower() == "run":
-                    logger.info("Received 'run' command! Generating summary...")
-                    notifier.send_message("Processing manual run request...")
-                    job()
-        except Exception as e:
-             logger.error(f"Error checking updates: {e}")
-
-        time.sleep(2)
+    try:
+        while True:
+            # Long poll: returns as soon as a message arrives, or after the timeout
+            try:
+                updates = notifier.get_chat_updates(timeout=args.poll_timeout, chat_ids=users_by_chat)
+                for chat_id, text in updates:
+                    if text.strip().lower() == "run":
+                        user = users_by_chat[chat_id]
+                        logger.info(f"Received 'run' command from {user.name}! Generating summary...")
+                        notifier.send_message("Processing manual run request...", chat_id=chat_id)
+                        submit_job(executor, partial(job, user))
+            except Exception as e:
+                logger.error(f"Error checking updates: {e}")
+                time.sleep(2)
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,195 @@
+"""Persistent outbound queue for Telegram messages."""
+
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Set
+
+import requests
+
+from utils import metrics
+from utils.html_utils import split_html
+from utils.http_transport import TokenBucket, backoff_delay, retry_after_seconds
+from utils.telegram_notifier import TelegramNotifier
+
+logger = logging.getLogger("OuraBot.Delivery")
+
+
+class DeliveryQueue:
+    """
+    Outbox of Telegram messages stored in SQLite until they are delivered.
+
+    Messages are split to Telegram's length limit when enqueued and sent
+    in order per chat. Different chats are sent concurrently, each within
+    Telegram's per-chat limit (about one message per second); the global
+    30 messages/second limit is enforced by TelegramNotifier. A chat with
+    several parts holds its worker while it waits on its own limit, hence
+    the fairly large pool. Failed sends
+    are retried after Telegram's retry_after (or with backoff), so a crash
+    or an outage doesn't lose a report: pending messages are sent on the
+    next flush(), including after a restart.
+    """
+
+    def __init__(
+        self,
+        notifier: TelegramNotifier,
+        path: str = "outbox.db",
+        workers: int = 32,
+        per_chat_rate: float = 1.0,
+        max_attempts: int = 8,
+    ):
+        self.notifier = notifier
+        self.workers = workers
+        self.per_chat_rate = per_chat_rate
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._chat_limiters: Dict[str, TokenBucket] = {}
+        self._busy_chats: Set[str] = set()
+        self._wakeup = threading.Event()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    chat_id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    not_before REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_chat ON outbox (chat_id, id)")
+            self._conn.commit()
+
+    def enqueue(self, chat_id: str, text: str) -> int:
+        """Persist a message for `chat_id`; returns the number of parts queued."""
+        return self.enqueue_many([chat_id], text)
+
+    def enqueue_many(self, chat_ids: Iterable[str], text: str) -> int:
+        """Persist the same message for every chat in `chat_ids`."""
+        parts = split_html(text.replace("<br>", "\n"))
+        now = time.time()
+        rows = [(str(chat_id), part, now) for chat_id in chat_ids for part in parts]
+        with self._lock:
+            self._conn.executemany("INSERT INTO outbox (chat_id, text, created_at) VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+        self._wakeup.set()
+        return len(rows)
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def flush(self) -> int:
+        """
+        Send everything that is due, chats in parallel; returns messages delivered.
+
+        Chats already being flushed by another thread are skipped.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT chat_id FROM outbox WHERE not_before <= ?", (time.time(),)
+            ).fetchall()
+            chats = [chat_id for (chat_id,) in rows if chat_id not in self._busy_chats]
+            self._busy_chats.update(chats)
+
+        if not chats:
+            return 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="delivery") as executor:
+                return sum(executor.map(self._flush_chat, chats))
+        finally:
+            with self._lock:
+                self._busy_chats.difference_update(chats)
+
+    def _limiter(self, chat_id: str) -> TokenBucket:
+        with self._lock:
+            limiter = self._chat_limiters.get(chat_id)
+            if limiter is None:
+                limiter = TokenBucket(rate=self.per_chat_rate, capacity=1)
+                self._chat_limiters[chat_id] = limiter
+            return limiter
+
+    def _flush_chat(self, chat_id: str) -> int:
+        """Send one chat's messages in order, stopping at the first that must wait."""
+        sent = 0
+        while True:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT id, text, attempts, not_before FROM outbox WHERE chat_id = ? ORDER BY id LIMIT 1",
+                    (chat_id,)
+                ).fetchone()
+            if row is None:
+                return sent
+            message_id, text, attempts, not_before = row
+            if not_before > time.time():
+                return sent
+
+            self._limiter(chat_id).acquire()
+            try:
+                response = self.notifier.deliver(text, chat_id)
+            except requests.RequestException as e:
+                self._retry_later(message_id, attempts, None, f"network error: {e}")
+                return sent
+
+            if response.ok:
+                self._delete(message_id)
+                metrics.inc("delivery_messages_total", status="sent")
+                sent += 1
+            elif response.status_code == 429 or response.status_code >= 500:
+                self._retry_later(message_id, attempts, retry_after_seconds(response), f"HTTP {response.status_code}")
+                return sent
+            else:
+                # 400/403 (bad HTML, bot blocked, chat gone) won't succeed on retry
+                logger.error(f"Dropping message {message_id} to {chat_id}: {response.status_code} {response.text}")
+                self._delete(message_id)
+                metrics.inc("delivery_messages_total", status="dropped")
+
+    def _retry_later(self, message_id: int, attempts: int, delay: Optional[float], reason: str):
+        attempts += 1
+        if attempts >= self.max_attempts:
+            logger.error(f"Giving up on message {message_id} after {attempts} attempts ({reason}).")
+            self._delete(message_id)
+            metrics.inc("delivery_messages_total", status="dropped")
+            return
+        delay = delay if delay is not None else backoff_delay(attempts, base=2.0, cap=300.0)
+        logger.warning(f"Delivery of message {message_id} failed ({reason}); retrying in {delay:.0f}s.")
+        metrics.inc("delivery_retries_total")
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = ?, not_before = ? WHERE id = ?",
+                (attempts, time.time() + delay, message_id)
+            )
+            self._conn.commit()
+
+    def _delete(self, message_id: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+            self._conn.commit()
+
+    def _next_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(not_before) FROM outbox").fetchone()
+        return row[0]
+
+    def run(self, stop: threading.Event, max_wait: float = 30.0):
+        """Deliver in the background until `stop` is set, waking on enqueue or when a retry is due."""
+        while not stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Delivery flush failed: {e}")
+            next_due = self._next_due()
+            wait = max_wait if next_due is None else min(max_wait, max(0.5, next_due - time.time()))
+            self._wakeup.wait(wait)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
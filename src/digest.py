@@ -0,0 +1,145 @@
+"""Weekly / monthly digests via map-reduce summarisation."""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from ai_summarizer import AISummarizer
+from features import DailyFeatures
+from stats_report import UNAVAILABLE_NOTE, render_stats
+from summary_cache import SummaryCache
+from utils import metrics
+
+logger = logging.getLogger("OuraBot.Digest")
+
+# Fields averaged per period in the map stage; workouts are summed
+_AVERAGED = (
+    "sleep_score", "readiness_score", "activity_score", "total_sleep_h", "hrv_ms",
+    "rhr_bpm", "steps", "stress_high_min", "recovery_high_min", "spo2_avg",
+)
+
+
+def aggregate(features: List[DailyFeatures]) -> Dict[str, Any]:
+    """Per-period numbers: averages of daily metrics and workout totals."""
+    result: Dict[str, Any] = {"from": features[0].day, "to": features[-1].day, "days": len(features)}
+    for field in _AVERAGED:
+        values = [getattr(f, field) for f in features if getattr(f, field) is not None]
+        if values:
+            result[f"avg_{field}"] = round(sum(values) / len(values), 1)
+    workouts = sum(f.workout_count for f in features)
+    if workouts:
+        result["workouts"] = workouts
+        result["workout_min"] = sum(f.workout_min for f in features)
+    return result
+
+
+def aggregate_stats(features: List[DailyFeatures], label: str = "weekly") -> Dict[str, Any]:
+    """aggregate() in the shape of a compact day, for render_stats()."""
+    numbers = aggregate(features)
+    stats: Dict[str, Any] = {"day": f"{label} averages, {numbers['from']} – {numbers['to']}"}
+    for field in _AVERAGED:
+        if f"avg_{field}" in numbers:
+            stats[field] = numbers[f"avg_{field}"]
+    if "steps" in stats:
+        stats["steps"] = round(stats["steps"])
+    if numbers.get("workouts"):
+        stats["workout_count"] = numbers["workouts"]
+        stats["workout_min"] = numbers["workout_min"]
+    return stats
+
+
+class DigestSummarizer:
+    """
+    Long-horizon reports with a bounded prompt size.
+
+    Map: each period (default one week) of compact daily features is
+    summarised in parallel, and each result is cached. Reduce: the period
+    summaries are combined, `fan_in` at a time, until one report remains,
+    so no single prompt grows with the range length.
+    """
+
+    MAP_VERSION = "1"
+
+    def __init__(self, summarizer: AISummarizer, period_days: int = 7, fan_in: int = 6, max_workers: int = 4):
+        self.summarizer = summarizer
+        self.period_days = period_days
+        self.fan_in = fan_in
+        self.max_workers = max_workers
+
+    def _map_period(self, features: List[DailyFeatures]) -> Dict[str, Any]:
+        numbers = aggregate(features)
+        daily = [f.compact() for f in features]
+
+        cache = self.summarizer.cache
+        key = SummaryCache.make_key(daily, self.summarizer.MODEL, f"digest-map-{self.MAP_VERSION}")
+        text = cache.get(key) if cache is not None else None
+        if text is None:
+            text = self.summarizer.complete([
+                {"role": "system", "content": "You are a concise health analyst."},
+                {"role": "user", "content": (
+                    "Summarise this period of Oura daily metrics in at most 40 words of plain text: "
+                    "notable highs/lows, trends within the period, and anything unusual.\n"
+                    f"{json.dumps(daily, separators=(',', ':'))}"
+                )}
+            ])
+            if cache is not None:
+                cache.set(key, text)
+        return {**numbers, "summary": text}
+
+    def _reduce(self, periods: List[Dict[str, Any]], label: str, final: bool) -> Dict[str, Any]:
+        data = json.dumps(periods, separators=(",", ":"))
+        if not final:
+            text = self.summarizer.complete([
+                {"role": "system", "content": "You are a concise health analyst."},
+                {"role": "user", "content": (
+                    "Merge these consecutive period summaries into one of at most 60 words of plain text, "
+                    f"keeping the key numbers and trends.\n{data}"
+                )}
+            ])
+            return {"from": periods[0]["from"], "to": periods[-1]["to"], "summary": text}
+
+        text = self.summarizer.complete([
+            {"role": "system", "content": self.summarizer.SYSTEM_PROMPT},
+            {"role": "user", "content": f"""
+        Write a {label} Oura health digest. Output strictly HTML-formatted for Telegram (<b>, <i> only).
+
+        Period summaries (oldest first):
+        {data}
+
+        Requirements:
+        - <b>{label.capitalize()} Stats</b>: Averages for Sleep, Readiness, Activity, HRV, RHR, Stress, SpO2 and workout totals.
+        - <b>Trends</b>: How things changed across the range.
+        - <b>Action</b>: 1-2 brief tips.
+
+        Rules:
+        - Absolute minimum words. Data-heavy.
+        - No Markdown (** or __).
+        - No HTML lists (<ul>, <li>) or <br>.
+        - Use "• " for bullets.
+        """}
+        ])
+        return {"summary": text}
+
+    def generate_digest(self, features: List[DailyFeatures], label: str = "weekly") -> str:
+        """Build a digest for the given days (oldest first)."""
+        if not features:
+            return f"No Oura data found for the {label} digest."
+
+        periods = [features[i:i + self.period_days] for i in range(0, len(features), self.period_days)]
+        logger.info(f"Digest map stage: {len(periods)} period(s).")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                summaries = list(executor.map(self._map_period, periods))
+
+                # Tree reduce so every prompt holds at most `fan_in` summaries
+                while len(summaries) > self.fan_in:
+                    groups = [summaries[i:i + self.fan_in] for i in range(0, len(summaries), self.fan_in)]
+                    summaries = list(executor.map(lambda g: self._reduce(g, label, final=False), groups))
+
+            return self._reduce(summaries, label, final=True)["summary"]
+        except Exception as e:
+            # Same as a failed daily summary: the user still gets the numbers
+            logger.error(f"{label.capitalize()} digest generation failed, sending stats only: {e}")
+            metrics.inc("summary_fallbacks_total", reason="digest_error")
+            return render_stats([aggregate_stats(features, label)], UNAVAILABLE_NOTE)
@@ -0,0 +1,136 @@
+"""Compact feature extraction from raw Oura documents for the LLM prompt."""
+
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+@dataclass
+class DailyFeatures:
+    """The metrics the summary prompt asks for, for a single day."""
+
+    day: str
+    sleep_score: Optional[int] = None
+    readiness_score: Optional[int] = None
+    activity_score: Optional[int] = None
+    total_sleep_h: Optional[float] = None
+    deep_sleep_min: Optional[int] = None
+    rem_sleep_min: Optional[int] = None
+    sleep_efficiency: Optional[int] = None
+    hrv_ms: Optional[int] = None
+    rhr_bpm: Optional[int] = None
+    hrv_balance: Optional[int] = None
+    temp_deviation_c: Optional[float] = None
+    steps: Optional[int] = None
+    active_calories: Optional[int] = None
+    stress_high_min: Optional[int] = None
+    recovery_high_min: Optional[int] = None
+    stress_summary: Optional[str] = None
+    spo2_avg: Optional[float] = None
+    breathing_disturbance_index: Optional[int] = None
+    workout_count: int = 0
+    workout_min: int = 0
+    workout_calories: int = 0
+    workout_activities: List[str] = field(default_factory=list)
+
+    def compact(self) -> Dict[str, Any]:
+        """Dict without empty fields, for the prompt."""
+        data = {k: v for k, v in asdict(self).items() if v is not None}
+        if not self.workout_count:
+            for key in ("workout_count", "workout_min", "workout_calories", "workout_activities"):
+                data.pop(key)
+        return data
+
+
+def _minutes(seconds: Optional[int]) -> Optional[int]:
+    return round(seconds / 60) if seconds is not None else None
+
+
+def _docs(collection: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return (collection or {}).get("data", [])
+
+
+def _duration_min(workout: Dict[str, Any]) -> int:
+    try:
+        start = datetime.fromisoformat(workout["start_datetime"])
+        end = datetime.fromisoformat(workout["end_datetime"])
+    except (KeyError, TypeError, ValueError):
+        return 0
+    return round((end - start).total_seconds() / 60)
+
+
+def extract_features(
+    sleep_data: Dict[str, Any],
+    activity_data: Dict[str, Any],
+    readiness_data: Dict[str, Any],
+    stress_data: Optional[Dict[str, Any]] = None,
+    spo2_data: Optional[Dict[str, Any]] = None,
+    workout_data: Optional[Dict[str, Any]] = None,
+    sleep_periods_data: Optional[Dict[str, Any]] = None,
+) -> List[DailyFeatures]:
+    """
+    Reduce raw collection responses to one DailyFeatures record per day.
+
+    Contributor breakdowns, ids, timestamps and the 5-minute activity/sleep
+    strings are dropped; only the values the prompt reports on are kept.
+    """
+    days: Dict[str, DailyFeatures] = {}
+
+    def record(day: str) -> DailyFeatures:
+        if day not in days:
+            days[day] = DailyFeatures(day=day)
+        return days[day]
+
+    for doc in _docs(sleep_data):
+        record(doc["day"]).sleep_score = doc.get("score")
+
+    for doc in _docs(readiness_data):
+        features = record(doc["day"])
+        features.readiness_score = doc.get("score")
+        features.temp_deviation_c = doc.get("temperature_deviation")
+        features.hrv_balance = (doc.get("contributors") or {}).get("hrv_balance")
+
+    for doc in _docs(activity_data):
+        features = record(doc["day"])
+        features.activity_score = doc.get("score")
+        features.steps = doc.get("steps")
+        features.active_calories = doc.get("active_calories")
+
+    for doc in _docs(stress_data):
+        features = record(doc["day"])
+        features.stress_high_min = _minutes(doc.get("stress_high"))
+        features.recovery_high_min = _minutes(doc.get("recovery_high"))
+        features.stress_summary = doc.get("day_summary")
+
+    for doc in _docs(spo2_data):
+        features = record(doc["day"])
+        features.spo2_avg = (doc.get("spo2_percentage") or {}).get("average")
+        features.breathing_disturbance_index = doc.get("breathing_disturbance_index")
+
+    for doc in _docs(workout_data):
+        features = record(doc["day"])
+        features.workout_count += 1
+        features.workout_min += _duration_min(doc)
+        features.workout_calories += round(doc.get("calories") or 0)
+        if doc.get("activity") and doc["activity"] not in features.workout_activities:
+            features.workout_activities.append(doc["activity"])
+
+    # Detailed sleep periods carry the actual HRV / RHR values; use the main sleep
+    for doc in _docs(sleep_periods_data):
+        if doc.get("type") not in ("long_sleep", None):
+            continue
+        features = record(doc["day"])
+        total = doc.get("total_sleep_duration")
+        features.total_sleep_h = round(total / 3600, 1) if total is not None else None
+        features.deep_sleep_min = _minutes(doc.get("deep_sleep_duration"))
+        features.rem_sleep_min = _minutes(doc.get("rem_sleep_duration"))
+        features.sleep_efficiency = doc.get("efficiency")
+        features.hrv_ms = doc.get("average_hrv")
+        features.rhr_bpm = doc.get("lowest_heart_rate")
+
+    return [days[day] for day in sorted(days)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/JSON)."""
+    return (len(text) + 3) // 4
@@ -1,48 +1,86 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
 import requests
-from datetime import datetime
-from typing import Dict, Any, Optional
 
-class OuraClient:
-    """Client for Oura V2 API."""
-    
-    BASE_URL = "https://api.ouraring.com/v2"
+from oura_models import COLLECTIONS, OuraEndpoints, PersonalInfoResponse
+from oura_records import Record
+from utils import fast_json, metrics
+from utils.http_transport import TokenBucket, build_session, request_with_retry
+from utils.token_store import TokenFile, stamp_expiry
 
-    def __init__(self, client_id: str, client_secret: str, token_file: str = "oura_tokens.json"):
-        self.client_id = client_id
-        self.client_secret = client_secret
+class OuraAuth(ABC):
+    """
+    OAuth token handling shared by OuraClient and AsyncOuraClient.
+
+    Tokens live in a TokenFile; refreshes are plain blocking calls (the
+    async client runs them on a worker thread), made through
+    _send_refresh(), which each client implements with its transport.
+    """
+
+    # Refresh this many seconds before the access token expires
+    REFRESH_MARGIN = 300
+
+    def _init_auth(self, token_file: str):
         self.token_file = token_file
-        self.session = requests.Session()
+        self._token_store = TokenFile(token_file)
+        self._refresh_lock = threading.Lock()
         self._load_tokens()
 
     def _load_tokens(self):
         """Load tokens from file."""
-        import json
-        import os
-        
-        if os.path.exists(self.token_file):
-            with open(self.token_file, 'r') as f:
-                self.tokens = json.load(f)
-            self.session.headers.update({
-                "Authorization": f"Bearer {self.tokens.get('access_token')}"
-            })
-        else:
+        if not self._token_store.exists():
             raise FileNotFoundError(f"Token file {self.token_file} not found. Run setup_oauth.py first.")
+        self._use_tokens(self._token_store.read())
 
-    def _save_tokens(self, tokens: Dict[str, Any]):
-        """Save tokens to file."""
-        import json
+    def _use_tokens(self, tokens: Dict[str, Any]):
         self.tokens = tokens
-        with open(self.token_file, 'w') as f:
-            json.dump(tokens, f, indent=4)
-        
-        self.session.headers.update({
-            "Authorization": f"Bearer {self.tokens.get('access_token')}"
-        })
+
+    def _save_tokens(self, tokens: Dict[str, Any]):
+        """Save tokens to file (atomically) and start using them."""
+        tokens = stamp_expiry(tokens)
+        self._token_store.write(tokens)
+        self._use_tokens(tokens)
+
+    def _token_expiring(self, tokens: Optional[Dict[str, Any]] = None) -> bool:
+        """True if the access token expires within REFRESH_MARGIN (unknown expiry counts as valid)."""
+        expires_at = (tokens or self.tokens).get("expires_at")
+        return expires_at is not None and time.time() >= expires_at - self.REFRESH_MARGIN
+
+    def _refresh_if_stale(self, token_used: Optional[str]):
+        """
+        Refresh the access token unless someone else already has.
+
+        Holds the token file lock, so threads and other processes sharing
+        the file do one refresh between them; the others pick up the new
+        tokens from the file. Oura refresh tokens are single use, so two
+        concurrent refreshes would otherwise invalidate each other.
+        """
+        with self._refresh_lock, self._token_store.lock():
+            if self.tokens.get("access_token") != token_used:
+                # Another thread in this process already refreshed
+                return
+            stored = self._token_store.read()
+            if stored.get("access_token") != token_used and not self._token_expiring(stored):
+                # Another process refreshed; adopt its tokens
+                self._use_tokens(stored)
+                return
+            # The stored refresh token is the newest one
+            self.tokens = stored
+            self._refresh_token()
+
+    @abstractmethod
+    def _send_refresh(self, data: Dict[str, Any]) -> requests.Response:
+        """POST the refresh grant to /oauth/token (blocking)."""
 
     def _refresh_token(self):
         """Refresh the access token."""
         print("🔄 Refreshing access token...")
-        url = "https://api.ouraring.com/oauth/token"
         data = {
             "grant_type": "refresh_token",
             "refresh_token": self.tokens.get("refresh_token"),
@@ -50,20 +88,96 @@ class OuraClient:
             "client_secret": self.client_secret
         }
         
-        response = requests.post(url, data=data)
-        response.raise_for_status()
+        with metrics.span("oura_token_refresh") as span:
+            response = self._send_refresh(data)
+            span.labels["status"] = response.status_code
+            response.raise_for_status()
         
         new_tokens = response.json()
         self._save_tokens(new_tokens)
         print("✅ Token refreshed successfully.")
 
+
+class OuraClient(OuraAuth, OuraEndpoints):
+    """
+    Client for Oura V2 API.
+
+    Every collection in the bundled OpenAPI spec has generated methods (see
+    OuraEndpoints in oura_models.py): get_<collection>() for the raw
+    response, <collection>_records() for typed records and
+    get_<collection>_document() for a single document.
+    """
+    
+    API_URL = "https://api.ouraring.com"
+    BASE_URL = f"{API_URL}/v2"
+
+    # Collections fetched for the daily summary, keyed by collection name.
+    DAILY_COLLECTIONS = (
+        "daily_sleep",
+        "daily_activity",
+        "daily_readiness",
+        "daily_stress",
+        "daily_spo2",
+        "workout",
+        "sleep",
+    )
+
+    # Oura allows 5000 requests per 5 minutes per user
+    RATE_LIMIT_REQUESTS = 5000
+    RATE_LIMIT_PERIOD = 300
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        token_file: str = "oura_tokens.json",
+        max_workers: int = 6,
+        api_url: Optional[str] = None
+    ):
+        self.client_id = client_id
+        # OURA_API_URL points the client at another host (e.g. a local fake for benchmarks)
+        self.api_url = api_url or os.getenv("OURA_API_URL", self.API_URL)
+        self.base_url = f"{self.api_url}/v2"
+        self.client_secret = client_secret
+        self.max_workers = max_workers
+        # Size the connection pool so concurrent fetches reuse keep-alive connections
+        self.session = build_session(pool_maxsize=max_workers)
+        # Per-user quota; the small burst keeps a backfill from front-loading the whole window
+        self.limiter = TokenBucket(rate=self.RATE_LIMIT_REQUESTS / self.RATE_LIMIT_PERIOD, capacity=50)
+        self._init_auth(token_file)
+
+    def _use_tokens(self, tokens: Dict[str, Any]):
+        self.tokens = tokens
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.tokens.get('access_token')}"
+        })
+
+    def _send_refresh(self, data: Dict[str, Any]) -> requests.Response:
+        # Refresh tokens are single use: a retry after the server acted would fail with a spent token
+        return self._request("POST", f"{self.api_url}/oauth/token", data=data, max_retries=0)
+
+    def _request(self, method: str, url: str, **kwargs):
+        """Send a request through the shared transport (rate limit, retries, timeouts)."""
+        return request_with_retry(
+            self.session, method, url, limiter=self.limiter, upstream_name="oura", **kwargs
+        )
+
     def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, retry: bool = True) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}{endpoint}"
-        response = self.session.get(url, params=params)
+        url = f"{self.base_url}{endpoint}"
+        if self._token_expiring():
+            # Refresh before the request instead of spending a round trip on a 401
+            try:
+                self._refresh_if_stale(self.tokens.get("access_token"))
+            except Exception as e:
+                print(f"❌ Failed to refresh token: {e}")
+        token_used = self.tokens.get("access_token")
+        with metrics.span("oura_request", endpoint=endpoint) as span:
+            response = self._request("GET", url, params=params)
+            span.labels["status"] = response.status_code
         
         if response.status_code == 401 and retry:
             try:
-                self._refresh_token()
+                self._refresh_if_stale(token_used)
                 # Retry request with new token
                 return self._get(endpoint, params, retry=False)
             except Exception as e:
@@ -71,50 +185,152 @@ class OuraClient:
                 response.raise_for_status()
                 
         response.raise_for_status()
-        return response.json()
+        # Parse the body bytes directly (orjson when installed)
+        return fast_json.loads(response.content)
 
     def get_personal_info(self) -> Dict[str, Any]:
         """Get personal info."""
         return self._get("/usercollection/personal_info")
 
-    def get_daily_sleep(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get daily sleep documents."""
-        return self._get("/usercollection/daily_sleep", params={
-            "start_date": start_date,
-            "end_date": end_date
-        })
+    def iter_collection(self, endpoint: str, start_date: str, end_date: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield documents from a collection endpoint one at a time.
 
-    def get_daily_activity(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get daily activity documents."""
-        return self._get("/usercollection/daily_activity", params={
-            "start_date": start_date,
-            "end_date": end_date
-        })
+        Follows `next_token` lazily, so only one page is held in memory.
+        """
+        return self._iter_pages(endpoint, {"start_date": start_date, "end_date": end_date})
 
-    def get_daily_readiness(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get daily readiness documents."""
-        return self._get("/usercollection/daily_readiness", params={
-            "start_date": start_date,
-            "end_date": end_date
+    def iter_heartrate(self, start_datetime: str, end_datetime: str) -> Iterator[Dict[str, Any]]:
+        """Yield heart rate samples ({bpm, source, timestamp}) between two ISO datetimes."""
+        return self._iter_pages("/usercollection/heartrate", {
+            "start_datetime": start_datetime,
+            "end_datetime": end_datetime
         })
 
-    def get_daily_stress(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get daily stress (using daily_stress endpoint if available or generic getter)."""
-        return self._get("/usercollection/daily_stress", params={
-            "start_date": start_date,
-            "end_date": end_date
-        })
+    def _iter_pages(self, endpoint: str, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        while True:
+            page = self._get(endpoint, params=params)
+            yield from page.get("data", [])
 
-    def get_daily_spo2(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get daily SpO2 documents."""
-        return self._get("/usercollection/daily_spo2", params={
-            "start_date": start_date,
-            "end_date": end_date
-        })
+            next_token = page.get("next_token")
+            if not next_token:
+                return
+            params = {**params, "next_token": next_token}
+
+    def get_collection(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch every page of a collection (e.g. "daily_sleep") into a single response dict.
+
+        `start` and `end` are dates, or ISO datetimes for heartrate.
+        """
+        params = COLLECTIONS[collection].params(start, end)
+        return {
+            "data": list(self._iter_pages(f"/usercollection/{collection}", params)),
+            "next_token": None,
+        }
+
+    def iter_records(self, collection: str, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Record]:
+        """Yield a collection's documents as typed records, one page in memory at a time."""
+        spec = COLLECTIONS[collection]
+        decode = spec.record.from_dict
+        for document in self._iter_pages(f"/usercollection/{collection}", spec.params(start, end)):
+            yield decode(document)
 
-    def get_workouts(self, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get workout documents."""
-        return self._get("/usercollection/workout", params={
-            "start_date": start_date,
-            "end_date": end_date
+    def get_document(self, collection: str, document_id: str) -> Record:
+        """Fetch a single document of a collection by ID."""
+        return COLLECTIONS[collection].record.from_dict(self._get(f"/usercollection/{collection}/{document_id}"))
+
+    def get_personal_info_record(self) -> PersonalInfoResponse:
+        """Personal info as a typed record."""
+        return PersonalInfoResponse.from_dict(self.get_personal_info())
+
+    # Names used before the endpoint methods were generated from the spec
+    get_workouts = OuraEndpoints.get_workout
+    get_sleep_periods = OuraEndpoints.get_sleep
+
+    def get_collections(
+        self,
+        start_date: str,
+        end_date: str,
+        collections: Iterable[str] = DAILY_COLLECTIONS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch several collections concurrently over the shared session.
+
+        Returns a dict keyed by collection name (e.g. "daily_sleep").
+        """
+        collections = list(collections)
+        workers = max(1, min(self.max_workers, len(collections)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(self.get_collection, name, start_date, end_date)
+                for name in collections
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    def _webhook_request(self, method: str, path: str, json: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a webhook subscription route, authenticated with the app credentials."""
+        url = f"{self.base_url}/webhook/subscription{path}"
+        headers = {"x-client-id": self.client_id, "x-client-secret": self.client_secret}
+        response = self._request(method, url, json=json, headers=headers)
+        response.raise_for_status()
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def list_webhook_subscriptions(self) -> List[Dict[str, Any]]:
+        """List webhook subscriptions for this application."""
+        return self._webhook_request("GET", "")
+
+    def create_webhook_subscription(
+        self, callback_url: str, verification_token: str, data_type: str, event_type: str = "create"
+    ) -> Dict[str, Any]:
+        """Create a webhook subscription. Oura verifies the callback before returning."""
+        return self._webhook_request("POST", "", json={
+            "callback_url": callback_url,
+            "verification_token": verification_token,
+            "event_type": event_type,
+            "data_type": data_type
         })
+
+    def renew_webhook_subscription(self, subscription_id: str) -> Dict[str, Any]:
+        """Extend the expiration time of a webhook subscription."""
+        return self._webhook_request("PUT", f"/renew/{subscription_id}")
+
+    def delete_webhook_subscription(self, subscription_id: str) -> None:
+        """Delete a webhook subscription."""
+        self._webhook_request("DELETE", f"/{subscription_id}")
+
+    def ensure_webhook_subscriptions(
+        self,
+        callback_url: str,
+        verification_token: str,
+        data_types: Iterable[str] = DAILY_COLLECTIONS,
+        event_types: Iterable[str] = ("create", "update"),
+        renew_within: timedelta = timedelta(days=7),
+    ) -> List[Dict[str, Any]]:
+        """
+        Make sure a subscription exists for every data/event type pair.
+
+        Missing subscriptions are created and ones close to expiry are renewed.
+        """
+        existing = {
+            (sub["data_type"], sub["event_type"]): sub
+            for sub in self.list_webhook_subscriptions()
+            if sub.get("callback_url") == callback_url
+        }
+        renew_before = datetime.now(timezone.utc) + renew_within
+
+        subscriptions = []
+        for data_type in data_types:
+            for event_type in event_types:
+                sub = existing.get((data_type, event_type))
+                if sub is None:
+                    print(f"➕ Creating webhook subscription for {data_type}/{event_type}...")
+                    sub = self.create_webhook_subscription(callback_url, verification_token, data_type, event_type)
+                elif datetime.fromisoformat(sub["expiration_time"].replace("Z", "+00:00")) < renew_before:
+                    print(f"🔄 Renewing webhook subscription for {data_type}/{event_type}...")
+                    sub = self.renew_webhook_subscription(sub["id"])
+                subscriptions.append(sub)
+        return subscriptions
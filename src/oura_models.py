@@ -0,0 +1,954 @@
+"""
+Typed records and endpoint methods for every Oura v2 collection.
+
+Generated by generate_oura_models.py from openapi-1.27.json; do not edit by hand.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+from oura_records import Collection, Record, float_array, nested, nested_list
+
+
+class TagModel(Record):
+    """A TagModel maps to an ASSANote. An ASSANote in ExtAPIV2 is called a Tag"""
+
+    __slots__ = ("id", "day", "text", "timestamp", "tags")
+
+    id: Optional[str]
+    day: Optional[str]
+    text: Optional[str]
+    timestamp: Optional[str]
+    tags: Optional[List[str]]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TagModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.text = get("text")
+        self.timestamp = get("timestamp")
+        self.tags = get("tags")
+        return self
+
+
+class EnhancedTagModel(Record):
+    """An EnhancedTagModel maps an ASSATag. An ASSATag in ExtAPIV2 is called a EnhancedTag"""
+
+    __slots__ = ("id", "tag_type_code", "start_time", "end_time", "start_day", "end_day", "comment", "custom_name")
+
+    id: Optional[str]
+    tag_type_code: Optional[str]
+    start_time: Optional[str]
+    end_time: Optional[str]
+    start_day: Optional[str]
+    end_day: Optional[str]
+    comment: Optional[str]
+    custom_name: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EnhancedTagModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.tag_type_code = get("tag_type_code")
+        self.start_time = get("start_time")
+        self.end_time = get("end_time")
+        self.start_day = get("start_day")
+        self.end_day = get("end_day")
+        self.comment = get("comment")
+        self.custom_name = get("custom_name")
+        return self
+
+
+class PublicWorkout(Record):
+    """Public model for Workout."""
+
+    __slots__ = ("id", "activity", "calories", "day", "distance", "end_datetime", "intensity", "label", "source", "start_datetime")
+
+    id: Optional[str]
+    activity: Optional[str]
+    calories: Optional[float]
+    day: Optional[str]
+    distance: Optional[float]
+    end_datetime: Optional[str]
+    intensity: Optional[str]
+    label: Optional[str]
+    source: Optional[str]
+    start_datetime: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PublicWorkout":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.activity = get("activity")
+        self.calories = get("calories")
+        self.day = get("day")
+        self.distance = get("distance")
+        self.end_datetime = get("end_datetime")
+        self.intensity = get("intensity")
+        self.label = get("label")
+        self.source = get("source")
+        self.start_datetime = get("start_datetime")
+        return self
+
+
+class SampleModel(Record):
+    """SampleModel"""
+
+    __slots__ = ("interval", "items", "timestamp")
+
+    interval: Optional[float]
+    items: Optional[array]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SampleModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.interval = get("interval")
+        self.items = float_array(get("items"))
+        self.timestamp = get("timestamp")
+        return self
+
+
+class SessionModel(Record):
+    """SessionModel"""
+
+    __slots__ = ("id", "day", "start_datetime", "end_datetime", "type", "heart_rate", "heart_rate_variability", "mood", "motion_count")
+
+    id: Optional[str]
+    day: Optional[str]
+    start_datetime: Optional[str]
+    end_datetime: Optional[str]
+    type: Optional[str]
+    heart_rate: Optional[SampleModel]
+    heart_rate_variability: Optional[SampleModel]
+    mood: Optional[str]
+    motion_count: Optional[SampleModel]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.start_datetime = get("start_datetime")
+        self.end_datetime = get("end_datetime")
+        self.type = get("type")
+        self.heart_rate = nested(SampleModel.from_dict, get("heart_rate"))
+        self.heart_rate_variability = nested(SampleModel.from_dict, get("heart_rate_variability"))
+        self.mood = get("mood")
+        self.motion_count = nested(SampleModel.from_dict, get("motion_count"))
+        return self
+
+
+class ActivityContributors(Record):
+    """Object defining activity score contributors."""
+
+    __slots__ = ("meet_daily_targets", "move_every_hour", "recovery_time", "stay_active", "training_frequency", "training_volume")
+
+    meet_daily_targets: Optional[int]
+    move_every_hour: Optional[int]
+    recovery_time: Optional[int]
+    stay_active: Optional[int]
+    training_frequency: Optional[int]
+    training_volume: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ActivityContributors":
+        self = cls.__new__(cls)
+        get = data.get
+        self.meet_daily_targets = get("meet_daily_targets")
+        self.move_every_hour = get("move_every_hour")
+        self.recovery_time = get("recovery_time")
+        self.stay_active = get("stay_active")
+        self.training_frequency = get("training_frequency")
+        self.training_volume = get("training_volume")
+        return self
+
+
+class DailyActivityModel(Record):
+    """DailyActivityModel"""
+
+    __slots__ = ("id", "class_5_min", "score", "active_calories", "average_met_minutes", "contributors", "equivalent_walking_distance", "high_activity_met_minutes", "high_activity_time", "inactivity_alerts", "low_activity_met_minutes", "low_activity_time", "medium_activity_met_minutes", "medium_activity_time", "met", "meters_to_target", "non_wear_time", "resting_time", "sedentary_met_minutes", "sedentary_time", "steps", "target_calories", "target_meters", "total_calories", "day", "timestamp")
+
+    id: Optional[str]
+    class_5_min: Optional[str]
+    score: Optional[int]
+    active_calories: Optional[int]
+    average_met_minutes: Optional[float]
+    contributors: Optional[ActivityContributors]
+    equivalent_walking_distance: Optional[int]
+    high_activity_met_minutes: Optional[int]
+    high_activity_time: Optional[int]
+    inactivity_alerts: Optional[int]
+    low_activity_met_minutes: Optional[int]
+    low_activity_time: Optional[int]
+    medium_activity_met_minutes: Optional[int]
+    medium_activity_time: Optional[int]
+    met: Optional[SampleModel]
+    meters_to_target: Optional[int]
+    non_wear_time: Optional[int]
+    resting_time: Optional[int]
+    sedentary_met_minutes: Optional[int]
+    sedentary_time: Optional[int]
+    steps: Optional[int]
+    target_calories: Optional[int]
+    target_meters: Optional[int]
+    total_calories: Optional[int]
+    day: Optional[str]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyActivityModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.class_5_min = get("class_5_min")
+        self.score = get("score")
+        self.active_calories = get("active_calories")
+        self.average_met_minutes = get("average_met_minutes")
+        self.contributors = nested(ActivityContributors.from_dict, get("contributors"))
+        self.equivalent_walking_distance = get("equivalent_walking_distance")
+        self.high_activity_met_minutes = get("high_activity_met_minutes")
+        self.high_activity_time = get("high_activity_time")
+        self.inactivity_alerts = get("inactivity_alerts")
+        self.low_activity_met_minutes = get("low_activity_met_minutes")
+        self.low_activity_time = get("low_activity_time")
+        self.medium_activity_met_minutes = get("medium_activity_met_minutes")
+        self.medium_activity_time = get("medium_activity_time")
+        self.met = nested(SampleModel.from_dict, get("met"))
+        self.meters_to_target = get("meters_to_target")
+        self.non_wear_time = get("non_wear_time")
+        self.resting_time = get("resting_time")
+        self.sedentary_met_minutes = get("sedentary_met_minutes")
+        self.sedentary_time = get("sedentary_time")
+        self.steps = get("steps")
+        self.target_calories = get("target_calories")
+        self.target_meters = get("target_meters")
+        self.total_calories = get("total_calories")
+        self.day = get("day")
+        self.timestamp = get("timestamp")
+        return self
+
+
+class SleepContributors(Record):
+    """Object defining sleep score contributors."""
+
+    __slots__ = ("deep_sleep", "efficiency", "latency", "rem_sleep", "restfulness", "timing", "total_sleep")
+
+    deep_sleep: Optional[int]
+    efficiency: Optional[int]
+    latency: Optional[int]
+    rem_sleep: Optional[int]
+    restfulness: Optional[int]
+    timing: Optional[int]
+    total_sleep: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SleepContributors":
+        self = cls.__new__(cls)
+        get = data.get
+        self.deep_sleep = get("deep_sleep")
+        self.efficiency = get("efficiency")
+        self.latency = get("latency")
+        self.rem_sleep = get("rem_sleep")
+        self.restfulness = get("restfulness")
+        self.timing = get("timing")
+        self.total_sleep = get("total_sleep")
+        return self
+
+
+class DailySleepModel(Record):
+    """Object defining daily sleep."""
+
+    __slots__ = ("id", "contributors", "day", "score", "timestamp")
+
+    id: Optional[str]
+    contributors: Optional[SleepContributors]
+    day: Optional[str]
+    score: Optional[int]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailySleepModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.contributors = nested(SleepContributors.from_dict, get("contributors"))
+        self.day = get("day")
+        self.score = get("score")
+        self.timestamp = get("timestamp")
+        return self
+
+
+class DailySpO2AggregatedValuesModel(Record):
+    """DailySpO2AggregatedValuesModel"""
+
+    __slots__ = ("average",)
+
+    average: Optional[float]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailySpO2AggregatedValuesModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.average = get("average")
+        return self
+
+
+class DailySpO2Model(Record):
+    """DailySpO2Model"""
+
+    __slots__ = ("id", "day", "spo2_percentage", "breathing_disturbance_index")
+
+    id: Optional[str]
+    day: Optional[str]
+    spo2_percentage: Optional[DailySpO2AggregatedValuesModel]
+    breathing_disturbance_index: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailySpO2Model":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.spo2_percentage = nested(DailySpO2AggregatedValuesModel.from_dict, get("spo2_percentage"))
+        self.breathing_disturbance_index = get("breathing_disturbance_index")
+        return self
+
+
+class ReadinessContributors(Record):
+    """Object defining readiness score contributors."""
+
+    __slots__ = ("activity_balance", "body_temperature", "hrv_balance", "previous_day_activity", "previous_night", "recovery_index", "resting_heart_rate", "sleep_balance")
+
+    activity_balance: Optional[int]
+    body_temperature: Optional[int]
+    hrv_balance: Optional[int]
+    previous_day_activity: Optional[int]
+    previous_night: Optional[int]
+    recovery_index: Optional[int]
+    resting_heart_rate: Optional[int]
+    sleep_balance: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReadinessContributors":
+        self = cls.__new__(cls)
+        get = data.get
+        self.activity_balance = get("activity_balance")
+        self.body_temperature = get("body_temperature")
+        self.hrv_balance = get("hrv_balance")
+        self.previous_day_activity = get("previous_day_activity")
+        self.previous_night = get("previous_night")
+        self.recovery_index = get("recovery_index")
+        self.resting_heart_rate = get("resting_heart_rate")
+        self.sleep_balance = get("sleep_balance")
+        return self
+
+
+class DailyReadinessModel(Record):
+    """DailyReadinessModel"""
+
+    __slots__ = ("id", "contributors", "day", "score", "temperature_deviation", "temperature_trend_deviation", "timestamp")
+
+    id: Optional[str]
+    contributors: Optional[ReadinessContributors]
+    day: Optional[str]
+    score: Optional[int]
+    temperature_deviation: Optional[float]
+    temperature_trend_deviation: Optional[float]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyReadinessModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.contributors = nested(ReadinessContributors.from_dict, get("contributors"))
+        self.day = get("day")
+        self.score = get("score")
+        self.temperature_deviation = get("temperature_deviation")
+        self.temperature_trend_deviation = get("temperature_trend_deviation")
+        self.timestamp = get("timestamp")
+        return self
+
+
+class ReadinessSummary(Record):
+    """ReadinessSummary"""
+
+    __slots__ = ("contributors", "score", "temperature_deviation", "temperature_trend_deviation")
+
+    contributors: Optional[ReadinessContributors]
+    score: Optional[int]
+    temperature_deviation: Optional[float]
+    temperature_trend_deviation: Optional[float]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReadinessSummary":
+        self = cls.__new__(cls)
+        get = data.get
+        self.contributors = nested(ReadinessContributors.from_dict, get("contributors"))
+        self.score = get("score")
+        self.temperature_deviation = get("temperature_deviation")
+        self.temperature_trend_deviation = get("temperature_trend_deviation")
+        return self
+
+
+class SleepModel(Record):
+    """SleepModel"""
+
+    __slots__ = ("id", "average_breath", "average_heart_rate", "average_hrv", "awake_time", "bedtime_end", "bedtime_start", "day", "deep_sleep_duration", "efficiency", "heart_rate", "hrv", "latency", "light_sleep_duration", "low_battery_alert", "lowest_heart_rate", "movement_30_sec", "period", "readiness", "readiness_score_delta", "rem_sleep_duration", "restless_periods", "sleep_phase_5_min", "sleep_score_delta", "sleep_algorithm_version", "sleep_analysis_reason", "time_in_bed", "total_sleep_duration", "type")
+
+    id: Optional[str]
+    average_breath: Optional[float]
+    average_heart_rate: Optional[float]
+    average_hrv: Optional[int]
+    awake_time: Optional[int]
+    bedtime_end: Optional[str]
+    bedtime_start: Optional[str]
+    day: Optional[str]
+    deep_sleep_duration: Optional[int]
+    efficiency: Optional[int]
+    heart_rate: Optional[SampleModel]
+    hrv: Optional[SampleModel]
+    latency: Optional[int]
+    light_sleep_duration: Optional[int]
+    low_battery_alert: Optional[bool]
+    lowest_heart_rate: Optional[int]
+    movement_30_sec: Optional[str]
+    period: Optional[int]
+    readiness: Optional[ReadinessSummary]
+    readiness_score_delta: Optional[int]
+    rem_sleep_duration: Optional[int]
+    restless_periods: Optional[int]
+    sleep_phase_5_min: Optional[str]
+    sleep_score_delta: Optional[int]
+    sleep_algorithm_version: Optional[str]
+    sleep_analysis_reason: Optional[str]
+    time_in_bed: Optional[int]
+    total_sleep_duration: Optional[int]
+    type: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SleepModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.average_breath = get("average_breath")
+        self.average_heart_rate = get("average_heart_rate")
+        self.average_hrv = get("average_hrv")
+        self.awake_time = get("awake_time")
+        self.bedtime_end = get("bedtime_end")
+        self.bedtime_start = get("bedtime_start")
+        self.day = get("day")
+        self.deep_sleep_duration = get("deep_sleep_duration")
+        self.efficiency = get("efficiency")
+        self.heart_rate = nested(SampleModel.from_dict, get("heart_rate"))
+        self.hrv = nested(SampleModel.from_dict, get("hrv"))
+        self.latency = get("latency")
+        self.light_sleep_duration = get("light_sleep_duration")
+        self.low_battery_alert = get("low_battery_alert")
+        self.lowest_heart_rate = get("lowest_heart_rate")
+        self.movement_30_sec = get("movement_30_sec")
+        self.period = get("period")
+        self.readiness = nested(ReadinessSummary.from_dict, get("readiness"))
+        self.readiness_score_delta = get("readiness_score_delta")
+        self.rem_sleep_duration = get("rem_sleep_duration")
+        self.restless_periods = get("restless_periods")
+        self.sleep_phase_5_min = get("sleep_phase_5_min")
+        self.sleep_score_delta = get("sleep_score_delta")
+        self.sleep_algorithm_version = get("sleep_algorithm_version")
+        self.sleep_analysis_reason = get("sleep_analysis_reason")
+        self.time_in_bed = get("time_in_bed")
+        self.total_sleep_duration = get("total_sleep_duration")
+        self.type = get("type")
+        return self
+
+
+class SleepTimeWindow(Record):
+    """Object defining sleep time window"""
+
+    __slots__ = ("day_tz", "end_offset", "start_offset")
+
+    day_tz: Optional[int]
+    end_offset: Optional[int]
+    start_offset: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SleepTimeWindow":
+        self = cls.__new__(cls)
+        get = data.get
+        self.day_tz = get("day_tz")
+        self.end_offset = get("end_offset")
+        self.start_offset = get("start_offset")
+        return self
+
+
+class SleepTimeModel(Record):
+    """Object contains suggested bedtime for the user."""
+
+    __slots__ = ("id", "day", "optimal_bedtime", "recommendation", "status")
+
+    id: Optional[str]
+    day: Optional[str]
+    optimal_bedtime: Optional[SleepTimeWindow]
+    recommendation: Optional[str]
+    status: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SleepTimeModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.optimal_bedtime = nested(SleepTimeWindow.from_dict, get("optimal_bedtime"))
+        self.recommendation = get("recommendation")
+        self.status = get("status")
+        return self
+
+
+class RestModeEpisode(Record):
+    """Object defining a Rest Mode episode."""
+
+    __slots__ = ("tags", "timestamp")
+
+    tags: Optional[List[str]]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RestModeEpisode":
+        self = cls.__new__(cls)
+        get = data.get
+        self.tags = get("tags")
+        self.timestamp = get("timestamp")
+        return self
+
+
+class RestModePeriodModel(Record):
+    """Object contains information about rest mode episode."""
+
+    __slots__ = ("id", "end_day", "end_time", "episodes", "start_day", "start_time")
+
+    id: Optional[str]
+    end_day: Optional[str]
+    end_time: Optional[str]
+    episodes: Optional[List[RestModeEpisode]]
+    start_day: Optional[str]
+    start_time: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RestModePeriodModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.end_day = get("end_day")
+        self.end_time = get("end_time")
+        self.episodes = nested_list(RestModeEpisode.from_dict, get("episodes"))
+        self.start_day = get("start_day")
+        self.start_time = get("start_time")
+        return self
+
+
+class RingConfigurationModel(Record):
+    """RingConfigurationModel"""
+
+    __slots__ = ("id", "color", "design", "firmware_version", "hardware_type", "set_up_at", "size")
+
+    id: Optional[str]
+    color: Optional[str]
+    design: Optional[str]
+    firmware_version: Optional[str]
+    hardware_type: Optional[str]
+    set_up_at: Optional[str]
+    size: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RingConfigurationModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.color = get("color")
+        self.design = get("design")
+        self.firmware_version = get("firmware_version")
+        self.hardware_type = get("hardware_type")
+        self.set_up_at = get("set_up_at")
+        self.size = get("size")
+        return self
+
+
+class DailyStressModel(Record):
+    """Object defining daily stress."""
+
+    __slots__ = ("id", "day", "stress_high", "recovery_high", "day_summary")
+
+    id: Optional[str]
+    day: Optional[str]
+    stress_high: Optional[int]
+    recovery_high: Optional[int]
+    day_summary: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyStressModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.stress_high = get("stress_high")
+        self.recovery_high = get("recovery_high")
+        self.day_summary = get("day_summary")
+        return self
+
+
+class ResilienceContributors(Record):
+    """ResilienceContributors"""
+
+    __slots__ = ("sleep_recovery", "daytime_recovery", "stress")
+
+    sleep_recovery: Optional[float]
+    daytime_recovery: Optional[float]
+    stress: Optional[float]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResilienceContributors":
+        self = cls.__new__(cls)
+        get = data.get
+        self.sleep_recovery = get("sleep_recovery")
+        self.daytime_recovery = get("daytime_recovery")
+        self.stress = get("stress")
+        return self
+
+
+class DailyResilienceModel(Record):
+    """DailyResilienceModel"""
+
+    __slots__ = ("id", "day", "contributors", "level")
+
+    id: Optional[str]
+    day: Optional[str]
+    contributors: Optional[ResilienceContributors]
+    level: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyResilienceModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.contributors = nested(ResilienceContributors.from_dict, get("contributors"))
+        self.level = get("level")
+        return self
+
+
+class DailyCardiovascularAgeModel(Record):
+    """DailyCardiovascularAgeModel"""
+
+    __slots__ = ("day", "vascular_age")
+
+    day: Optional[str]
+    vascular_age: Optional[int]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyCardiovascularAgeModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.day = get("day")
+        self.vascular_age = get("vascular_age")
+        return self
+
+
+class VO2MaxModel(Record):
+    """VO2MaxModel"""
+
+    __slots__ = ("id", "day", "timestamp", "vo2_max")
+
+    id: Optional[str]
+    day: Optional[str]
+    timestamp: Optional[str]
+    vo2_max: Optional[float]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VO2MaxModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.day = get("day")
+        self.timestamp = get("timestamp")
+        self.vo2_max = get("vo2_max")
+        return self
+
+
+class HeartRateModel(Record):
+    """HeartRateModel"""
+
+    __slots__ = ("bpm", "source", "timestamp")
+
+    bpm: Optional[int]
+    source: Optional[str]
+    timestamp: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HeartRateModel":
+        self = cls.__new__(cls)
+        get = data.get
+        self.bpm = get("bpm")
+        self.source = get("source")
+        self.timestamp = get("timestamp")
+        return self
+
+
+class PersonalInfoResponse(Record):
+    """PersonalInfoResponse"""
+
+    __slots__ = ("id", "age", "weight", "height", "biological_sex", "email")
+
+    id: Optional[str]
+    age: Optional[int]
+    weight: Optional[float]
+    height: Optional[float]
+    biological_sex: Optional[str]
+    email: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PersonalInfoResponse":
+        self = cls.__new__(cls)
+        get = data.get
+        self.id = get("id")
+        self.age = get("age")
+        self.weight = get("weight")
+        self.height = get("height")
+        self.biological_sex = get("biological_sex")
+        self.email = get("email")
+        return self
+
+
+COLLECTIONS: Dict[str, Collection] = {
+    "tag": Collection("tag", TagModel, "date", True),
+    "enhanced_tag": Collection("enhanced_tag", EnhancedTagModel, "date", True),
+    "workout": Collection("workout", PublicWorkout, "date", True),
+    "session": Collection("session", SessionModel, "date", True),
+    "daily_activity": Collection("daily_activity", DailyActivityModel, "date", True),
+    "daily_sleep": Collection("daily_sleep", DailySleepModel, "date", True),
+    "daily_spo2": Collection("daily_spo2", DailySpO2Model, "date", True),
+    "daily_readiness": Collection("daily_readiness", DailyReadinessModel, "date", True),
+    "sleep": Collection("sleep", SleepModel, "date", True),
+    "sleep_time": Collection("sleep_time", SleepTimeModel, "date", True),
+    "rest_mode_period": Collection("rest_mode_period", RestModePeriodModel, "date", True),
+    "ring_configuration": Collection("ring_configuration", RingConfigurationModel, "none", True),
+    "daily_stress": Collection("daily_stress", DailyStressModel, "date", True),
+    "daily_resilience": Collection("daily_resilience", DailyResilienceModel, "date", True),
+    "daily_cardiovascular_age": Collection("daily_cardiovascular_age", DailyCardiovascularAgeModel, "date", True),
+    "vO2_max": Collection("vO2_max", VO2MaxModel, "date", True),
+    "heartrate": Collection("heartrate", HeartRateModel, "datetime", False),
+}
+
+
+class OuraEndpoints:
+    """
+    One method per collection endpoint, built on get_collection(),
+    iter_records() and get_document(). On AsyncOuraClient they return
+    coroutines and async iterators instead.
+    """
+
+    def get_tag(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every tag document between start_date and end_date, as a single response dict."""
+        return self.get_collection("tag", start_date, end_date)
+
+    def tag_records(self, start_date: str, end_date: str) -> Iterator[TagModel]:
+        """Yield tag documents between start_date and end_date as TagModel records."""
+        return self.iter_records("tag", start_date, end_date)
+
+    def get_tag_document(self, document_id: str) -> TagModel:
+        """Fetch one tag document by ID."""
+        return self.get_document("tag", document_id)
+
+    def get_enhanced_tag(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every enhanced_tag document between start_date and end_date, as a single response dict."""
+        return self.get_collection("enhanced_tag", start_date, end_date)
+
+    def enhanced_tag_records(self, start_date: str, end_date: str) -> Iterator[EnhancedTagModel]:
+        """Yield enhanced_tag documents between start_date and end_date as EnhancedTagModel records."""
+        return self.iter_records("enhanced_tag", start_date, end_date)
+
+    def get_enhanced_tag_document(self, document_id: str) -> EnhancedTagModel:
+        """Fetch one enhanced_tag document by ID."""
+        return self.get_document("enhanced_tag", document_id)
+
+    def get_workout(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every workout document between start_date and end_date, as a single response dict."""
+        return self.get_collection("workout", start_date, end_date)
+
+    def workout_records(self, start_date: str, end_date: str) -> Iterator[PublicWorkout]:
+        """Yield workout documents between start_date and end_date as PublicWorkout records."""
+        return self.iter_records("workout", start_date, end_date)
+
+    def get_workout_document(self, document_id: str) -> PublicWorkout:
+        """Fetch one workout document by ID."""
+        return self.get_document("workout", document_id)
+
+    def get_session(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every session document between start_date and end_date, as a single response dict."""
+        return self.get_collection("session", start_date, end_date)
+
+    def session_records(self, start_date: str, end_date: str) -> Iterator[SessionModel]:
+        """Yield session documents between start_date and end_date as SessionModel records."""
+        return self.iter_records("session", start_date, end_date)
+
+    def get_session_document(self, document_id: str) -> SessionModel:
+        """Fetch one session document by ID."""
+        return self.get_document("session", document_id)
+
+    def get_daily_activity(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_activity document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_activity", start_date, end_date)
+
+    def daily_activity_records(self, start_date: str, end_date: str) -> Iterator[DailyActivityModel]:
+        """Yield daily_activity documents between start_date and end_date as DailyActivityModel records."""
+        return self.iter_records("daily_activity", start_date, end_date)
+
+    def get_daily_activity_document(self, document_id: str) -> DailyActivityModel:
+        """Fetch one daily_activity document by ID."""
+        return self.get_document("daily_activity", document_id)
+
+    def get_daily_sleep(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_sleep document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_sleep", start_date, end_date)
+
+    def daily_sleep_records(self, start_date: str, end_date: str) -> Iterator[DailySleepModel]:
+        """Yield daily_sleep documents between start_date and end_date as DailySleepModel records."""
+        return self.iter_records("daily_sleep", start_date, end_date)
+
+    def get_daily_sleep_document(self, document_id: str) -> DailySleepModel:
+        """Fetch one daily_sleep document by ID."""
+        return self.get_document("daily_sleep", document_id)
+
+    def get_daily_spo2(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_spo2 document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_spo2", start_date, end_date)
+
+    def daily_spo2_records(self, start_date: str, end_date: str) -> Iterator[DailySpO2Model]:
+        """Yield daily_spo2 documents between start_date and end_date as DailySpO2Model records."""
+        return self.iter_records("daily_spo2", start_date, end_date)
+
+    def get_daily_spo2_document(self, document_id: str) -> DailySpO2Model:
+        """Fetch one daily_spo2 document by ID."""
+        return self.get_document("daily_spo2", document_id)
+
+    def get_daily_readiness(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_readiness document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_readiness", start_date, end_date)
+
+    def daily_readiness_records(self, start_date: str, end_date: str) -> Iterator[DailyReadinessModel]:
+        """Yield daily_readiness documents between start_date and end_date as DailyReadinessModel records."""
+        return self.iter_records("daily_readiness", start_date, end_date)
+
+    def get_daily_readiness_document(self, document_id: str) -> DailyReadinessModel:
+        """Fetch one daily_readiness document by ID."""
+        return self.get_document("daily_readiness", document_id)
+
+    def get_sleep(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every sleep document between start_date and end_date, as a single response dict."""
+        return self.get_collection("sleep", start_date, end_date)
+
+    def sleep_records(self, start_date: str, end_date: str) -> Iterator[SleepModel]:
+        """Yield sleep documents between start_date and end_date as SleepModel records."""
+        return self.iter_records("sleep", start_date, end_date)
+
+    def get_sleep_document(self, document_id: str) -> SleepModel:
+        """Fetch one sleep document by ID."""
+        return self.get_document("sleep", document_id)
+
+    def get_sleep_time(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every sleep_time document between start_date and end_date, as a single response dict."""
+        return self.get_collection("sleep_time", start_date, end_date)
+
+    def sleep_time_records(self, start_date: str, end_date: str) -> Iterator[SleepTimeModel]:
+        """Yield sleep_time documents between start_date and end_date as SleepTimeModel records."""
+        return self.iter_records("sleep_time", start_date, end_date)
+
+    def get_sleep_time_document(self, document_id: str) -> SleepTimeModel:
+        """Fetch one sleep_time document by ID."""
+        return self.get_document("sleep_time", document_id)
+
+    def get_rest_mode_period(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every rest_mode_period document between start_date and end_date, as a single response dict."""
+        return self.get_collection("rest_mode_period", start_date, end_date)
+
+    def rest_mode_period_records(self, start_date: str, end_date: str) -> Iterator[RestModePeriodModel]:
+        """Yield rest_mode_period documents between start_date and end_date as RestModePeriodModel records."""
+        return self.iter_records("rest_mode_period", start_date, end_date)
+
+    def get_rest_mode_period_document(self, document_id: str) -> RestModePeriodModel:
+        """Fetch one rest_mode_period document by ID."""
+        return self.get_document("rest_mode_period", document_id)
+
+    def get_ring_configuration(self) -> Dict[str, Any]:
+        """Every ring_configuration document, as a single response dict."""
+        return self.get_collection("ring_configuration")
+
+    def ring_configuration_records(self) -> Iterator[RingConfigurationModel]:
+        """Yield ring_configuration documents as RingConfigurationModel records."""
+        return self.iter_records("ring_configuration")
+
+    def get_ring_configuration_document(self, document_id: str) -> RingConfigurationModel:
+        """Fetch one ring_configuration document by ID."""
+        return self.get_document("ring_configuration", document_id)
+
+    def get_daily_stress(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_stress document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_stress", start_date, end_date)
+
+    def daily_stress_records(self, start_date: str, end_date: str) -> Iterator[DailyStressModel]:
+        """Yield daily_stress documents between start_date and end_date as DailyStressModel records."""
+        return self.iter_records("daily_stress", start_date, end_date)
+
+    def get_daily_stress_document(self, document_id: str) -> DailyStressModel:
+        """Fetch one daily_stress document by ID."""
+        return self.get_document("daily_stress", document_id)
+
+    def get_daily_resilience(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_resilience document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_resilience", start_date, end_date)
+
+    def daily_resilience_records(self, start_date: str, end_date: str) -> Iterator[DailyResilienceModel]:
+        """Yield daily_resilience documents between start_date and end_date as DailyResilienceModel records."""
+        return self.iter_records("daily_resilience", start_date, end_date)
+
+    def get_daily_resilience_document(self, document_id: str) -> DailyResilienceModel:
+        """Fetch one daily_resilience document by ID."""
+        return self.get_document("daily_resilience", document_id)
+
+    def get_daily_cardiovascular_age(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every daily_cardiovascular_age document between start_date and end_date, as a single response dict."""
+        return self.get_collection("daily_cardiovascular_age", start_date, end_date)
+
+    def daily_cardiovascular_age_records(self, start_date: str, end_date: str) -> Iterator[DailyCardiovascularAgeModel]:
+        """Yield daily_cardiovascular_age documents between start_date and end_date as DailyCardiovascularAgeModel records."""
+        return self.iter_records("daily_cardiovascular_age", start_date, end_date)
+
+    def get_daily_cardiovascular_age_document(self, document_id: str) -> DailyCardiovascularAgeModel:
+        """Fetch one daily_cardiovascular_age document by ID."""
+        return self.get_document("daily_cardiovascular_age", document_id)
+
+    def get_vo2_max(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Every vO2_max document between start_date and end_date, as a single response dict."""
+        return self.get_collection("vO2_max", start_date, end_date)
+
+    def vo2_max_records(self, start_date: str, end_date: str) -> Iterator[VO2MaxModel]:
+        """Yield vO2_max documents between start_date and end_date as VO2MaxModel records."""
+        return self.iter_records("vO2_max", start_date, end_date)
+
+    def get_vo2_max_document(self, document_id: str) -> VO2MaxModel:
+        """Fetch one vO2_max document by ID."""
+        return self.get_document("vO2_max", document_id)
+
+    def get_heartrate(self, start_datetime: str, end_datetime: str) -> Dict[str, Any]:
+        """Every heartrate document between two ISO datetimes, as a single response dict."""
+        return self.get_collection("heartrate", start_datetime, end_datetime)
+
+    def heartrate_records(self, start_datetime: str, end_datetime: str) -> Iterator[HeartRateModel]:
+        """Yield heartrate documents between two ISO datetimes as HeartRateModel records."""
+        return self.iter_records("heartrate", start_datetime, end_datetime)
@@ -0,0 +1,89 @@
+"""Base class and helpers for the typed Oura records generated in oura_models.py."""
+
+import math
+from array import array
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type, TypeVar
+
+R = TypeVar("R", bound="Record")
+
+
+class Record:
+    """
+    A document decoded into a fixed set of attributes.
+
+    Subclasses are generated from the OpenAPI spec with `__slots__`, so a
+    record has no per-instance dict and takes a fraction of the memory of
+    the parsed JSON object; numeric sample series are stored as
+    array("d"), with NaN for missing samples. Fields missing from a
+    document are None, and fields the spec doesn't know about are dropped.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls: Type[R], data: Dict[str, Any]) -> R:
+        raise NotImplementedError
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's JSON shape, leaving out unset fields."""
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], Record):
+                value = [item.to_dict() for item in value]
+            elif isinstance(value, array):
+                value = [None if math.isnan(item) else item for item in value]
+            result[name] = value
+        return result
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:4])
+        more = ", ..." if len(self.__slots__) > 4 else ""
+        return f"{type(self).__name__}({fields}{more})"
+
+
+def nested(decode: Callable[[Dict[str, Any]], Any], value: Optional[Dict[str, Any]]) -> Any:
+    """Decode an optional nested object."""
+    return None if value is None else decode(value)
+
+
+def nested_list(decode: Callable[[Dict[str, Any]], Any], values: Optional[List[Dict[str, Any]]]) -> Any:
+    """Decode an optional list of nested objects."""
+    return None if values is None else [decode(value) for value in values]
+
+
+def float_array(values: Optional[List[Optional[float]]]) -> Optional[array]:
+    """Pack a numeric series into array("d"), with NaN standing in for null samples."""
+    if values is None:
+        return None
+    try:
+        return array("d", values)
+    except TypeError:
+        return array("d", [math.nan if value is None else value for value in values])
+
+
+class Collection(NamedTuple):
+    """A document collection under /v2/usercollection."""
+
+    name: str
+    record: Type[Record]
+    # Query parameters the list endpoint takes: "date" (start_date/end_date),
+    # "datetime" (start_datetime/end_datetime) or "none"
+    query: str
+    # Whether /usercollection/<name>/{document_id} exists
+    single: bool
+
+    def params(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, str]:
+        """Query parameters for a range on this collection's list endpoint."""
+        if self.query == "none":
+            return {}
+        return {f"start_{self.query}": start, f"end_{self.query}": end}
@@ -0,0 +1,315 @@
+"""Local SQLite store of Oura documents with incremental sync."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from utils import fast_json
+
+logger = logging.getLogger("OuraBot.Store")
+
+
+def _document_day(document: Dict[str, Any]) -> Optional[str]:
+    """Return the ISO day a document belongs to."""
+    if document.get("day"):
+        return document["day"]
+    for key in ("start_day", "timestamp", "start_datetime", "bedtime_start"):
+        if document.get(key):
+            return document[key][:10]
+    return None
+
+
+def _document_id(collection: str, document: Dict[str, Any]) -> Optional[str]:
+    """Return a document's id, or a per-day id for documents that have none."""
+    if document.get("id"):
+        return document["id"]
+    day = _document_day(document)
+    return f"{collection}:{day}" if day else None
+
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """ISO days in [start_date, end_date)."""
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days)]
+
+
+def _contiguous_runs(days: List[str]) -> List[Tuple[str, str]]:
+    """Group sorted ISO days into [start, end) ranges of consecutive days."""
+    runs = []
+    for day in sorted(days):
+        current = date.fromisoformat(day)
+        if runs and date.fromisoformat(runs[-1][1]) == current:
+            runs[-1] = (runs[-1][0], (current + timedelta(days=1)).isoformat())
+        else:
+            runs.append((day, (current + timedelta(days=1)).isoformat()))
+    return runs
+
+
+class OuraStore:
+    """On-disk store of Oura documents keyed by collection, day and document id."""
+
+    def __init__(self, db_path: str = "oura_data.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    collection TEXT NOT NULL,
+                    day TEXT,
+                    id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (collection, id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_documents_day ON documents (collection, day);
+
+                CREATE TABLE IF NOT EXISTS synced_days (
+                    collection TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (collection, day)
+                );
+
+                CREATE TABLE IF NOT EXISTS reports (
+                    day TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                );
+            """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "OuraStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert_documents(self, collection: str, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace documents. Returns the number written.
+
+        Documents without a day are skipped, since no date range query
+        could ever read them back.
+        """
+        rows = [
+            (collection, _document_day(doc), _document_id(collection, doc), fast_json.dumps(doc))
+            for doc in documents
+            if _document_day(doc)
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO documents (collection, day, id, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def mark_synced(self, collection: str, days: Iterable[str], synced_at: Optional[float] = None):
+        """Record that these days have been fetched for a collection."""
+        synced_at = synced_at or time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO synced_days (collection, day, synced_at) VALUES (?, ?, ?)",
+                [(collection, day, synced_at) for day in days],
+            )
+
+    def forget_synced(self, collection: str, start_date: str, end_date: str):
+        """Mark days in [start_date, end_date) as unsynced so the next sync re-fetches them."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM synced_days WHERE collection = ? AND day >= ? AND day < ?",
+                (collection, start_date, end_date),
+            )
+
+    def synced_days(self, collection: str, start_date: str, end_date: str) -> Dict[str, float]:
+        """Map of day -> last sync time for days in [start_date, end_date)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT day, synced_at FROM synced_days WHERE collection = ? AND day >= ? AND day < ?",
+                (collection, start_date, end_date),
+            ).fetchall()
+        return dict(rows)
+
+    def get_documents(self, collection: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Documents of a collection whose day is in [start_date, end_date)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND day >= ? AND day < ? ORDER BY day",
+                (collection, start_date, end_date),
+            ).fetchall()
+        return [fast_json.loads(row[0]) for row in rows]
+
+    def latest_document(self, collection: str) -> Optional[Dict[str, Any]]:
+        """The collection's most recent document, or None if it has none."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM documents WHERE collection = ? ORDER BY day DESC LIMIT 1", (collection,)
+            ).fetchone()
+        return fast_json.loads(row[0]) if row else None
+
+    def get_report(self, day: str) -> Optional[Dict[str, Any]]:
+        """The rendered report for a day, with its fingerprint and send time, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fingerprint, text, created_at, sent_at FROM reports WHERE day = ?", (day,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"day": day, "fingerprint": row[0], "text": row[1], "created_at": row[2], "sent_at": row[3]}
+
+    def save_report(self, day: str, fingerprint: str, text: str):
+        """Store (or replace) the rendered report for a day, as not yet sent."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports (day, fingerprint, text, created_at, sent_at) VALUES (?, ?, ?, ?, NULL)",
+                (day, fingerprint, text, time.time()),
+            )
+
+    def mark_report_sent(self, day: str):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE reports SET sent_at = ? WHERE day = ?", (time.time(), day))
+
+
+class OuraSync:
+    """Incrementally syncs Oura collections into an OuraStore."""
+
+    def __init__(
+        self,
+        client,
+        store: OuraStore,
+        trailing_days: int = 2,
+        refresh_after: float = 15 * 60,
+        today: Optional[date] = None,
+    ):
+        """
+        Initialize the sync engine.
+
+        Args:
+            client: OuraClient used for fetching
+            store: Local document store
+            trailing_days: Recent days re-fetched to pick up late ring syncs
+            refresh_after: Seconds before a trailing day is considered stale
+            today: The user's current date (defaults to the server's), which
+                the trailing window is counted back from
+        """
+        self.client = client
+        self.store = store
+        self.trailing_days = trailing_days
+        self.refresh_after = refresh_after
+        self.today = today
+
+    def _trailing_start(self) -> str:
+        today = self.today or datetime.now().date()
+        return (today - timedelta(days=self.trailing_days)).isoformat()
+
+    def _days_to_mark(self, run_start: str, run_end: str, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Days of a fetched run to record as synced. Recent days that came back
+        empty stay unsynced, so data the ring uploads later is fetched on the
+        very next sync rather than after `refresh_after`. A run with documents
+        the store had to skip is not marked at all, so it is fetched again.
+        """
+        with_data = {_document_day(doc) for doc in documents}
+        if None in with_data:
+            logger.warning(f"Skipped documents without a day in {run_start}..{run_end}; leaving the run unsynced.")
+            return []
+        trailing_start = self._trailing_start()
+        return [day for day in _date_range(run_start, run_end) if day in with_data or day < trailing_start]
+
+    def _days_to_fetch(self, collection: str, start_date: str, end_date: str) -> List[str]:
+        synced = self.store.synced_days(collection, start_date, end_date)
+        trailing_start = self._trailing_start()
+        stale_before = time.time() - self.refresh_after
+
+        missing = []
+        for day in _date_range(start_date, end_date):
+            synced_at = synced.get(day)
+            if synced_at is None:
+                missing.append(day)
+            elif day >= trailing_start and synced_at < stale_before:
+                missing.append(day)
+        return missing
+
+    def sync_collection(self, collection: str, start_date: str, end_date: str) -> int:
+        """Fetch the days of a collection not yet stored. Returns documents written."""
+        endpoint = f"/usercollection/{collection}"
+        written = 0
+        for run_start, run_end in _contiguous_runs(self._days_to_fetch(collection, start_date, end_date)):
+            documents = list(self.client.iter_collection(endpoint, run_start, run_end))
+            written += self.store.upsert_documents(collection, documents)
+            self.store.mark_synced(collection, self._days_to_mark(run_start, run_end, documents))
+        return written
+
+    def sync(
+        self,
+        start_date: str,
+        end_date: str,
+        collections: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Sync collections concurrently, then read them back from the store.
+
+        Returns a dict keyed by collection name, shaped like OuraClient.get_collections().
+        """
+        collections = list(collections or self.client.DAILY_COLLECTIONS)
+        workers = max(1, min(self.client.max_workers, len(collections)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.sync_collection, name, start_date, end_date)
+                for name in collections
+            ]
+            for future in futures:
+                future.result()
+
+        return self.load(start_date, end_date, collections)
+
+    def load(self, start_date: str, end_date: str, collections: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Read collections from the local store without touching the API."""
+        return {
+            name: {"data": self.store.get_documents(name, start_date, end_date), "next_token": None}
+            for name in collections
+        }
+
+
+class AsyncOuraSync(OuraSync):
+    """
+    OuraSync for an AsyncOuraClient: sync_collection() and sync() are coroutines.
+
+    Collections are fetched concurrently on the event loop; SQLite reads
+    and writes run on worker threads so they never block it.
+    """
+
+    async def sync_collection(self, collection: str, start_date: str, end_date: str) -> int:
+        endpoint = f"/usercollection/{collection}"
+        days = await asyncio.to_thread(self._days_to_fetch, collection, start_date, end_date)
+        written = 0
+        for run_start, run_end in _contiguous_runs(days):
+            documents = [doc async for doc in self.client.iter_collection(endpoint, run_start, run_end)]
+            written += await asyncio.to_thread(self.store.upsert_documents, collection, documents)
+            await asyncio.to_thread(self.store.mark_synced, collection, self._days_to_mark(run_start, run_end, documents))
+        return written
+
+    async def sync(
+        self,
+        start_date: str,
+        end_date: str,
+        collections: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        collections = list(collections or self.client.DAILY_COLLECTIONS)
+        await asyncio.gather(*(self.sync_collection(name, start_date, end_date) for name in collections))
+        return await asyncio.to_thread(self.load, start_date, end_date, collections)
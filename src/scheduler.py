@@ -0,0 +1,156 @@
+"""Event-driven job scheduler: a heap of next-fire times in each job's own timezone."""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timedelta, tzinfo
+from datetime import time as dtime
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# A fixed zone, or a callable returning the current one (None means local time)
+Zone = Union[tzinfo, Callable[[], Optional[tzinfo]], None]
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def parse_time(at: str) -> dtime:
+    """Parse "HH:MM" or "HH:MM:SS"; raises ValueError otherwise."""
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            return datetime.strptime(at, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid time {at!r}, expected HH:MM")
+
+
+class _Entry:
+    """One scheduled job: either a wall-clock time of day (optionally one weekday) or a fixed interval."""
+
+    __slots__ = ("fn", "name", "at", "tz", "weekday", "offset", "interval", "slot")
+
+    def __init__(self, fn: Callable[[], Any], name: str, at: Optional[dtime] = None, tz: Zone = None,
+                 weekday: Optional[int] = None, offset: float = 0.0, interval: Optional[float] = None):
+        self.fn = fn
+        self.name = name
+        self.at = at
+        self.tz = tz
+        self.weekday = weekday
+        self.offset = offset
+        self.interval = interval
+        # Undisturbed (un-jittered) time of the current run, so jitter never drifts the schedule
+        self.slot = 0.0
+
+    def next_slot(self, after: float) -> float:
+        """First run time strictly after `after` (a UNIX timestamp)."""
+        if self.interval is not None:
+            return after + self.interval
+        # Resolved on every run, so a zone that changes (or becomes known) takes effect
+        tz = self.tz() if callable(self.tz) else self.tz
+        # Work in the job's local time, so "08:00" stays 08:00 across DST changes
+        day = datetime.fromtimestamp(after - self.offset, tz).date()
+        while True:
+            if self.weekday is None or day.weekday() == self.weekday:
+                slot = datetime.combine(day, self.at, tzinfo=tz).timestamp() + self.offset
+                if slot > after:
+                    return slot
+            day += timedelta(days=1)
+
+
+class Scheduler:
+    """
+    Runs jobs at their next fire time, kept in a min-heap.
+
+    The run loop sleeps until the earliest deadline (re-checking at least
+    every `max_wait` seconds, in case the wall clock jumps) and hands due
+    jobs to `submit`, so a slow job never delays the others. Daily jobs
+    are resolved in their own timezone; each run is delayed by a random
+    0..`jitter` seconds so jobs that share a time don't all fire at once.
+    """
+
+    def __init__(self, submit: Callable[[Callable[[], Any]], Any], jitter: float = 0.0,
+                 max_wait: float = 60.0, rng: Optional[random.Random] = None):
+        self.submit = submit
+        self.jitter = jitter
+        self.max_wait = max_wait
+        self.rng = rng or random.Random()
+        self._heap: List[Tuple[float, int, _Entry]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, entry: _Entry, fire_at: float):
+        with self._lock:
+            heapq.heappush(self._heap, (fire_at, next(self._counter), entry))
+
+    def _jittered(self, slot: float) -> float:
+        return slot + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def daily(self, at: str, fn: Callable[[], Any], tz: Zone = None, offset: float = 0.0,
+              weekday: Optional[str] = None, name: str = "") -> float:
+        """
+        Run `fn` every day (or every `weekday`) at `at` in `tz` (local time if None),
+        shifted by `offset` seconds (negative to run before `at`). `tz` may be
+        a callable, looked up again for each run. Returns the first run time.
+        """
+        entry = _Entry(
+            fn, name or getattr(fn, "__name__", "job"), at=parse_time(at), tz=tz,
+            weekday=WEEKDAYS.index(weekday.lower()) if weekday else None, offset=offset,
+        )
+        entry.slot = entry.next_slot(time.time())
+        fire_at = self._jittered(entry.slot)
+        self._push(entry, fire_at)
+        return fire_at
+
+    def every(self, seconds: float, fn: Callable[[], Any], first_in: Optional[float] = None, name: str = "") -> float:
+        """
+        Run `fn` every `seconds`, first after `first_in` seconds (a random point
+        in the first interval by default, so many such jobs spread out).
+        """
+        entry = _Entry(fn, name or getattr(fn, "__name__", "job"), interval=seconds)
+        delay = self.rng.uniform(0, seconds) if first_in is None else first_in
+        entry.slot = time.time() + delay
+        self._push(entry, entry.slot)
+        return entry.slot
+
+    def next_deadline(self) -> Optional[float]:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Submit every job that is due and schedule its next run. Returns the number submitted."""
+        now = time.time() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+            for entry in due:
+                # Skip runs missed while asleep rather than firing them all at once
+                entry.slot = entry.next_slot(max(entry.slot, now))
+                fire_at = entry.slot if entry.interval is not None else self._jittered(entry.slot)
+                heapq.heappush(self._heap, (fire_at, next(self._counter), entry))
+        for entry in due:
+            self.submit(entry.fn)
+        return len(due)
+
+    def _wait_time(self) -> float:
+        deadline = self.next_deadline()
+        if deadline is None:
+            return self.max_wait
+        return min(self.max_wait, max(0.0, deadline - time.time()))
+
+    def run(self, stop: threading.Event):
+        """Run jobs until `stop` is set (meant for a background thread)."""
+        while not stop.is_set():
+            self.run_pending()
+            stop.wait(self._wait_time())
+
+    async def run_async(self):
+        """Event-loop counterpart of run(); runs until cancelled."""
+        while True:
+            self.run_pending()
+            await asyncio.sleep(self._wait_time())
@@ -0,0 +1,71 @@
+"""Deterministic Stats report rendered straight from the compact daily features."""
+
+import html
+from typing import Any, Dict, List, Optional
+
+# Shown under the Stats when the AI part is still coming, or didn't come at all
+PENDING_NOTE = "<i>⏳ Insights on the way…</i>"
+UNAVAILABLE_NOTE = "<i>AI insights are unavailable right now; these are your raw stats.</i>"
+
+
+def _join(parts: List[Optional[str]]) -> Optional[str]:
+    parts = [part for part in parts if part]
+    return "• " + " • ".join(parts) if parts else None
+
+
+def _signed(value: float) -> str:
+    return f"{value:+.1f}"
+
+
+def render_stats(compact: List[Dict[str, Any]], note: str = "") -> str:
+    """
+    The <b>Stats</b> section of a summary for the latest day in `compact`
+    (AISummarizer's per-day feature dicts), in the same HTML as the AI
+    summaries, with an optional italic `note` underneath.
+    """
+    day = compact[-1] if compact else {}
+    get = day.get
+
+    sleep = None
+    if get("sleep_score") is not None:
+        details = [
+            f"{get('total_sleep_h')}h" if get("total_sleep_h") is not None else None,
+            f"deep {get('deep_sleep_min')}m" if get("deep_sleep_min") is not None else None,
+            f"REM {get('rem_sleep_min')}m" if get("rem_sleep_min") is not None else None,
+            f"eff {get('sleep_efficiency')}%" if get("sleep_efficiency") is not None else None,
+        ]
+        details = ", ".join(d for d in details if d)
+        sleep = f"Sleep {get('sleep_score')}" + (f" ({details})" if details else "")
+
+    lines = [
+        _join([
+            sleep,
+            f"Readiness {get('readiness_score')}" if get("readiness_score") is not None else None,
+            f"Activity {get('activity_score')}" if get("activity_score") is not None else None,
+        ]),
+        _join([
+            f"HRV {get('hrv_ms')} ms" if get("hrv_ms") is not None else None,
+            f"RHR {get('rhr_bpm')} bpm" if get("rhr_bpm") is not None else None,
+            f"Temp {_signed(get('temp_deviation_c'))}°C" if get("temp_deviation_c") is not None else None,
+        ]),
+        _join([
+            f"Steps {get('steps'):,}" if get("steps") is not None else None,
+            f"Active {get('active_calories')} kcal" if get("active_calories") is not None else None,
+            f"SpO2 {get('spo2_avg')}%" if get("spo2_avg") is not None else None,
+        ]),
+        _join([
+            f"Stress {get('stress_high_min')}m" if get("stress_high_min") is not None else None,
+            f"Recovery {get('recovery_high_min')}m" if get("recovery_high_min") is not None else None,
+            f"Day: {html.escape(get('stress_summary'))}" if get("stress_summary") else None,
+        ]),
+    ]
+    if get("workout_count"):
+        activities = ", ".join(html.escape(a) for a in get("workout_activities") or [])
+        lines.append(
+            f"• Workouts {get('workout_count')} ({get('workout_min')} min"
+            + (f", {activities}" if activities else "") + ")"
+        )
+
+    body = [line for line in lines if line] or ["• No metrics recorded yet."]
+    title = f"<b>Stats</b> <i>{get('day')}</i>" if get("day") else "<b>Stats</b>"
+    return "\n".join([title, *body] + ([note] if note else []))
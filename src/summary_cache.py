@@ -0,0 +1,95 @@
+"""Content-addressed, persistent cache for AI summaries."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils import metrics
+
+
+class SummaryCache:
+    """
+    LRU cache of generated summaries keyed by a hash of the input data.
+
+    Entries expire after `ttl` seconds and the least recently used entries
+    are evicted beyond `max_entries`. The cache is written to `path` after
+    every change so it survives restarts.
+    """
+
+    def __init__(self, path: str = "summary_cache.json", max_entries: int = 256, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._load()
+
+    @staticmethod
+    def make_key(data: Any, model: str, prompt_version: str) -> str:
+        """Stable hash of the normalized input data, model and prompt version."""
+        normalized = json.dumps(
+            {"data": data, "model": model, "prompt_version": prompt_version},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry["created_at"] < self.ttl:
+                self._entries[key] = entry
+
+    def _save(self):
+        # Write-then-rename so a crash never leaves a truncated cache file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def reserve(self, entries: int):
+        """Raise max_entries to at least `entries` (it is never lowered)."""
+        with self._lock:
+            self.max_entries = max(self.max_entries, entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.inc("summary_cache_misses_total")
+                return None
+            if time.time() - entry["created_at"] >= self.ttl:
+                del self._entries[key]
+                self._save()
+                metrics.inc("summary_cache_misses_total")
+                return None
+            self._entries.move_to_end(key)
+            metrics.inc("summary_cache_hits_total")
+            return entry["value"]
+
+    def set(self, key: str, value: str):
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, str]):
+        """Store several values with a single write of the cache file."""
+        with self._lock:
+            now = time.time()
+            for key, value in items.items():
+                self._entries[key] = {"value": value, "created_at": now}
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
@@ -0,0 +1,162 @@
+"""Columnar on-disk storage for high-resolution Oura time series."""
+
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# Per-beat / 5-minute heart rate from /usercollection/heartrate
+HEARTRATE_DTYPE = np.dtype([("ts", "<i8"), ("bpm", "u1"), ("source", "u1")])
+HEARTRATE_SOURCES = ("awake", "rest", "sleep", "session", "live", "workout")
+
+# Regularly sampled series from sleep documents (heart_rate, hrv)
+SAMPLE_DTYPE = np.dtype([("ts", "<i8"), ("value", "<f4")])
+
+SECONDS_PER_DAY = 86400
+
+
+def _epoch(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+
+def _utc_day(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+
+
+class TimeSeriesStore:
+    """
+    One sorted, typed .npy file per series per UTC day.
+
+    Reads memory-map the files, so range queries return views into the
+    page cache instead of parsing or copying anything.
+    """
+
+    def __init__(self, root: str = "timeseries"):
+        self.root = root
+
+    def _path(self, series: str, day: str) -> str:
+        return os.path.join(self.root, series, f"{day}.npy")
+
+    def write_day(self, series: str, day: str, samples: np.ndarray):
+        """Merge samples into a day's file, keeping it sorted and de-duplicated by timestamp."""
+        path = self._path(series, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            samples = np.concatenate([np.load(path), samples])
+
+        # Keep the newest sample for each timestamp
+        order = np.argsort(samples["ts"], kind="stable")
+        samples = samples[order]
+        keep = np.append(samples["ts"][1:] != samples["ts"][:-1], True)
+        samples = samples[keep]
+
+        # A unique temp file per writer, so concurrent writes can't clobber each other's
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{day}.", suffix=".tmp.npy")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, samples)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_by_day(self, series: str, samples: np.ndarray) -> int:
+        if not len(samples):
+            return 0
+        days = samples["ts"] // SECONDS_PER_DAY
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(samples, boundaries):
+            self.write_day(series, _utc_day(int(chunk["ts"][0])), chunk)
+        return len(samples)
+
+    def day_view(self, series: str, day: str) -> Optional[np.ndarray]:
+        """Memory-mapped, read-only view of one day, or None if nothing is stored."""
+        path = self._path(series, day)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def range_views(self, series: str, start: datetime, end: datetime) -> List[np.ndarray]:
+        """
+        Zero-copy views covering [start, end), one per stored day.
+
+        Each view is a slice of a memory-mapped file; use np.concatenate()
+        if a single contiguous (copied) array is needed.
+        """
+        start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+        views = []
+        day = datetime.fromtimestamp(start_ts, tz=timezone.utc).date()
+        last_day = datetime.fromtimestamp(max(start_ts, end_ts - 1), tz=timezone.utc).date()
+        while day <= last_day:
+            view = self.day_view(series, day.isoformat())
+            if view is not None and len(view):
+                ts = view["ts"]
+                lo, hi = np.searchsorted(ts, [start_ts, end_ts])
+                if hi > lo:
+                    views.append(view[lo:hi])
+            day += timedelta(days=1)
+        return views
+
+    def ingest_heartrate(self, client, start_date: str, end_date: str, chunk_days: int = 7) -> int:
+        """
+        Stream /heartrate samples for [start_date, end_date) into per-day files.
+
+        Samples are buffered for at most one UTC day before being written,
+        so memory stays flat however long the range is. Returns samples written.
+        """
+        written = 0
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+
+        while start < end:
+            chunk_end = min(start + timedelta(days=chunk_days), end)
+            written += self.ingest_heartrate_samples(
+                client.iter_heartrate(f"{start}T00:00:00+00:00", f"{chunk_end}T00:00:00+00:00")
+            )
+            start = chunk_end
+        return written
+
+    def ingest_heartrate_samples(self, samples: Iterable[Dict[str, Any]]) -> int:
+        """Write time-ordered /heartrate samples to per-day files, one UTC day at a time."""
+        source_codes = {name: i for i, name in enumerate(HEARTRATE_SOURCES)}
+        written = 0
+        buffer: List[tuple] = []
+        current_day = None
+        for sample in samples:
+            ts = _epoch(sample["timestamp"])
+            day = ts // SECONDS_PER_DAY
+            if current_day is not None and day != current_day and buffer:
+                written += self._write_by_day("heartrate", np.array(buffer, dtype=HEARTRATE_DTYPE))
+                buffer = []
+            current_day = day
+            buffer.append((ts, sample["bpm"], source_codes.get(sample.get("source"), 255)))
+        if buffer:
+            written += self._write_by_day("heartrate", np.array(buffer, dtype=HEARTRATE_DTYPE))
+        return written
+
+    def ingest_sleep_samples(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Store the heart_rate and hrv samples of detailed sleep documents as sleep_hr / sleep_hrv."""
+        written = 0
+        for doc in documents:
+            for field, series in (("heart_rate", "sleep_hr"), ("hrv", "sleep_hrv")):
+                sample = doc.get(field)
+                if not sample or not sample.get("items"):
+                    continue
+                items = np.array([np.nan if v is None else v for v in sample["items"]], dtype="<f4")
+                start_ts = _epoch(sample["timestamp"])
+                ts = start_ts + (np.arange(len(items)) * sample["interval"]).astype("<i8")
+                samples = np.empty(len(items), dtype=SAMPLE_DTYPE)
+                samples["ts"] = ts
+                samples["value"] = items
+                written += self._write_by_day(series, samples)
+        return written
+
+    def iter_days(self, series: str) -> Iterator[str]:
+        """Stored days for a series, in order."""
+        directory = os.path.join(self.root, series)
+        if not os.path.isdir(directory):
+            return iter(())
+        return iter(sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npy") and ".tmp" not in name))
@@ -0,0 +1,51 @@
+"""Registry of bot users for multi-tenant mode."""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class UserConfig:
+    """One person served by the bot: their Oura tokens, chat and schedule."""
+
+    name: str
+    chat_id: str
+    token_file: str = "oura_tokens.json"
+    time: str = "08:00"
+    db_path: str = "oura_data.db"
+    # IANA name (e.g. "Europe/Berlin"); empty to infer it from the user's Oura data
+    timezone: str = ""
+
+
+def default_user() -> UserConfig:
+    """The single user configured through .env (the classic setup)."""
+    return UserConfig(
+        name="default",
+        chat_id=os.getenv("TELEGRAM_CHAT_ID", ""),
+        db_path=os.getenv("OURA_DB_PATH", "oura_data.db"),
+        timezone=os.getenv("TIMEZONE", ""),
+    )
+
+
+def load_users(path: str) -> List[UserConfig]:
+    """
+    Load users from a JSON file.
+
+    Format: [{"name": "alice", "chat_id": "123", "token_file": "tokens/alice.json", "time": "07:30",
+              "timezone": "Europe/Berlin"}, ...]
+    """
+    with open(path, "r") as f:
+        entries = json.load(f)
+
+    users = []
+    for entry in entries:
+        entry = {k: str(v) for k, v in entry.items()}
+        # Each user gets their own document store unless one is given
+        entry.setdefault("db_path", f"oura_data_{entry['name']}.db")
+        users.append(UserConfig(**entry))
+    names = [user.name for user in users]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate user names in {path}")
+    return users
@@ -0,0 +1,93 @@
+"""Asyncio counterpart of http_transport: pooled httpx client, retries, rate limiting."""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+import httpx
+
+from utils import metrics
+from utils.http_transport import backoff_delay, retry_after_seconds, should_retry
+from utils.upstream_limits import async_upstream
+
+# Same (connect, read) budget as the sync transport
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+
+def build_async_client(max_connections: int = 100) -> httpx.AsyncClient:
+    """Create an AsyncClient whose keep-alive pool is shared by all tasks using it."""
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(limits=limits, timeout=DEFAULT_TIMEOUT)
+
+
+class AsyncTokenBucket:
+    """Token bucket for coroutines: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available, then take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                # Waiters queue on the lock, so they are served in order
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+async def request_with_retry_async(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    max_retries: int = 4,
+    limiter: Optional[AsyncTokenBucket] = None,
+    upstream_name: Optional[str] = None,
+    timeout: Any = DEFAULT_TIMEOUT,
+    retry_unsafe: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request, retrying network errors, 429 and 5xx responses.
+
+    Same policy as http_transport.request_with_retry(): POST is only
+    retried when it never reached the server unless `retry_unsafe`, and
+    Retry-After and Telegram's retry_after are honored, otherwise backoff
+    with jitter. The final response is returned without raise_for_status().
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            if upstream_name:
+                async with async_upstream(upstream_name):
+                    response = await client.request(method, url, timeout=timeout, **kwargs)
+            else:
+                response = await client.request(method, url, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            # Only a failed connect certainly never reached the server (http_transport.connect_failed())
+            unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+            if attempt >= max_retries or not should_retry(method, unsent=unsent, retry_unsafe=retry_unsafe):
+                raise
+            metrics.inc("http_retries_total", upstream=upstream_name, reason="network")
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        if attempt >= max_retries or not should_retry(method, response.status_code, retry_unsafe=retry_unsafe):
+            return response
+
+        metrics.inc("http_retries_total", upstream=upstream_name, reason=response.status_code)
+        delay = retry_after_seconds(response)
+        await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+        attempt += 1
@@ -0,0 +1,162 @@
+"""Asyncio variant of TelegramNotifier built on httpx."""
+
+import asyncio
+import os
+import weakref
+from typing import Optional, Callable, AsyncIterable, Collection
+
+import httpx
+
+from utils import metrics
+from utils.async_http import AsyncTokenBucket, build_async_client, request_with_retry_async
+from utils.html_utils import split_html
+from utils.telegram_notifier import StreamedMessage, TelegramBase
+
+# Telegram's ~30 messages/second per bot, shared by every notifier on an event loop
+_global_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTokenBucket]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _global_limiter() -> AsyncTokenBucket:
+    loop = asyncio.get_running_loop()
+    limiter = _global_limiters.get(loop)
+    if limiter is None:
+        limiter = _global_limiters[loop] = AsyncTokenBucket(rate=30, capacity=30)
+    return limiter
+
+
+class AsyncTelegramNotifier(TelegramBase):
+    """Async Telegram messaging with the same behaviour as TelegramNotifier."""
+
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        client: Optional[httpx.AsyncClient] = None,
+        verbose: bool = False,
+        logger: Optional[Callable[[str], None]] = None,
+        api_url: Optional[str] = None,
+    ):
+        """
+        Initialize the notifier.
+
+        Args:
+            bot_token: Telegram bot token
+            chat_id: Telegram chat ID
+            client: Optional shared httpx AsyncClient (closed by the caller)
+            verbose: Enable verbose logging
+            logger: Optional logging function
+            api_url: Bot API host (defaults to TELEGRAM_API_URL or api.telegram.org)
+        """
+        self.bot_token = bot_token
+        self.api_url = api_url or os.getenv("TELEGRAM_API_URL", self.API_URL)
+        self.chat_id = chat_id
+        self.http = client or build_async_client()
+        self._owns_client = client is None
+        self.verbose = verbose
+        self.logger = logger or (lambda msg: print(msg) if verbose else None)
+        self.enabled = bool(bot_token and chat_id)
+        self.last_update_id = None
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.http.aclose()
+
+    async def _post(self, method: str, payload: dict, retry_unsafe: bool = False) -> httpx.Response:
+        with metrics.span("telegram_request", method=method) as span:
+            response = await request_with_retry_async(
+                self.http, "POST", self._method_url(method), json=payload, limiter=_global_limiter(),
+                upstream_name="telegram", timeout=10, retry_unsafe=retry_unsafe,
+            )
+            span.labels["status"] = response.status_code
+        return response
+
+    async def deliver(self, text: str, chat_id: Optional[str] = None) -> httpx.Response:
+        """Send one message (at most 4096 characters) and return the raw response."""
+        return await self._post("sendMessage", self._message_payload(text, chat_id))
+
+    async def send_message(
+        self,
+        text: str,
+        chat_id: Optional[str] = None,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> Optional[int]:
+        """
+        Send message, split at tag boundaries if too long; returns the first message ID.
+
+        As in TelegramNotifier.send_message(), the parts from the first failed
+        one on are passed to `on_failure`.
+        """
+        if not self.enabled:
+            return None
+
+        parts = split_html(text.replace("<br>", "\n"))
+        first_id = None
+        for i, part in enumerate(parts):
+            try:
+                response = await self.deliver(part, chat_id)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                self.logger(f"[TELEGRAM ERROR] Failed to send message: {e}")
+                self._unsent(parts[i:], on_failure)
+                return first_id
+            first_id = first_id or response.json().get("result", {}).get("message_id")
+        return first_id
+
+    async def update_message(self, message_id: int, text: str) -> bool:
+        """Update existing message."""
+        if not self.enabled:
+            return False
+        try:
+            response = await self._post(
+                "editMessageText", self._message_payload(text, message_id=message_id), retry_unsafe=True
+            )
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            self.logger(f"[TELEGRAM ERROR] Network error updating message {message_id}: {e}")
+            return False
+
+    async def stream_message(
+        self,
+        chunks: AsyncIterable[str],
+        placeholder: str = "⏳ Generating summary...",
+        min_interval: float = 1.5,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Async counterpart of TelegramNotifier.stream_message()."""
+        message_id = await self.send_message(placeholder)
+        stream = StreamedMessage(min_interval)
+        async for chunk in chunks:
+            edit = stream.feed(chunk)
+            if edit and message_id is not None:
+                await self.update_message(message_id, edit)
+
+        parts = stream.parts()
+        if message_id is not None and await self.update_message(message_id, parts[0]):
+            if len(parts) > 1:
+                await self.send_message("\n".join(parts[1:]), on_failure=on_failure)
+        else:
+            await self.send_message(stream.text, on_failure=on_failure)
+        return stream.text
+
+    async def get_chat_updates(self, timeout: int = 30, chat_ids: Optional[Collection[str]] = None) -> list[tuple[str, str]]:
+        """Long-poll for new messages, returning (chat_id, text) pairs from `chat_ids`."""
+        if not self.enabled:
+            return []
+        chat_ids = chat_ids or {self.chat_id}
+
+        try:
+            # Allow the HTTP request to outlive the server-side poll
+            response = await self.http.get(
+                self._method_url("getUpdates"), params=self._updates_params(timeout), timeout=timeout + 10
+            )
+            response.raise_for_status()
+            return self._read_updates(response.json().get("result", []), chat_ids)
+
+        except Exception as e:
+            self.logger(f"[TELEGRAM ERROR] Failed to get updates: {e}")
+            # Back off so an outage doesn't turn long polling into a busy loop
+            await asyncio.sleep(min(timeout, 5))
+            return []
@@ -0,0 +1,99 @@
+"""Helpers for keeping Telegram HTML valid."""
+
+import re
+from typing import List, Tuple
+
+_TAG_RE = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+# Telegram's maximum message length
+MAX_MESSAGE_LENGTH = 4096
+
+
+def _open_tags(text: str) -> List[Tuple[str, str]]:
+    """(name, opening tag) for every tag still open at the end of `text`."""
+    open_tags = []
+    for match in _TAG_RE.finditer(text):
+        closing, name = match.group(1), match.group(2).lower()
+        if not closing:
+            open_tags.append((name, match.group(0)))
+        elif name in [open_name for open_name, _ in open_tags]:
+            # Drop the most recent matching tag (and anything unclosed inside it)
+            index = max(i for i, (open_name, _) in enumerate(open_tags) if open_name == name)
+            del open_tags[index:]
+    return open_tags
+
+
+def _closing_tags(open_tags: List[Tuple[str, str]]) -> str:
+    return "".join(f"</{name}>" for name, _ in reversed(open_tags))
+
+
+def _safe_cut(text: str, cut: int) -> int:
+    """Move `cut` back so it doesn't fall inside a tag or an entity."""
+    last_lt = text.rfind("<", 0, cut)
+    if last_lt > text.rfind(">", 0, cut):
+        cut = last_lt
+    last_amp = text.rfind("&", 0, cut)
+    if last_amp != -1 and re.fullmatch(r"&#?\w*", text[last_amp:cut]):
+        cut = last_amp
+    return cut
+
+
+def close_partial_html(text: str) -> str:
+    """
+    Make a prefix of an HTML message safe to send to Telegram.
+
+    Drops a trailing incomplete tag or entity and closes any tags left open.
+    """
+    text = text[:_safe_cut(text, len(text))] if ("<" in text or "&" in text) else text
+    return text + _closing_tags(_open_tags(text))
+
+
+def split_html(text: str, limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """
+    Split an HTML message into parts of at most `limit` characters.
+
+    Cuts prefer line breaks, then spaces, and never fall inside a tag or
+    entity. Tags open at a cut are closed at the end of the part and
+    reopened at the start of the next one, so every part is valid HTML.
+    If the open tags alone leave no room in a part (only with very long
+    tags or a tiny `limit`), the rest is sent without its tags.
+    """
+    parts = []
+    while len(text) > limit:
+        budget = limit
+        while True:
+            cut = _safe_cut(text, budget)
+            for separator in ("\n", " "):
+                boundary = text.rfind(separator, 0, cut)
+                # Don't accept a boundary that would make the part tiny
+                if boundary > budget // 2:
+                    cut = boundary
+                    break
+            open_tags = _open_tags(text[:cut])
+            part = text[:cut] + _closing_tags(open_tags)
+            if len(part) <= limit or budget <= 1:
+                break
+            budget = max(1, budget - (len(part) - limit))
+
+        reopen = "".join(tag for _, tag in open_tags)
+        if cut <= len(reopen):
+            # Nothing but carried-over tags fits: cut mid-word instead, back before
+            # any tag or entity, and close and reopen the open tags as usual
+            cut = _safe_cut(text, limit // 2)
+            open_tags = _open_tags(text[:cut])
+            part = text[:cut] + _closing_tags(open_tags)
+            reopen = "".join(tag for _, tag in open_tags)
+            if cut <= len(reopen) or len(part) > limit:
+                if _TAG_RE.search(text):
+                    # The tags alone don't fit in a part; send the rest as plain text
+                    text = _TAG_RE.sub("", text)
+                    continue
+                # An entity longer than the limit; cutting it is the only way on
+                cut = max(cut, limit // 2)
+                part, reopen = text[:cut], ""
+        if part.strip():
+            parts.append(part.rstrip())
+        text = reopen + text[cut:].lstrip("\n ")
+    if text.strip():
+        parts.append(text)
+    return parts
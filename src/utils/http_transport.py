@@ -0,0 +1,165 @@
+"""Shared HTTP transport: pooled sessions, retries with backoff, rate limiting."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from utils import metrics
+from utils.upstream_limits import upstream
+
+# (connect, read) timeout applied to every request unless overridden
+DEFAULT_TIMEOUT = (5, 30)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Methods that are safe to send twice; anything else (POST) is only retried when
+# the request certainly wasn't processed, unless the caller opts in with retry_unsafe
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def should_retry(method: str, status: Optional[int] = None, unsent: bool = False, retry_unsafe: bool = False) -> bool:
+    """
+    Whether a failed attempt may be sent again. `status` is the response
+    status, or None after a network error; `unsent` marks network errors
+    where the request never reached the server. 429s and unsent requests
+    are always retryable; 5xx and other network errors only for idempotent
+    methods, or with `retry_unsafe`.
+    """
+    if unsent or status == 429:
+        return True
+    if not (retry_unsafe or method.upper() in IDEMPOTENT_METHODS):
+        return False
+    return status is None or status in RETRY_STATUSES
+
+
+def connect_failed(error: requests.RequestException) -> bool:
+    """
+    True if no connection was made (connect timeout, refused, DNS failure),
+    so the server never saw the request. async_http applies the same rule
+    to httpx's ConnectError and ConnectTimeout.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # urllib3 wraps the cause in a MaxRetryError; NewConnectionError is a ConnectTimeoutError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def build_session(pool_maxsize: int = 10) -> requests.Session:
+    """
+    Create a session with a keep-alive connection pool of `pool_maxsize`.
+
+    Retries are handled by request_with_retry(), not urllib3, so that
+    Retry-After and Telegram's retry_after are honored consistently.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available, then take them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Server-requested delay from a Retry-After header or a Telegram retry_after field."""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    *,
+    max_retries: int = 4,
+    limiter: Optional[TokenBucket] = None,
+    upstream_name: Optional[str] = None,
+    timeout: Any = DEFAULT_TIMEOUT,
+    retry_unsafe: bool = False,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request, retrying network errors, 429 and 5xx responses.
+
+    Non-idempotent methods (POST) are only retried on 429 and when the
+    connection failed (see connect_failed()), where the server never acted
+    on them, so a message isn't sent twice; pass `retry_unsafe=True` when a repeat is harmless.
+    Waits for `limiter` before each attempt and holds an `upstream_name`
+    slot (see upstream_limits) while the request is in flight. Retries are
+    counted in the http_retries_total metric. The final
+    response is returned without raise_for_status(), so callers keep
+    their own handling of 401 and other client errors.
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            if upstream_name:
+                with upstream(upstream_name):
+                    response = session.request(method, url, timeout=timeout, **kwargs)
+            else:
+                response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # Only a failed connect certainly never reached the server
+            unsent = connect_failed(e)
+            if attempt >= max_retries or not should_retry(method, unsent=unsent, retry_unsafe=retry_unsafe):
+                raise
+            metrics.inc("http_retries_total", upstream=upstream_name, reason="network")
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        if attempt >= max_retries or not should_retry(method, response.status_code, retry_unsafe=retry_unsafe):
+            return response
+
+        metrics.inc("http_retries_total", upstream=upstream_name, reason=response.status_code)
+        delay = retry_after_seconds(response)
+        time.sleep(delay if delay is not None else backoff_delay(attempt))
+        attempt += 1
@@ -0,0 +1,166 @@
+"""Process-wide timers and counters, exported as Prometheus text or JSONL."""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_histograms: Dict[str, Dict[LabelKey, list]] = {}
+_jsonl_path: Optional[str] = None
+
+
+def configure(jsonl_path: Optional[str] = None):
+    """Also append every finished span as one JSON line to `jsonl_path`."""
+    global _jsonl_path
+    _jsonl_path = jsonl_path
+
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _write_event(event: Dict[str, object]):
+    if not _jsonl_path:
+        return
+    line = json.dumps(event, separators=(",", ":")) + "\n"
+    with _lock:
+        with open(_jsonl_path, "a") as f:
+            f.write(line)
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add `value` to a counter."""
+    key = _key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels):
+    """Record one duration in a histogram."""
+    key = _key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        # [bucket counts..., count, sum]
+        entry = series.setdefault(key, [0] * (len(BUCKETS) + 2))
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry[i] += 1
+        entry[-2] += 1
+        entry[-1] += seconds
+
+
+class Span:
+    """Timer for one block of work; `labels` can be added while it runs."""
+
+    def __init__(self, name: str, labels: Dict[str, object]):
+        self.name = name
+        self.labels = labels
+        self.seconds = 0.0
+
+
+@contextmanager
+def span(name: str, **labels):
+    """
+    Time the block as `<name>_seconds`; count exceptions in `<name>_failures_total`.
+
+    Labels set on the yielded Span before the block ends (e.g. a status
+    code) are included. The exception is re-raised.
+    """
+    current = Span(name, dict(labels))
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield current
+    except Exception:
+        ok = False
+        inc(f"{name}_failures_total", **current.labels)
+        raise
+    finally:
+        current.seconds = time.perf_counter() - started
+        observe(f"{name}_seconds", current.seconds, **current.labels)
+        _write_event({
+            "ts": round(time.time(), 3),
+            "span": name,
+            "seconds": round(current.seconds, 4),
+            "ok": ok,
+            **{k: v for k, v in current.labels.items() if v is not None},
+        })
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Counter totals and histogram count/sum, keyed by name then label string."""
+    def fmt(key: LabelKey) -> str:
+        return ",".join(f"{k}={v}" for k, v in key)
+
+    with _lock:
+        result = {name: {fmt(k): v for k, v in series.items()} for name, series in _counters.items()}
+        for name, series in _histograms.items():
+            result[f"{name}_count"] = {fmt(k): v[-2] for k, v in series.items()}
+            result[f"{name}_sum"] = {fmt(k): round(v[-1], 4) for k, v in series.items()}
+    return result
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    def labels_text(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    lines = []
+    with _lock:
+        for name in sorted(_counters):
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(_counters[name].items()):
+                lines.append(f"{name}{labels_text(key)} {value:g}")
+        for name in sorted(_histograms):
+            lines.append(f"# TYPE {name} histogram")
+            for key, entry in sorted(_histograms[name].items()):
+                for bound, count in zip(BUCKETS, entry):
+                    lines.append(f"{name}_bucket{labels_text(key, (('le', f'{bound:g}'),))} {count}")
+                lines.append(f"{name}_bucket{labels_text(key, (('le', '+Inf'),))} {entry[-2]}")
+                lines.append(f"{name}_count{labels_text(key)} {entry[-2]}")
+                lines.append(f"{name}_sum{labels_text(key)} {entry[-1]:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int, host: str = "") -> ThreadingHTTPServer:
+    """Serve /metrics for Prometheus in a background thread."""
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
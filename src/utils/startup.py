@@ -0,0 +1,40 @@
+"""Deferred imports and import-time accounting for fast cold starts."""
+
+import importlib
+import sys
+import threading
+import time
+from typing import Dict
+
+_timings: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def lazy_import(name: str):
+    """
+    Import a module on first use and record how long the import took.
+
+    Heavy dependencies (openai, numpy, httpx) go through this so runs
+    that never need them don't pay for them.
+    """
+    # Only trust sys.modules once the import has finished: another thread may
+    # still be executing the module body
+    if name in _timings:
+        return sys.modules[name]
+    with _lock:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        _timings.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+def record(name: str, seconds: float):
+    """Record an import cost measured elsewhere (e.g. a module's eager imports)."""
+    with _lock:
+        _timings[name] = seconds
+
+
+def report() -> Dict[str, float]:
+    """Recorded import times in seconds, in the order they happened."""
+    with _lock:
+        return dict(_timings)
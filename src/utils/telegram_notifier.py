@@ -1,10 +1,100 @@
 """Telegram notification handler."""
 
+import os
 import time
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable, Collection, List, Tuple
 import requests
 
-class TelegramNotifier:
+from utils import metrics
+from utils.html_utils import MAX_MESSAGE_LENGTH, close_partial_html, split_html
+from utils.http_transport import TokenBucket, build_session, request_with_retry
+
+# Telegram allows about 30 messages per second per bot, shared by all notifiers
+_global_limiter = TokenBucket(rate=30, capacity=30)
+
+
+class StreamedMessage:
+    """
+    Text of a message being streamed, and when to show it: stream_message()
+    feeds it chunks and makes the edits it asks for.
+
+    Edits are throttled to `min_interval` seconds to stay within Telegram's
+    edit rate limits, and each one is closed into valid HTML.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.text = ""
+        self._shown = ""
+        self._last_edit = time.monotonic()
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Add a chunk; returns the text to edit the message to, if an edit is due."""
+        self.text += chunk
+        if time.monotonic() - self._last_edit < self.min_interval:
+            return None
+        partial = close_partial_html(self.text)
+        # Past the length limit, leave the rest for the final delivery
+        if not partial.strip() or partial == self._shown or len(partial) >= MAX_MESSAGE_LENGTH - 2:
+            return None
+        self._shown = partial
+        self._last_edit = time.monotonic()
+        return partial + " …"
+
+    def parts(self) -> List[str]:
+        """The final text, split into messages."""
+        return split_html(self.text.replace("<br>", "\n")) or [self.text]
+
+
+class TelegramBase:
+    """What TelegramNotifier and AsyncTelegramNotifier share apart from the transport."""
+
+    API_URL = "https://api.telegram.org"
+
+    def _method_url(self, method: str) -> str:
+        return f"{self.api_url}/bot{self.bot_token}/{method}"
+
+    def _message_payload(self, text: str, chat_id: Optional[str] = None, message_id: Optional[int] = None) -> dict:
+        """sendMessage payload, or editMessageText when `message_id` is given."""
+        payload = {
+            "chat_id": chat_id or self.chat_id,
+            "text": text.replace("<br>", "\n"),
+            "parse_mode": "html",
+            "disable_web_page_preview": True,
+        }
+        if message_id is not None:
+            payload["message_id"] = message_id
+        return payload
+
+    @staticmethod
+    def _unsent(parts: List[str], on_failure: Optional[Callable[[str], None]]):
+        """Pass the parts of a message that weren't sent to `on_failure`, so only they are retried."""
+        if on_failure is not None:
+            on_failure("\n".join(parts))
+
+    def _updates_params(self, timeout: int) -> dict:
+        params = {
+            "timeout": timeout,
+            "allowed_updates": ["message"]
+        }
+        if self.last_update_id:
+            params["offset"] = self.last_update_id + 1
+        return params
+
+    def _read_updates(self, result: List[dict], chat_ids: Collection[str]) -> List[Tuple[str, str]]:
+        """(chat_id, text) of each new message from `chat_ids`; advances last_update_id."""
+        messages = []
+        for update in result:
+            self.last_update_id = update["update_id"]
+            if "message" in update and "text" in update["message"]:
+                chat_id = str(update["message"]["chat"]["id"])
+                # Only accept commands from configured chats for security
+                if chat_id in chat_ids:
+                    messages.append((chat_id, update["message"]["text"]))
+        return messages
+
+
+class TelegramNotifier(TelegramBase):
     """Handles Telegram messaging."""
 
     def __init__(
@@ -14,6 +104,7 @@ class TelegramNotifier:
         session: Optional[requests.Session] = None,
         verbose: bool = False,
         logger: Optional[Callable[[str], None]] = None,
+        api_url: Optional[str] = None,
     ):
         """
         Initialize Telegram notifier.
@@ -24,30 +115,77 @@ class TelegramNotifier:
             session: Optional Requests session for API calls
             verbose: Enable verbose logging
             logger: Optional logging function
+            api_url: Bot API host (defaults to TELEGRAM_API_URL or api.telegram.org)
         """
         self.bot_token = bot_token
+        self.api_url = api_url or os.getenv("TELEGRAM_API_URL", self.API_URL)
         self.chat_id = chat_id
-        self.session = session or requests.Session()
+        self.session = session or build_session()
         self.verbose = verbose
         self.logger = logger or (lambda msg: print(msg) if verbose else None)
         self.enabled = bool(bot_token and chat_id)
         self.last_update_id = None
 
-    def send_message(self, text: str) -> Optional[int]:
-        """Send message, returning message ID."""
+    def _post(self, method: str, payload: dict, retry_unsafe: bool = False) -> requests.Response:
+        """
+        POST through the shared transport, honoring Telegram's retry_after.
+
+        Only 429s and failed connects are retried unless `retry_unsafe`, so a
+        message is never sent twice.
+        """
+        with metrics.span("telegram_request", method=method) as span:
+            response = request_with_retry(
+                self.session,
+                "POST",
+                self._method_url(method),
+                json=payload,
+                limiter=_global_limiter,
+                upstream_name="telegram",
+                timeout=10,
+                retry_unsafe=retry_unsafe,
+            )
+            span.labels["status"] = response.status_code
+        return response
+
+    def deliver(self, text: str, chat_id: Optional[str] = None) -> requests.Response:
+        """
+        Send one message (at most 4096 characters) and return the raw response.
+
+        Used by DeliveryQueue, which needs the status code and retry_after
+        to decide whether to retry. Network errors are raised.
+        """
+        return self._post("sendMessage", self._message_payload(text, chat_id))
+
+    def send_message(
+        self,
+        text: str,
+        chat_id: Optional[str] = None,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> Optional[int]:
+        """
+        Send message (to this notifier's chat unless `chat_id` is given), returning message ID.
+
+        Messages over Telegram's 4096 character limit are split at tag
+        boundaries and sent as several messages; the first one's ID is returned
+        (None if even that one failed). If a part fails, it and every part after
+        it are passed to `on_failure`, so the parts already sent aren't repeated.
+        """
         if not self.enabled:
             return None
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-        payload = {
-            "chat_id": self.chat_id,
-            "text": text.replace("<br>", "\n"),
-            "parse_mode": "html",
-            "disable_web_page_preview": True,
-        }
+        parts = split_html(text.replace("<br>", "\n"))
+        first_id = None
+        for i, part in enumerate(parts):
+            message_id = self._send_part(part, chat_id)
+            if message_id is None:
+                self._unsent(parts[i:], on_failure)
+                return first_id
+            first_id = first_id or message_id
+        return first_id
 
+    def _send_part(self, text: str, chat_id: Optional[str] = None) -> Optional[int]:
         try:
-            response = self.session.post(url, json=payload, timeout=10)
+            response = self.deliver(text, chat_id)
             response.raise_for_status()
 
             result = response.json()
@@ -74,17 +212,11 @@ class TelegramNotifier:
         if not self.enabled:
             return False
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/editMessageText"
-        payload = {
-            "chat_id": self.chat_id,
-            "message_id": message_id,
-            "text": text.replace("<br>", "\n"),
-            "parse_mode": "html",
-            "disable_web_page_preview": True,
-        }
-
         try:
-            response = self.session.post(url, json=payload, timeout=10)
+            # Repeating an edit is harmless, so edits retry on 5xx and timeouts too
+            response = self._post(
+                "editMessageText", self._message_payload(text, message_id=message_id), retry_unsafe=True
+            )
             response.raise_for_status()
             return True
 
@@ -92,37 +224,67 @@ class TelegramNotifier:
             self.logger(f"[TELEGRAM ERROR] Network error updating message {message_id}: {e}")
             return False
 
-    def get_updates(self) -> list[str]:
-        """Check for new messages."""
+    def stream_message(
+        self,
+        chunks: Iterable[str],
+        placeholder: str = "⏳ Generating summary...",
+        min_interval: float = 1.5,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Post a placeholder and progressively edit it as text chunks arrive.
+
+        Edits are throttled to `min_interval` seconds to stay within
+        Telegram's edit rate limits, and each intermediate edit is closed
+        into valid HTML. Text beyond 4096 characters is sent as follow-up
+        messages. Whatever part of the final text can't be delivered is passed
+        to `on_failure` (e.g. DeliveryQueue.enqueue). Returns the full text.
+        """
+        message_id = self.send_message(placeholder)
+        stream = StreamedMessage(min_interval)
+        for chunk in chunks:
+            edit = stream.feed(chunk)
+            if edit and message_id is not None:
+                self.update_message(message_id, edit)
+
+        parts = stream.parts()
+        if message_id is not None and self.update_message(message_id, parts[0]):
+            if len(parts) > 1:
+                self.send_message("\n".join(parts[1:]), on_failure=on_failure)
+        else:
+            # Placeholder or final edit failed; fall back to a fresh message
+            self.send_message(stream.text, on_failure=on_failure)
+        return stream.text
+
+    def get_updates(self, timeout: int = 30) -> list[str]:
+        """
+        Check for new messages.
+
+        Uses long polling: Telegram holds the request open for up to
+        `timeout` seconds and answers as soon as a message arrives.
+        """
+        return [text for _, text in self.get_chat_updates(timeout)]
+
+    def get_chat_updates(self, timeout: int = 30, chat_ids: Optional[Collection[str]] = None) -> list[tuple[str, str]]:
+        """
+        Check for new messages, returning (chat_id, text) pairs.
+
+        Only messages from `chat_ids` (default: this notifier's chat) are returned.
+        """
         if not self.enabled:
             return []
-
-        url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
-        params = {
-            "timeout": 0,
-            "allowed_updates": ["message"]
-        }
-        if self.last_update_id:
-            params["offset"] = self.last_update_id + 1
+        chat_ids = chat_ids or {self.chat_id}
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            # Allow the HTTP request to outlive the server-side poll
+            response = self.session.get(
+                self._method_url("getUpdates"), params=self._updates_params(timeout), timeout=timeout + 10
+            )
             response.raise_for_status()
-            data = response.json()
-            
-            result = data.get("result", [])
-            messages = []
-            
-            for update in result:
-                self.last_update_id = update["update_id"]
-                if "message" in update and "text" in update["message"]:
-                    chat_id = str(update["message"]["chat"]["id"])
-                    # Only accept commands from the configured chat_id for security
-                    if chat_id == self.chat_id:
-                        messages.append(update["message"]["text"])
-            
-            return messages
+            return self._read_updates(response.json().get("result", []), chat_ids)
 
         except Exception as e:
             self.logger(f"[TELEGRAM ERROR] Failed to get updates: {e}")
+            # Back off so an outage doesn't turn long polling into a busy loop
+            time.sleep(min(timeout, 5))
             return []
@@ -0,0 +1,73 @@
+"""OAuth token file shared safely between threads and processes."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+def stamp_expiry(tokens: Dict[str, Any]) -> Dict[str, Any]:
+    """Add an absolute `expires_at` (epoch seconds) derived from `expires_in`."""
+    if "expires_in" in tokens and "expires_at" not in tokens:
+        tokens = {**tokens, "expires_at": time.time() + float(tokens["expires_in"])}
+    return tokens
+
+
+class TokenFile:
+    """
+    JSON token file with atomic writes and a cross-process lock.
+
+    Writes go to a temp file that is renamed over the original, so a
+    reader never sees a half-written file. lock() holds an exclusive
+    flock on a sidecar `.lock` file, so concurrent processes can
+    serialize the read-refresh-write cycle.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def read(self) -> Dict[str, Any]:
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def write(self, tokens: Dict[str, Any]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".oura_tokens.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            # Tokens are credentials; keep them private to the user
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @contextmanager
+    def lock(self):
+        """Hold the token file exclusively (across threads and, where supported, processes)."""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,54 @@
+"""Process-wide concurrency limits per upstream service."""
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
+
+_limits: Dict[str, threading.BoundedSemaphore] = {}
+_limit_values: Dict[str, int] = {}
+# asyncio semaphores belong to one event loop, so they are created per loop
+_async_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def configure(**limits: int):
+    """
+    Set the maximum number of concurrent requests per upstream.
+
+    Example: configure(oura=16, openai=8, telegram=16). Upstreams that are
+    never configured are unlimited. The limits apply to threads (upstream())
+    and, separately, to each event loop's tasks (async_upstream()).
+    """
+    for name, limit in limits.items():
+        _limits[name] = threading.BoundedSemaphore(limit)
+        _limit_values[name] = limit
+    _async_limits.clear()
+
+
+@contextmanager
+def upstream(name: str):
+    """Hold one of the upstream's slots for the duration of the block."""
+    semaphore = _limits.get(name)
+    if semaphore is None:
+        yield
+        return
+    with semaphore:
+        yield
+
+
+@asynccontextmanager
+async def async_upstream(name: str):
+    """Async counterpart of upstream() for coroutines."""
+    limit = _limit_values.get(name)
+    if limit is None:
+        yield
+        return
+    semaphores = _async_limits.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get(name)
+    if semaphore is None:
+        semaphore = semaphores[name] = asyncio.Semaphore(limit)
+    async with semaphore:
+        yield
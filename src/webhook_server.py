@@ -0,0 +1,139 @@
+"""HTTP receiver for Oura webhook events."""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Any, Callable, Dict, List, Optional
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Answers Oura's verification challenge and accepts event notifications."""
+
+    def do_GET(self):
+        # Oura verifies a new subscription with ?verification_token=...&challenge=...
+        query_params = parse_qs(urlparse(self.path).query)
+        token = query_params.get("verification_token", [None])[0]
+        challenge = query_params.get("challenge", [None])[0]
+
+        if token != self.server.receiver.verification_token or challenge is None:
+            self.send_response(401)
+            self.end_headers()
+            return
+
+        body = json.dumps({"challenge": challenge}).encode()
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        receiver = self.server.receiver
+        if not receiver.verify(self.headers.get("x-oura-signature"), self.headers.get("x-oura-timestamp"), body):
+            receiver.logger("Rejected webhook POST with a missing or invalid signature.")
+            self.send_response(401)
+            self.end_headers()
+            return
+        try:
+            event = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        # Acknowledge immediately; processing happens off the request thread
+        self.send_response(204)
+        self.end_headers()
+        self.server.receiver.add_event(event)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WebhookReceiver:
+    """
+    Lightweight webhook receiver.
+
+    Events must carry a valid x-oura-signature (HMAC-SHA256 of the
+    x-oura-timestamp header plus the raw body, keyed with the client
+    secret) and a timestamp within `max_skew` seconds; anything else is
+    rejected with 401. Events arriving close together (a ring sync
+    produces several) are batched and handed to `on_events` once no new
+    event has arrived for `debounce` seconds.
+    """
+
+    def __init__(
+        self,
+        verification_token: str,
+        client_secret: str,
+        on_events: Callable[[List[Dict[str, Any]]], None],
+        host: str = "",
+        port: int = 8080,
+        debounce: float = 30.0,
+        max_skew: float = 300.0,
+        logger: Optional[Callable[[str], None]] = None,
+    ):
+        self.verification_token = verification_token
+        self.client_secret = client_secret
+        self.max_skew = max_skew
+        self.on_events = on_events
+        self.debounce = debounce
+        self.logger = logger or print
+        self.httpd = ThreadingHTTPServer((host, port), WebhookHandler)
+        self.httpd.receiver = self
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def verify(self, signature: Optional[str], timestamp: Optional[str], body: bytes) -> bool:
+        """Check an event's HMAC signature and reject stale or replayed timestamps."""
+        if not self.client_secret or not signature or not timestamp:
+            return False
+        try:
+            if abs(time.time() - float(timestamp)) > self.max_skew:
+                return False
+        except ValueError:
+            return False
+        expected = hmac.new(self.client_secret.encode(), timestamp.encode() + body, hashlib.sha256).hexdigest().upper()
+        return hmac.compare_digest(expected, signature.strip().upper())
+
+    def add_event(self, event: Dict[str, Any]):
+        """Queue an event and (re)start the debounce timer."""
+        with self._lock:
+            self._pending.append(event)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._timer = None
+        if not events:
+            return
+        try:
+            self.on_events(events)
+        except Exception as e:
+            self.logger(f"Webhook handler failed: {e}")
+
+    def start(self):
+        """Serve in a background thread."""
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,96 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from analytics import METRICS, TrendEngine
+from features import DailyFeatures
+
+START = date(2026, 1, 1)
+
+
+def history(days, seed=0):
+    """Daily features with noisy metrics and some missing values."""
+    rng = np.random.default_rng(seed)
+    features = []
+    for i in range(days):
+        values = {
+            "readiness_score": int(rng.integers(60, 90)),
+            "sleep_score": int(rng.integers(60, 90)),
+            "hrv_ms": int(rng.integers(30, 60)),
+            "rhr_bpm": int(rng.integers(50, 60)),
+            "stress_high_min": int(rng.integers(0, 120)),
+            "spo2_avg": float(rng.uniform(95, 99)),
+        }
+        if i % 5 == 0:
+            values["hrv_ms"] = None
+        features.append(DailyFeatures(day=(START + timedelta(days=i)).isoformat(), **values))
+    return features
+
+
+def test_window_stats_match_numpy():
+    engine = TrendEngine()
+    engine.update(history(60))
+    for end, window in ((60, 7), (60, 30), (45, 90), (10, 7)):
+        mean, std, count = engine._window_stats(end, window)
+        rows = engine.values[max(0, end - window):end]
+        np.testing.assert_allclose(mean, np.nanmean(rows, axis=0))
+        np.testing.assert_allclose(std, np.nanstd(rows, axis=0), atol=1e-6)
+        np.testing.assert_array_equal(count, (~np.isnan(rows)).sum(axis=0))
+
+
+def test_incremental_updates_match_a_full_build():
+    features = history(60)
+    full = TrendEngine()
+    full.update(features)
+
+    incremental = TrendEngine()
+    incremental.update(features[20:40])
+    incremental.update(features[40:])
+    # Earlier days arriving later, and a day being overwritten
+    incremental.update(features[:20])
+    incremental.update([DailyFeatures(day=features[30].day, sleep_score=1)])
+    incremental.update([features[30]])
+
+    assert incremental.start_day == full.start_day
+    np.testing.assert_array_equal(incremental.values, full.values)
+    for name in ("_sum", "_sq", "_count"):
+        np.testing.assert_allclose(getattr(incremental, name), getattr(full, name))
+    assert incremental.summary() == full.summary()
+
+
+def test_summary_flags_anomalies():
+    features = history(40)
+    features[-1].rhr_bpm = 90
+    engine = TrendEngine()
+    engine.update(features)
+    summary = engine.summary()
+    assert summary["as_of"] == features[-1].day
+    assert "rhr_bpm" in summary["anomalies"]
+    assert summary["metrics"]["rhr_bpm"]["latest"] == 90
+    assert set(summary["metrics"]) == set(METRICS)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "trends.npz")
+    engine = TrendEngine()
+    engine.update(history(30))
+    engine.save(path)
+
+    loaded = TrendEngine.load(path)
+    assert loaded.start_day == START
+    assert loaded.last_day == engine.last_day
+    np.testing.assert_array_equal(loaded.values, engine.values)
+    assert loaded.summary() == engine.summary()
+    assert os.listdir(tmp_path) == ["trends.npz"]
+
+
+def test_load_missing_file_is_empty(tmp_path):
+    engine = TrendEngine.load(str(tmp_path / "missing.npz"))
+    assert engine.last_day is None
+    assert engine.summary() == {}
+    # Nothing to save yet
+    engine.save(str(tmp_path / "empty.npz"))
+    assert not os.path.exists(tmp_path / "empty.npz")
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+from ai_summarizer import AISummarizer
+from batch_summarizer import BatchSummarizer
+from fakes import FakeOpenAIServer
+from summary_cache import SummaryCache
+
+USERS = ("alice", "bob", "carol", "dave", "erin", "frank")
+
+
+@pytest.fixture
+def openai_server(monkeypatch):
+    """Start a FakeOpenAIServer (with the given options) and point the OpenAI client at it."""
+    servers = []
+
+    def start(**kwargs):
+        server = FakeOpenAIServer(**kwargs).start()
+        servers.append(server)
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{server.url}/v1")
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def summarizer(tmp_path):
+    return AISummarizer("test", cache=SummaryCache(str(tmp_path / "summary_cache.json")))
+
+
+def user_data(i):
+    """A distinct day of data per user, so every user gets their own cache key."""
+    day = "2026-06-01"
+    return (
+        {"data": [{"day": day, "score": 60 + i}]},
+        {"data": [{"day": day, "score": 70 + i, "steps": 5000 + i}]},
+        {"data": [{"day": day, "score": 80 + i}]},
+    )
+
+
+def individual_calls(monkeypatch, summarizer):
+    """Record the requests sent outside the batch."""
+    calls = []
+    complete = summarizer.complete
+
+    def record(messages):
+        calls.append(messages)
+        return complete(messages)
+
+    monkeypatch.setattr(summarizer, "complete", record)
+    return calls
+
+
+def test_results_are_mapped_back_by_custom_id(openai_server, summarizer, monkeypatch):
+    openai_server()
+    calls = individual_calls(monkeypatch, summarizer)
+    batch = BatchSummarizer(summarizer, poll_interval=0.01, timeout=10)
+    for i, name in enumerate(USERS):
+        assert batch.add(name, *user_data(i))
+
+    results = batch.run()
+    assert set(results) == set(USERS)
+    assert calls == []
+    assert len(batch) == 0
+    # The daily job finds each user's summary under their own request
+    for i in range(len(USERS)):
+        _, cached, _ = summarizer.summary_request(*user_data(i))
+        assert cached == results[USERS[i]]
+
+
+def test_cached_summaries_are_not_queued(openai_server, summarizer):
+    openai_server()
+    cache_key, _, _ = summarizer.summary_request(*user_data(0))
+    summarizer.cache.set(cache_key, "cached")
+    batch = BatchSummarizer(summarizer, poll_interval=0.01, timeout=10)
+    assert not batch.add("alice", *user_data(0))
+    assert batch.add("bob", *user_data(1))
+    assert set(batch.run()) == {"bob"}
+
+
+def test_failed_requests_fall_back_to_single_completions(openai_server, summarizer, monkeypatch):
+    server = openai_server(batch_failure_rate=0.5, seed=3)
+    calls = individual_calls(monkeypatch, summarizer)
+    batch = BatchSummarizer(summarizer, poll_interval=0.01, timeout=10)
+    for i, name in enumerate(USERS):
+        batch.add(name, *user_data(i))
+
+    results = batch.run()
+    (status,) = server.batches.values()
+    failed = status["request_counts"]["failed"]
+    assert 0 < failed < len(USERS)
+    assert len(calls) == failed
+    assert set(results) == set(USERS)
+
+
+def test_timeout_cancels_the_batch_and_sends_everything_individually(openai_server, summarizer, monkeypatch):
+    server = openai_server(batch_delay=60)
+    calls = individual_calls(monkeypatch, summarizer)
+    batch = BatchSummarizer(summarizer, poll_interval=0.01, timeout=0.2)
+    for i, name in enumerate(USERS[:3]):
+        batch.add(name, *user_data(i))
+
+    results = batch.run()
+    (status,) = server.batches.values()
+    assert status["status"] == "cancelled"
+    assert len(calls) == 3
+    assert set(results) == set(USERS[:3])
+
+
+def test_parse_output_skips_errors_and_unknown_ids(summarizer):
+    batch = BatchSummarizer(summarizer)
+    batch.add("alice", *user_data(0))
+    batch.add("bob", *user_data(1))
+    body = {"choices": [{"message": {"content": "<b>Fine</b>"}}]}
+    output = "\n".join(json.dumps(record) for record in (
+        {"custom_id": "alice", "response": {"status_code": 200, "body": body}},
+        {"custom_id": "bob", "response": {"status_code": 500, "body": {"error": {}}}},
+        {"custom_id": "mallory", "response": {"status_code": 200, "body": body}},
+        {"custom_id": "bob", "error": {"message": "expired"}},
+    )).encode()
+    assert batch._parse_output(output) == {"alice": "<b>Fine</b>"}
@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import delivery_queue
+from delivery_queue import DeliveryQueue
+
+
+def response(status, body=b'{"ok": true}'):
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    return r
+
+
+class FakeNotifier:
+    """Answers each deliver() with the next scripted outcome (200 once the script runs out)."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = []
+
+    def deliver(self, text, chat_id=None):
+        outcome = self.outcomes.pop(0) if self.outcomes else response(200)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome.ok:
+            self.sent.append((chat_id, text))
+        return outcome
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(notifier, **kwargs):
+        queue = DeliveryQueue(notifier, str(tmp_path / "outbox.db"), per_chat_rate=1000, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Move the queue's notion of "now" forward by a number of seconds."""
+    offset = [0.0]
+    real_time = time.time
+    monkeypatch.setattr(delivery_queue.time, "time", lambda: real_time() + offset[0])
+
+    def advance(seconds):
+        offset[0] += seconds
+    return advance
+
+
+def test_long_messages_are_split_and_sent_in_order(make_queue):
+    notifier = FakeNotifier()
+    queue = make_queue(notifier)
+    text = "\n".join(f"line {i} " + "x" * 90 for i in range(100))
+    parts = queue.enqueue("1", text)
+    assert parts > 1
+    assert queue.flush() == parts
+    assert queue.pending() == 0
+    assert all(len(sent) <= 4096 for _, sent in notifier.sent)
+    assert "".join(sent for _, sent in notifier.sent).replace("\n", "") == text.replace("\n", "")
+
+
+def test_rate_limited_message_waits_for_retry_after(make_queue, clock):
+    body = b'{"ok": false, "parameters": {"retry_after": 5}}'
+    notifier = FakeNotifier(response(429, body))
+    queue = make_queue(notifier)
+    queue.enqueue("1", "first")
+    queue.enqueue("1", "second")
+
+    # Nothing after the rate-limited message is sent ahead of it
+    assert queue.flush() == 0
+    assert queue.pending() == 2
+    clock(3)
+    assert queue.flush() == 0
+    clock(3)
+    assert queue.flush() == 2
+    assert [text for _, text in notifier.sent] == ["first", "second"]
+
+
+def test_server_and_network_errors_are_retried_until_max_attempts(make_queue, clock):
+    notifier = FakeNotifier(response(502), requests.ConnectionError("down"), response(500))
+    queue = make_queue(notifier, max_attempts=3)
+    queue.enqueue("1", "report")
+    for _ in range(3):
+        assert queue.flush() == 0
+        clock(600)
+    # Dropped after the third failed attempt
+    assert queue.pending() == 0
+    assert notifier.sent == []
+
+
+def test_rejected_messages_are_dropped_without_blocking_the_chat(make_queue):
+    notifier = FakeNotifier(response(400, b'{"ok": false, "description": "can\'t parse entities"}'))
+    queue = make_queue(notifier)
+    queue.enqueue("1", "<b>broken")
+    queue.enqueue("1", "fine")
+    assert queue.flush() == 1
+    assert notifier.sent == [("1", "fine")]
+
+
+def test_chats_are_independent_and_pending_messages_survive_a_restart(make_queue, clock):
+    queue = make_queue(FakeNotifier(response(503)))
+    queue.enqueue_many(["1", "2"], "digest")
+    queue.flush()
+    assert queue.pending() == 1
+    queue.close()
+
+    clock(600)
+    notifier = FakeNotifier()
+    restarted = make_queue(notifier)
+    assert restarted.flush() == 1
+    assert [text for _, text in notifier.sent] == ["digest"]
+    assert restarted.pending() == 0
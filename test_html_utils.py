@@ -0,0 +1,74 @@
+import os
+import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from utils.html_utils import _open_tags, close_partial_html, split_html
+
+
+def assert_valid(part, limit):
+    """Within the limit, every tag closed, and no tag or entity cut in half."""
+    assert len(part) <= limit
+    assert _open_tags(part) == []
+    assert re.sub(r"<[^<>]*>", "", part).count("<") == 0
+    assert not re.search(r"&#?\w*$", part)
+
+
+def test_short_text_is_one_part():
+    assert split_html("<b>Stats</b> fine", 100) == ["<b>Stats</b> fine"]
+
+
+def test_cuts_at_line_breaks_and_reopens_tags():
+    text = "<b>" + "\n".join(f"line {i} of the report" for i in range(20)) + "</b>"
+    parts = split_html(text, 100)
+    assert len(parts) > 1
+    for part in parts:
+        assert_valid(part, 100)
+        assert part.startswith("<b>") and part.endswith("</b>")
+    assert re.sub(r"</?b>|\s", "", "".join(parts)) == re.sub(r"</?b>|\s", "", text)
+
+
+def test_never_cuts_inside_an_entity():
+    text = "<i>" + "a&amp;b " * 40 + "</i>"
+    for part in split_html(text, 30):
+        assert_valid(part, 30)
+
+
+def test_hard_cut_without_spaces_keeps_tags_balanced():
+    text = "<b>" + "x" * 50 + "</b>"
+    parts = split_html(text, 20)
+    for part in parts:
+        assert_valid(part, 20)
+    assert "".join(re.sub(r"</?b>", "", part) for part in parts) == "x" * 50
+
+
+def test_hard_cut_moves_back_before_an_entity():
+    text = "<b><i>" + "a&amp;" * 20 + "</i></b>"
+    parts = split_html(text, 24)
+    for part in parts:
+        assert_valid(part, 24)
+    assert "".join(re.sub(r"</?[bi]>", "", part) for part in parts) == "a&amp;" * 20
+
+
+def test_long_opening_tag_is_never_cut():
+    # The reopened link alone nearly fills a part
+    text = '<a href="' + "u" * 25 + '">' + "x&amp;" * 30 + "</a>"
+    parts = split_html(text, 40)
+    for part in parts:
+        assert_valid(part, 40)
+    assert "".join(re.sub(r"<[^>]*>", "", part) for part in parts) == "x&amp;" * 30
+
+
+def test_deeply_nested_tags_fit_the_limit():
+    text = "<b><i><u><s><code><b>" + "word " * 40 + "</b></code></s></u></i></b>"
+    for limit in (20, 42, 60):
+        parts = split_html(text, limit)
+        for part in parts:
+            assert_valid(part, limit)
+        assert "".join(re.sub(r"<[^>]*>|\s", "", part) for part in parts) == "word" * 40
+
+
+def test_close_partial_html():
+    assert close_partial_html("<b>Sleep <i>82") == "<b>Sleep <i>82</i></b>"
+    assert close_partial_html("<b>Sleep</b> <i") == "<b>Sleep</b> "
+    assert close_partial_html("HRV &am") == "HRV "
@@ -0,0 +1,122 @@
+import os
+import sys
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from utils import http_transport
+from utils.http_transport import request_with_retry, retry_after_seconds, should_retry
+
+
+def response(status, headers=None, body=b""):
+    r = requests.Response()
+    r.status_code = status
+    r.headers.update(headers or {})
+    r._content = body
+    return r
+
+
+class FakeSession:
+    """Answers each request with the next scripted response, or raises it if it is an exception."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(http_transport.time, "sleep", delays.append)
+    return delays
+
+
+def test_retries_server_errors_until_success(sleeps):
+    session = FakeSession(response(503), response(502), response(200))
+    assert request_with_retry(session, "GET", "http://x").status_code == 200
+    assert session.calls == 3
+    assert len(sleeps) == 2
+
+
+def test_gives_up_after_max_retries(sleeps):
+    session = FakeSession(*(response(500) for _ in range(3)))
+    assert request_with_retry(session, "GET", "http://x", max_retries=2).status_code == 500
+    assert session.calls == 3
+
+
+def test_client_errors_are_returned_without_retrying(sleeps):
+    session = FakeSession(response(401))
+    assert request_with_retry(session, "GET", "http://x").status_code == 401
+    assert sleeps == []
+
+
+def test_honors_retry_after_header(sleeps):
+    session = FakeSession(response(429, {"Retry-After": "7"}), response(200))
+    request_with_retry(session, "GET", "http://x")
+    assert sleeps == [7.0]
+
+
+def test_honors_telegram_retry_after(sleeps):
+    body = b'{"ok": false, "parameters": {"retry_after": 3}}'
+    session = FakeSession(response(429, body=body), response(200))
+    request_with_retry(session, "POST", "http://x")
+    assert sleeps == [3.0]
+
+
+def test_retry_after_http_date():
+    assert retry_after_seconds(response(503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(response(503)) is None
+
+
+def test_post_is_not_repeated_after_a_server_error(sleeps):
+    session = FakeSession(response(500), response(200))
+    assert request_with_retry(session, "POST", "http://x").status_code == 500
+    assert session.calls == 1
+
+    session = FakeSession(response(500), response(200))
+    assert request_with_retry(session, "POST", "http://x", retry_unsafe=True).status_code == 200
+
+
+def test_post_is_retried_only_when_it_never_reached_the_server(sleeps):
+    session = FakeSession(requests.ConnectTimeout(), response(200))
+    assert request_with_retry(session, "POST", "http://x").status_code == 200
+
+    session = FakeSession(requests.ReadTimeout(), response(200))
+    with pytest.raises(requests.ReadTimeout):
+        request_with_retry(session, "POST", "http://x")
+    assert session.calls == 1
+
+    session = FakeSession(requests.ReadTimeout(), response(200))
+    assert request_with_retry(session, "GET", "http://x").status_code == 200
+
+
+def test_post_is_retried_when_the_connection_was_refused(sleeps):
+    refused = requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "Connection refused")))
+    session = FakeSession(refused, response(200))
+    assert request_with_retry(session, "POST", "http://x").status_code == 200
+
+    # The server may have read the request before the connection dropped
+    aborted = requests.ConnectionError(ProtocolError("Connection aborted.", ConnectionResetError()))
+    session = FakeSession(aborted, response(200))
+    with pytest.raises(requests.ConnectionError):
+        request_with_retry(session, "POST", "http://x")
+
+
+def test_should_retry():
+    assert should_retry("POST", 429)
+    assert should_retry("POST", unsent=True)
+    assert not should_retry("POST", 503)
+    assert should_retry("POST", 503, retry_unsafe=True)
+    assert should_retry("get", 503)
+    assert should_retry("PUT", None)
+    assert not should_retry("GET", 404)
@@ -0,0 +1,80 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import oura_store
+from oura_store import OuraStore, OuraSync
+
+TODAY = date(2026, 6, 10)
+
+
+class FakeClient:
+    """Serves one daily_sleep document per day in `days`, recording each fetched range."""
+
+    DAILY_COLLECTIONS = ("daily_sleep",)
+    max_workers = 2
+
+    def __init__(self, days):
+        self.days = set(days)
+        self.fetched = []
+
+    def iter_collection(self, endpoint, start_date, end_date):
+        self.fetched.append((start_date, end_date))
+        for day in sorted(self.days):
+            if start_date <= day < end_date:
+                yield {"id": f"sleep-{day}", "day": day, "score": 80}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with OuraStore(str(tmp_path / "oura.db")) as store:
+        yield store
+
+
+def test_only_missing_days_are_fetched(store):
+    client = FakeClient(["2026-06-01", "2026-06-02", "2026-06-03"])
+    sync = OuraSync(client, store, today=TODAY)
+    assert sync.sync_collection("daily_sleep", "2026-06-01", "2026-06-04") == 3
+    assert sync.sync_collection("daily_sleep", "2026-06-01", "2026-06-04") == 0
+    assert client.fetched == [("2026-06-01", "2026-06-04")]
+
+    # Days already stored split the fetch into contiguous runs
+    store.forget_synced("daily_sleep", "2026-06-01", "2026-06-02")
+    store.forget_synced("daily_sleep", "2026-06-03", "2026-06-04")
+    assert sync._days_to_fetch("daily_sleep", "2026-06-01", "2026-06-05") == ["2026-06-01", "2026-06-03", "2026-06-04"]
+    sync.sync_collection("daily_sleep", "2026-06-01", "2026-06-05")
+    assert client.fetched[1:] == [("2026-06-01", "2026-06-02"), ("2026-06-03", "2026-06-05")]
+
+
+def test_trailing_days_are_refetched_once_stale(store, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(oura_store.time, "time", lambda: now[0])
+    sync = OuraSync(FakeClient(["2026-06-01", "2026-06-09"]), store, trailing_days=2, refresh_after=900, today=TODAY)
+    sync.sync_collection("daily_sleep", "2026-06-01", "2026-06-10")
+
+    now[0] += 60
+    assert sync._days_to_fetch("daily_sleep", "2026-06-01", "2026-06-10") == ["2026-06-08"]
+    now[0] += 900
+    assert sync._days_to_fetch("daily_sleep", "2026-06-01", "2026-06-10") == ["2026-06-08", "2026-06-09"]
+
+
+def test_days_to_mark(store):
+    sync = OuraSync(FakeClient([]), store, trailing_days=2, today=TODAY)
+    documents = [{"id": "a", "day": "2026-06-01"}, {"id": "b", "day": "2026-06-09"}]
+    # Old days are final even when empty; recent empty days wait for the ring to upload
+    assert sync._days_to_mark("2026-06-01", "2026-06-10", documents) == [
+        "2026-06-01", "2026-06-02", "2026-06-03", "2026-06-04", "2026-06-05", "2026-06-06", "2026-06-07", "2026-06-09"
+    ]
+    # A document the store can't place leaves the whole run to be fetched again
+    assert sync._days_to_mark("2026-06-01", "2026-06-03", [{"id": "c"}]) == []
+
+
+def test_documents_without_an_id_get_one_per_day(store):
+    documents = [{"day": "2026-06-01", "score": 70}, {"start_day": "2026-06-02", "score": 75}]
+    assert store.upsert_documents("daily_resilience", documents) == 2
+    store.upsert_documents("daily_resilience", [{"day": "2026-06-01", "score": 72}])
+    assert [doc["score"] for doc in store.get_documents("daily_resilience", "2026-06-01", "2026-06-03")] == [72, 75]
+    assert store.upsert_documents("daily_resilience", [{"score": 1}]) == 0
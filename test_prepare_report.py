@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+import bot
+from fakes import FakeOpenAIServer, FakeOuraServer, FakeTelegramServer
+from users import UserConfig
+
+
+@pytest.fixture
+def fakes(tmp_path, monkeypatch):
+    """Fake Oura, OpenAI and Telegram servers, with the bot's configuration pointing at them."""
+    with FakeOuraServer() as oura, FakeOpenAIServer() as openai, FakeTelegramServer() as telegram:
+        token_file = tmp_path / "oura_tokens.json"
+        token_file.write_text(json.dumps({"access_token": "test", "refresh_token": "test", "expires_in": 86400}))
+        for name, value in {
+            "OURA_API_URL": oura.url,
+            "OURA_CLIENT_ID": "test",
+            "OURA_CLIENT_SECRET": "test",
+            "OPENAI_BASE_URL": f"{openai.url}/v1",
+            "OPENAI_API_KEY": "test",
+            "TELEGRAM_API_URL": telegram.url,
+            "TELEGRAM_BOT_TOKEN": "test",
+            "SUMMARY_CACHE_PATH": str(tmp_path / "summary_cache.json"),
+            "DELIVERY_QUEUE_PATH": str(tmp_path / "outbox.db"),
+        }.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setattr(bot, "last_summary_dates", {})
+        yield oura, openai, telegram
+    bot.close_oura_stores()
+
+
+@pytest.fixture
+def user(tmp_path):
+    return UserConfig(
+        name=f"test-{tmp_path.name}",
+        chat_id="1",
+        token_file=str(tmp_path / "oura_tokens.json"),
+        db_path=str(tmp_path / "oura.db"),
+        timezone="UTC",
+    )
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Count the trend and time series updates prepare_report() runs."""
+    counts = {"trends": 0, "timeseries": 0}
+    update_trends, ingest_timeseries = bot.update_trends, bot.ingest_timeseries
+
+    def count_trends(*args, **kwargs):
+        counts["trends"] += 1
+        return update_trends(*args, **kwargs)
+
+    def count_timeseries(*args, **kwargs):
+        counts["timeseries"] += 1
+        return ingest_timeseries(*args, **kwargs)
+
+    monkeypatch.setattr(bot, "update_trends", count_trends)
+    monkeypatch.setattr(bot, "ingest_timeseries", count_timeseries)
+    return counts
+
+
+def yesterday():
+    return (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
+
+
+def today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def test_unchanged_data_reuses_the_stored_report(fakes, user, stages):
+    _, openai, _ = fakes
+    bot.prepare_report(user)
+    report = bot.get_oura_store(user).get_report(yesterday())
+    assert report is not None and report["text"]
+    assert len(openai.prompt_chars) == 1
+    assert stages == {"trends": 1, "timeseries": 1}
+
+    bot.prepare_report(user)
+    assert bot.get_oura_store(user).get_report(yesterday()) == report
+    assert len(openai.prompt_chars) == 1
+    assert stages == {"trends": 1, "timeseries": 1}
+
+
+def test_changed_data_regenerates_the_report(fakes, user, stages):
+    _, openai, _ = fakes
+    bot.prepare_report(user)
+    store = bot.get_oura_store(user)
+    report = store.get_report(yesterday())
+
+    # A late ring sync changes yesterday's score
+    (document,) = store.get_documents("daily_sleep", yesterday(), today())
+    store.upsert_documents("daily_sleep", [{**document, "score": (document.get("score") or 0) + 1}])
+    bot.prepare_report(user)
+
+    updated = store.get_report(yesterday())
+    assert updated["fingerprint"] != report["fingerprint"]
+    assert len(openai.prompt_chars) == 2
+    assert stages == {"trends": 2, "timeseries": 2}
+
+
+def test_delivered_report_is_not_prepared_again(fakes, user, stages):
+    _, openai, telegram = fakes
+    bot.prepare_report(user)
+    bot.deliver_report(user)
+    report = bot.get_oura_store(user).get_report(yesterday())
+    assert report["sent_at"]
+    assert [m["text"] for m in telegram.messages.values()] == [report["text"]]
+
+    bot.last_summary_dates.clear()
+    bot.prepare_report(user)
+    assert len(openai.prompt_chars) == 1
+    assert stages == {"trends": 1, "timeseries": 1}
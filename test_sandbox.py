@@ -67,6 +67,7 @@ def test_oura_sandbox_and_ai():
     stress_data = fetch_sandbox_data("daily_stress", params, headers)
     spo2_data = fetch_sandbox_data("daily_spo2", params, headers)
     workout_data = fetch_sandbox_data("workout", params, headers)
+    sleep_periods_data = fetch_sandbox_data("sleep", params, headers)
 
     if not (sleep_data and activity_data and readiness_data):
         print("❌ Could not fetch all required data for summary.")
@@ -85,7 +86,8 @@ def test_oura_sandbox_and_ai():
         readiness_data, 
         stress_data=stress_data, 
         spo2_data=spo2_data, 
-        workout_data=workout_data
+        workout_data=workout_data,
+        sleep_periods_data=sleep_periods_data
     )
     
     print("✅ Summary Generated:")
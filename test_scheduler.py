@@ -0,0 +1,136 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import scheduler as scheduler_module
+from scheduler import Scheduler, parse_time
+
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def at(tz, *args):
+    return datetime(*args, tzinfo=tz).timestamp()
+
+
+def fire_times(sched, runs):
+    """Drive the scheduler from deadline to deadline, returning when each run fired."""
+    fired = []
+    for _ in range(runs):
+        deadline = sched.next_deadline()
+        sched.run_pending(now=deadline)
+        fired.append(deadline)
+    return fired
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Set the time Scheduler.daily()/every() see as "now"."""
+    def set_now(timestamp):
+        monkeypatch.setattr(scheduler_module.time, "time", lambda: timestamp)
+    return set_now
+
+
+def test_parse_time():
+    assert parse_time("07:30").hour == 7
+    assert parse_time("07:30:15").second == 15
+    with pytest.raises(ValueError):
+        parse_time("7.30")
+
+
+def test_daily_runs_today_if_the_time_is_still_ahead(clock):
+    clock(at(BERLIN, 2026, 6, 1, 6, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    assert sched.daily("08:00", lambda: None, tz=BERLIN) == at(BERLIN, 2026, 6, 1, 8, 0)
+
+
+def test_daily_runs_tomorrow_once_the_time_has_passed(clock):
+    clock(at(BERLIN, 2026, 6, 1, 8, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    assert sched.daily("08:00", lambda: None, tz=BERLIN) == at(BERLIN, 2026, 6, 2, 8, 0)
+
+
+def test_daily_keeps_local_time_across_dst(clock):
+    # Berlin moves from CET to CEST on 2026-03-29 and back on 2026-10-25
+    clock(at(BERLIN, 2026, 3, 27, 12, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    sched.daily("08:00", lambda: None, tz=BERLIN)
+    fired = fire_times(sched, 4)
+    local = [datetime.fromtimestamp(t, BERLIN) for t in fired]
+    assert [(f.day, f.hour, f.minute) for f in local] == [(28, 8, 0), (29, 8, 0), (30, 8, 0), (31, 8, 0)]
+    assert [b - a for a, b in zip(fired, fired[1:])] == [23 * 3600, 24 * 3600, 24 * 3600]
+
+    clock(at(BERLIN, 2026, 10, 23, 12, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    sched.daily("08:00", lambda: None, tz=BERLIN)
+    fired = fire_times(sched, 3)
+    assert [b - a for a, b in zip(fired, fired[1:])] == [25 * 3600, 24 * 3600]
+
+
+def test_weekday_and_offset(clock):
+    clock(at(timezone.utc, 2026, 6, 3, 12, 0))  # a Wednesday
+    sched = Scheduler(submit=lambda fn: None)
+    first = sched.daily("09:00", lambda: None, tz=timezone.utc, weekday="Monday", offset=90)
+    assert first == at(timezone.utc, 2026, 6, 8, 9, 1, 30)
+    assert fire_times(sched, 2)[1] - first == 7 * 86400
+
+
+def test_negative_offset_runs_before_the_time(clock):
+    clock(at(BERLIN, 2026, 6, 1, 7, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    # 06:00 has passed, so the run ahead of 08:00 is tomorrow's
+    assert sched.daily("08:00", lambda: None, tz=BERLIN, offset=-7200) == at(BERLIN, 2026, 6, 2, 6, 0)
+
+
+def test_callable_timezone_is_resolved_for_every_run(clock):
+    zone = [timezone(timedelta(hours=1))]
+    clock(at(timezone.utc, 2026, 6, 1, 0, 0))
+    sched = Scheduler(submit=lambda fn: None)
+    first = sched.daily("08:00", lambda: None, tz=lambda: zone[0])
+    assert first == at(zone[0], 2026, 6, 1, 8, 0)
+
+    zone[0] = timezone(timedelta(hours=2))
+    sched.run_pending(now=first)
+    assert sched.next_deadline() == at(zone[0], 2026, 6, 2, 8, 0)
+
+
+def test_run_pending_submits_due_jobs_and_skips_missed_runs(clock):
+    clock(at(timezone.utc, 2026, 6, 1, 0, 0))
+    submitted = []
+    sched = Scheduler(submit=submitted.append)
+    sched.daily("08:00", lambda: "daily", tz=timezone.utc)
+    assert sched.run_pending(now=at(timezone.utc, 2026, 6, 1, 7, 59)) == 0
+
+    # Asleep for three days: one run, then back on the normal schedule
+    assert sched.run_pending(now=at(timezone.utc, 2026, 6, 4, 12, 0)) == 1
+    assert [fn() for fn in submitted] == ["daily"]
+    assert sched.next_deadline() == at(timezone.utc, 2026, 6, 5, 8, 0)
+
+
+def test_jitter_delays_runs_without_drifting_the_schedule(clock):
+    clock(at(timezone.utc, 2026, 6, 1, 0, 0))
+    sched = Scheduler(submit=lambda fn: None, jitter=60)
+    sched.daily("08:00", lambda: None, tz=timezone.utc)
+    for day, fired in enumerate(fire_times(sched, 5), start=1):
+        slot = at(timezone.utc, 2026, 6, day, 8, 0)
+        assert slot <= fired <= slot + 60
+
+
+def test_every_runs_at_a_fixed_interval(clock):
+    start = at(timezone.utc, 2026, 6, 1, 0, 0)
+    clock(start)
+    sched = Scheduler(submit=lambda fn: None, jitter=60)
+    assert sched.every(300, lambda: None, first_in=10) == start + 10
+    assert fire_times(sched, 3) == [start + 10, start + 310, start + 610]
+
+
+def test_every_starts_within_the_first_interval(clock):
+    start = at(timezone.utc, 2026, 6, 1, 0, 0)
+    clock(start)
+    sched = Scheduler(submit=lambda fn: None)
+    first = [sched.every(300, lambda: None) for _ in range(20)]
+    assert all(start <= t <= start + 300 for t in first)
+    assert len(sched) == 20
@@ -0,0 +1,83 @@
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from utils import token_store
+from utils.token_store import TokenFile, stamp_expiry
+
+
+def test_write_is_private_and_leaves_no_temp_files(tmp_path):
+    tokens = TokenFile(str(tmp_path / "oura_tokens.json"))
+    tokens.write({"access_token": "a", "refresh_token": "r"})
+    assert tokens.read() == {"access_token": "a", "refresh_token": "r"}
+    assert stat.S_IMODE(os.stat(tokens.path).st_mode) == 0o600
+    assert os.listdir(tmp_path) == ["oura_tokens.json"]
+
+
+def test_failed_write_keeps_the_old_tokens(tmp_path, monkeypatch):
+    tokens = TokenFile(str(tmp_path / "oura_tokens.json"))
+    tokens.write({"access_token": "old"})
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(token_store.json, "dump", fail)
+    with pytest.raises(OSError):
+        tokens.write({"access_token": "new"})
+    assert tokens.read() == {"access_token": "old"}
+    assert os.listdir(tmp_path) == ["oura_tokens.json"]
+
+
+def test_lock_serializes_threads(tmp_path):
+    tokens = TokenFile(str(tmp_path / "oura_tokens.json"))
+    tokens.write({"refreshes": 0})
+
+    def refresh():
+        with tokens.lock():
+            count = tokens.read()["refreshes"]
+            time.sleep(0.01)
+            tokens.write({"refreshes": count + 1})
+
+    threads = [threading.Thread(target=refresh) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tokens.read() == {"refreshes": 8}
+
+
+@pytest.mark.skipif(token_store.fcntl is None, reason="no flock on this platform")
+def test_lock_is_held_across_processes(tmp_path):
+    tokens = TokenFile(str(tmp_path / "oura_tokens.json"))
+    holder = subprocess.Popen(
+        [sys.executable, "-c", (
+            "import fcntl, sys, time\n"
+            "f = open(sys.argv[1], 'a')\n"
+            "fcntl.flock(f.fileno(), fcntl.LOCK_EX)\n"
+            "print('locked', flush=True)\n"
+            "time.sleep(0.5)\n"
+        ), f"{tokens.path}.lock"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        started = time.monotonic()
+        with tokens.lock():
+            waited = time.monotonic() - started
+        assert waited >= 0.2
+    finally:
+        holder.wait(timeout=5)
+
+
+def test_stamp_expiry(monkeypatch):
+    monkeypatch.setattr(token_store.time, "time", lambda: 1000.0)
+    assert stamp_expiry({"expires_in": 60}) == {"expires_in": 60, "expires_at": 1060.0}
+    assert stamp_expiry({"expires_in": 60, "expires_at": 5}) == {"expires_in": 60, "expires_at": 5}
+    assert stamp_expiry({"access_token": "a"}) == {"access_token": "a"}
@@ -0,0 +1,82 @@
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from webhook_server import WebhookReceiver
+
+SECRET = "client-secret"
+
+
+def sign(timestamp, body, secret=SECRET):
+    return hmac.new(secret.encode(), timestamp.encode() + body, hashlib.sha256).hexdigest().upper()
+
+
+@pytest.fixture
+def receiver():
+    """A receiver on a free port that records each batch of events it hands on."""
+    batches = []
+    flushed = threading.Event()
+
+    def on_events(events):
+        batches.append(events)
+        flushed.set()
+
+    receiver = WebhookReceiver("token", SECRET, on_events, host="127.0.0.1", port=0, debounce=0.2, logger=lambda msg: None)
+    receiver.batches = batches
+    receiver.flushed = flushed
+    receiver.start()
+    yield receiver
+    receiver.stop()
+
+
+def post(receiver, event, timestamp=None, signature=None):
+    body = json.dumps(event).encode()
+    timestamp = timestamp or str(int(time.time()))
+    headers = {"x-oura-timestamp": timestamp, "x-oura-signature": signature or sign(timestamp, body)}
+    return requests.post(f"http://127.0.0.1:{receiver.port}/", data=body, headers=headers, timeout=5)
+
+
+def test_valid_signature_is_accepted(receiver):
+    assert post(receiver, {"event_type": "create", "data_type": "daily_sleep"}).status_code == 204
+    assert receiver.flushed.wait(5)
+    assert receiver.batches == [[{"event_type": "create", "data_type": "daily_sleep"}]]
+
+
+def test_bad_signature_is_rejected(receiver):
+    timestamp = str(int(time.time()))
+    forged = sign(timestamp, b'{"data_type": "daily_sleep"}', secret="wrong")
+    assert post(receiver, {"data_type": "daily_sleep"}, timestamp, forged).status_code == 401
+    response = requests.post(f"http://127.0.0.1:{receiver.port}/", data=b"{}", timeout=5)
+    assert response.status_code == 401
+    assert not receiver.flushed.wait(0.5)
+
+
+def test_stale_timestamp_is_rejected(receiver):
+    stale = str(int(time.time()) - receiver.max_skew - 60)
+    assert post(receiver, {"data_type": "daily_sleep"}, timestamp=stale).status_code == 401
+    assert not receiver.verify(sign("not-a-time", b""), "not-a-time", b"")
+
+
+def test_events_arriving_together_are_handed_on_once(receiver):
+    for data_type in ("daily_sleep", "daily_readiness", "daily_sleep"):
+        assert post(receiver, {"data_type": data_type}).status_code == 204
+    assert receiver.flushed.wait(5)
+    time.sleep(receiver.debounce * 2)
+    assert [[e["data_type"] for e in batch] for batch in receiver.batches] == [
+        ["daily_sleep", "daily_readiness", "daily_sleep"]
+    ]
+
+
+def test_verification_challenge(receiver):
+    url = f"http://127.0.0.1:{receiver.port}/"
+    response = requests.get(url, params={"verification_token": "token", "challenge": "abc"}, timeout=5)
+    assert response.json() == {"challenge": "abc"}
+    assert requests.get(url, params={"verification_token": "wrong", "challenge": "abc"}, timeout=5).status_code == 401